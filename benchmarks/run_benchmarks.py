@@ -0,0 +1,138 @@
+"""Time generation, constraint checking and export on synthetic schools.
+
+Run from the project root:
+
+    python -m benchmarks.run_benchmarks --output benchmarks/results/current.json
+    python -m benchmarks.run_benchmarks --baseline benchmarks/results/previous.json
+
+With ``--baseline`` every phase is compared to the earlier run, and the exit
+status is 1 when any phase is slower than ``--threshold`` times the baseline.
+"""
+from typing import Callable, Dict, List, Optional
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.workload import SchoolWorkload, make_school
+from src.services.constraint_checker import SchoolConstraintChecker
+from src.services.excel_exporter import export_school_workbook
+from src.services.school_timetable_generator import SchoolTimetableGenerator
+from src.utils.exporters import iter_csv
+
+# (divisions per class, teachers); three configured classes per division
+SIZE_GRID = [(1, 8), (2, 16), (4, 30), (8, 60), (14, 150)]
+QUICK_GRID = [(1, 8), (2, 16)]
+PHASES = ("generate", "check", "export_xlsx", "export_csv")
+
+def _timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def run_case(workload: SchoolWorkload, repeat: int) -> Dict[str, object]:
+    """Median seconds per phase over ``repeat`` runs on one workload."""
+    timings: Dict[str, List[float]] = {phase: [] for phase in PHASES}
+    result: Dict[str, object] = {"size": workload.size, "status": "ok"}
+    for _ in range(repeat):
+        generator = SchoolTimetableGenerator(
+            workload.classes, workload.teachers, workload.subject_distributions
+        )
+        try:
+            timings["generate"].append(_timed(generator.generate_timetable))
+        except ValueError as e:
+            result["status"] = f"infeasible: {e}"
+            break
+        timetables = generator.timetables
+        violations: List[str] = []
+        timings["check"].append(_timed(
+            lambda: violations.extend(SchoolConstraintChecker(timetables).check_all_constraints())
+        ))
+        timings["export_xlsx"].append(_timed(lambda: export_school_workbook(timetables, io.BytesIO())))
+        timings["export_csv"].append(_timed(lambda: sum(1 for _ in iter_csv(timetables))))
+        result["violations"] = len(violations)
+    result["seconds"] = {
+        phase: statistics.median(values) for phase, values in timings.items() if values
+    }
+    return result
+
+def run_suite(grid, repeat: int, seed: int) -> Dict[str, object]:
+    cases = {}
+    for divisions, teachers in grid:
+        name = f"{divisions}div-{teachers}t"
+        workload = make_school(divisions=divisions, teachers=teachers, seed=seed)
+        cases[name] = run_case(workload, repeat)
+        seconds = cases[name]["seconds"]
+        print(f"{name:>12}  {cases[name]['status']:<10}  " +
+              "  ".join(f"{phase}={seconds[phase]:.4f}s" for phase in PHASES if phase in seconds))
+    return {
+        "version": _git_revision(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": repeat,
+        "seed": seed,
+        "cases": cases,
+    }
+
+def compare(
+    current: Dict[str, object],
+    baseline: Dict[str, object],
+    threshold: float,
+    min_delta: float = 0.005
+) -> List[str]:
+    """Return a line for every phase slower than ``threshold`` times its baseline.
+
+    Slowdowns under ``min_delta`` seconds are timer noise and are ignored.
+    """
+    regressions = []
+    for name, case in current["cases"].items():
+        before = baseline.get("cases", {}).get(name, {}).get("seconds", {})
+        for phase, seconds in case["seconds"].items():
+            if phase not in before or seconds - before[phase] < min_delta:
+                continue
+            if seconds > before[phase] * threshold:
+                regressions.append(
+                    f"{name} {phase}: {before[phase]:.4f}s -> {seconds:.4f}s "
+                    f"({seconds / before[phase]:.2f}x)"
+                )
+    return regressions
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against an earlier results file")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio counted as a regression")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="only run the smallest sizes")
+    args = parser.parse_args(argv)
+
+    results = run_suite(QUICK_GRID if args.quick else SIZE_GRID, args.repeat, args.seed)
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
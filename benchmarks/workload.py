@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import random
+import string
+
+from src.models.class_info import ClassInfo
+from src.models.teacher import Teacher
+from src.services.timetable_generator import TimetableGenerator
+from src.utils.helpers import minutes_to_time, time_to_minutes
+from src.config import CLASSES, SUBJECTS, CLASS_TIMINGS, BREAK_TIMINGS, WORKING_DAYS
+
+@dataclass
+class SchoolWorkload:
+    """Generator inputs for one synthetic school."""
+    classes: List[ClassInfo]
+    teachers: List[Teacher]
+    subject_distributions: Dict[str, Dict[str, int]]
+
+    @property
+    def size(self) -> Dict[str, int]:
+        return {
+            "classes": len(self.classes),
+            "teachers": len(self.teachers),
+            "periods": sum(sum(self.subject_distributions[c.name].values()) for c in self.classes),
+        }
+
+def _division_names(count: int) -> List[str]:
+    letters = string.ascii_uppercase
+    return [letters[i % 26] + (str(i // 26) if i >= 26 else "") for i in range(count)]
+
+def open_slots_per_week(class_info: ClassInfo) -> int:
+    """Teachable slots in a week for a class, from the generator's own grid."""
+    generator = TimetableGenerator(class_info, [], {})
+    return sum(len(generator.day_grid(day).open_slots) for day in WORKING_DAYS)
+
+def make_school(
+    divisions: int = 4,
+    teachers: int = 20,
+    subjects_per_teacher: int = 2,
+    availability: float = 0.9,
+    fill: float = 0.8,
+    class_names: Optional[List[str]] = None,
+    seed: int = 0
+) -> SchoolWorkload:
+    """Build a reproducible synthetic school.
+
+    ``divisions`` divisions are created for each configured class. Each
+    teacher teaches ``subjects_per_teacher`` subjects to every class, and is
+    available for an ``availability`` fraction of each school day (one
+    contiguous window). ``fill`` is the share of each class's open slots that
+    its subject distribution asks for.
+    """
+    rng = random.Random(seed)
+    class_names = class_names or list(CLASSES)
+    classes = [
+        ClassInfo(
+            name=name,
+            division=division,
+            start_time=CLASS_TIMINGS[name]["start"],
+            end_time=CLASS_TIMINGS[name]["end"],
+            breaks=list(BREAK_TIMINGS[name])
+        )
+        for name in class_names
+        for division in _division_names(divisions)
+    ]
+
+    all_subjects = list(dict.fromkeys(s for name in class_names for s in SUBJECTS[name]))
+    day_start = min(time_to_minutes(CLASS_TIMINGS[name]["start"]) for name in class_names)
+    day_end = max(time_to_minutes(CLASS_TIMINGS[name]["end"]) for name in class_names)
+    window = int((day_end - day_start) * availability)
+    roster = []
+    for i in range(teachers):
+        # Round-robin the first subject so every subject has teachers
+        subjects = [all_subjects[i % len(all_subjects)]]
+        subjects += rng.sample([s for s in all_subjects if s != subjects[0]],
+                               min(subjects_per_teacher, len(all_subjects)) - 1)
+        days = {}
+        for day in WORKING_DAYS:
+            start = day_start + rng.randrange(0, day_end - day_start - window + 1, 15)
+            days[day] = [[minutes_to_time(start), minutes_to_time(start + window)]]
+        roster.append(Teacher(name=f"Teacher {i + 1:03d}", subjects=subjects,
+                              classes=list(class_names), availability=days))
+
+    distributions = {}
+    for name in class_names:
+        target = int(open_slots_per_week(classes[[c.name for c in classes].index(name)]) * fill)
+        subjects = SUBJECTS[name]
+        base, extra = divmod(target, len(subjects))
+        distributions[name] = {s: base + (1 if k < extra else 0) for k, s in enumerate(subjects)}
+
+    return SchoolWorkload(classes=classes, teachers=roster, subject_distributions=distributions)
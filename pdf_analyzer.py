@@ -1,33 +1,66 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+import os
 import PyPDF2
 
-def extract_pdf_content(pdf_path):
+from src.utils.requirements_parser import Requirements, parse_requirements
+
+# Pages per worker task; large enough that re-opening the file per task is cheap
+CHUNK_SIZE = 8
+
+def _extract_pages(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Worker: extract text for pages [start, stop). Each process opens its own reader."""
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return [pdf_reader.pages[page_num].extract_text() or "" for page_num in range(start, stop)]
+
+def iter_pdf_pages(pdf_path: str, max_workers: Optional[int] = None) -> Iterator[str]:
+    """Yield page texts in page order, extracting chunks of pages in parallel.
+
+    Short documents are read in-process, where starting a pool would cost more
+    than it saves.
+    """
+    with open(pdf_path, 'rb') as file:
+        num_pages = len(PyPDF2.PdfReader(file).pages)
+    
+    chunks: List[Tuple[int, int]] = [
+        (start, min(start + CHUNK_SIZE, num_pages)) for start in range(0, num_pages, CHUNK_SIZE)
+    ]
+    if len(chunks) <= 1 or max_workers == 1:
+        for start, stop in chunks:
+            yield from _extract_pages(pdf_path, start, stop)
+        return
+    
+    workers = min(max_workers or os.cpu_count() or 1, len(chunks))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_extract_pages, pdf_path, start, stop) for start, stop in chunks]
+        # Futures are consumed in order, so early pages stream out while later ones are still extracting
+        for future in futures:
+            yield from future.result()
+
+def extract_pdf_content(pdf_path, max_workers=None):
     try:
-        with open(pdf_path, 'rb') as file:
-            # Create a PDF reader object
-            pdf_reader = PyPDF2.PdfReader(file)
-            
-            # Get the number of pages
-            num_pages = len(pdf_reader.pages)
-            print(f"Number of pages: {num_pages}")
-            
-            # Extract text from all pages
-            content = ""
-            for page_num in range(num_pages):
-                page = pdf_reader.pages[page_num]
-                content += page.extract_text()
-            
-            return content
-            
+        return "".join(iter_pdf_pages(pdf_path, max_workers))
     except Exception as e:
         print(f"Error reading PDF: {str(e)}")
         return None
 
+def extract_requirements(pdf_path: str, max_workers: Optional[int] = None) -> Requirements:
+    """Parse teacher, class and subject tables from a requirements PDF as pages arrive."""
+    return parse_requirements(iter_pdf_pages(pdf_path, max_workers))
+
 if __name__ == "__main__":
     pdf_path = "TimeTable Project Details.pdf"
-    content = extract_pdf_content(pdf_path)
-    
-    if content:
-        print("\nPDF Content:")
-        print("-" * 50)
-        print(content)
-        print("-" * 50)
+    try:
+        requirements = extract_requirements(pdf_path)
+    except ValueError as e:
+        print(e)
+    except Exception as e:
+        print(f"Error reading PDF: {str(e)}")
+    else:
+        print(f"Teachers: {len(requirements.teachers)}")
+        for teacher in requirements.teachers:
+            print(f"  {teacher}")
+        print(f"Classes: {', '.join(c.class_name for c in requirements.classes)}")
+        for class_name, distribution in requirements.subject_distributions.items():
+            print(f"  {class_name}: {distribution}")
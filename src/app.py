@@ -1,73 +1,169 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, send_file
+from flask import Flask, render_template, request, redirect, url_for, flash, send_file, jsonify
 from flask_wtf import FlaskForm
 from wtforms import StringField, SelectField, TimeField, SubmitField
 from wtforms.validators import DataRequired
+import io
 import os
-from datetime import datetime
+import sys
 
-from models.class_info import ClassInfo
-from models.teacher import Teacher
-from services.timetable_generator import TimetableGenerator
-from utils.helpers import load_teacher_data, parse_time
-from config import CLASSES, DIVISIONS
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.models.class_info import ClassInfo
+from src.models.teacher import Teacher
+from src.services.job_queue import JobQueue, QueueFullError, DONE, FAILED
+from src.services.school_timetable_generator import SchoolTimetableGenerator
+from src.services.timetable_cache import TimetableCache, cached_generate, cached_generate_school, cached_workbook
+from src.utils.helpers import load_teacher_data, parse_time
+from src.config import CLASSES, DIVISIONS, SUBJECTS
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.urandom(24)
-app.config['UPLOAD_FOLDER'] = 'uploads'
+app.config['MAX_CONCURRENT_JOBS'] = 2
+app.config['MAX_PENDING_JOBS'] = 8
+# Teacher files are only read from this directory; paths are relative to it
+app.config['UPLOAD_FOLDER'] = os.path.join(project_root, 'uploads')
+
+# Solves run on a bounded worker pool so request threads never block on them;
+# results live in memory (and the cache), nothing is written to disk
+jobs = JobQueue(max_workers=app.config['MAX_CONCURRENT_JOBS'], max_pending=app.config['MAX_PENDING_JOBS'])
+cache = TimetableCache()
 
-# Ensure upload folder exists
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+SUBJECT_DISTRIBUTION = {"Mathematics": 6, "Science": 4, "English": 6, "Social Studies": 4}
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
 
 class TimetableForm(FlaskForm):
     class_name = SelectField('Class', choices=[(c, c) for c in CLASSES], validators=[DataRequired()])
     division = SelectField('Division', choices=[(d, d) for d in DIVISIONS], validators=[DataRequired()])
+    scope = SelectField('Generate for', choices=[('class', 'This class'), ('school', 'Whole school')], default='class')
     teacher_file = StringField('Teacher Data File Path', validators=[DataRequired()])
     submit = SubmitField('Generate Timetable')
 
+def resolve_teacher_file(name):
+    """Absolute path of a teacher file in the upload folder, or None if it is not one"""
+    folder = os.path.realpath(app.config['UPLOAD_FOLDER'])
+    path = os.path.realpath(os.path.join(folder, name))
+    if os.path.commonpath([folder, path]) != folder or not os.path.isfile(path):
+        return None
+    return path
+
+def generate_workbook(teacher_file, class_name, division, scope='class'):
+    """Background job: solve and return (download filename, xlsx bytes)"""
+    teachers = load_teacher_data(teacher_file)
+    
+    if scope == 'school':
+        school = SchoolTimetableGenerator.from_config(teachers, {
+            name: {s: n for s, n in SUBJECT_DISTRIBUTION.items() if s in SUBJECTS[name]}
+            for name in CLASSES
+        })
+        key, timetables = cached_generate_school(cache, school)
+        return "timetable_school.xlsx", cached_workbook(cache, key, timetables)
+    
+    # Create class info
+    class_info = ClassInfo(
+        name=class_name,
+        division=division,
+        start_time=parse_time("8:15 AM"),
+        end_time=parse_time("2:15 PM"),
+        breaks=[(parse_time("12:45 PM"), parse_time("1:15 PM"))]
+    )
+    key, timetable = cached_generate(
+        cache,
+        class_info=class_info,
+        teachers=teachers,
+        subject_distribution=SUBJECT_DISTRIBUTION
+    )
+    filename = f"timetable_{class_info.class_name}.xlsx"
+    return filename, cached_workbook(cache, key, {class_info.class_name: timetable})
+
+def job_response(job, code=200):
+    body = job.to_dict()
+    body['status_url'] = url_for('job_status', job_id=job.id)
+    if job.status == DONE:
+        body['result_url'] = url_for('job_result', job_id=job.id)
+    return jsonify(body), code
+
 @app.route('/', methods=['GET', 'POST'])
 def index():
     form = TimetableForm()
     if form.validate_on_submit():
+        teacher_file = resolve_teacher_file(form.teacher_file.data)
+        if teacher_file is None:
+            flash(f"Teacher data file not found in uploads: {form.teacher_file.data}", 'error')
+            return redirect(url_for('index'))
         try:
-            # Load teacher data
-            teachers = load_teacher_data(form.teacher_file.data)
-            
-            # Create class info
-            class_info = ClassInfo(
-                name=form.class_name.data,
-                division=form.division.data,
-                start_time=parse_time("8:15 AM"),
-                end_time=parse_time("2:15 PM"),
-                breaks=[(parse_time("12:45 PM"), parse_time("1:15 PM"))]
+            job = jobs.submit(
+                generate_workbook,
+                teacher_file,
+                form.class_name.data,
+                form.division.data,
+                form.scope.data
             )
-            
-            # Generate timetable
-            generator = TimetableGenerator(
-                class_info=class_info,
-                teachers=[Teacher(**t) for t in teachers],
-                subject_distribution={"Mathematics": 6, "Science": 4, "English": 6, "Social Studies": 4}
-            )
-            
-            timetable = generator.generate_timetable()
-            
-            # Export to Excel
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"timetable_{class_info.class_name}_{timestamp}.xlsx"
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            generator.export_to_excel(filepath)
-            
-            return send_file(
-                filepath,
-                as_attachment=True,
-                download_name=filename,
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-            )
-            
-        except Exception as e:
-            flash(f"Error generating timetable: {str(e)}", 'error')
+        except QueueFullError as e:
+            flash(str(e), 'error')
             return redirect(url_for('index'))
+        return redirect(url_for('job_page', job_id=job.id))
     
     return render_template('index.html', form=form)
 
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    data = request.get_json(silent=True) or request.form
+    if not data.get('teacher_file'):
+        return jsonify({'error': 'teacher_file is required'}), 400
+    teacher_file = resolve_teacher_file(data['teacher_file'])
+    if teacher_file is None:
+        return jsonify({'error': 'teacher_file must name a file in the upload folder'}), 400
+    try:
+        job = jobs.submit(
+            generate_workbook,
+            teacher_file,
+            data.get('class_name', CLASSES[0]),
+            data.get('division', DIVISIONS[0]),
+            data.get('scope', 'class')
+        )
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 429
+    return job_response(job, 202)
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return job_response(job)
+
+@app.route('/jobs/<job_id>/view')
+def job_page(job_id):
+    """HTML status page for the form; reloads itself until the job finishes"""
+    job = jobs.get(job_id)
+    if job is None:
+        flash('Unknown job', 'error')
+        return redirect(url_for('index'))
+    return render_template(
+        'job_status.html',
+        job=job,
+        result_url=url_for('job_result', job_id=job.id) if job.status == DONE else None
+    )
+
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    if job.status == FAILED:
+        return jsonify({'error': f"Error generating timetable: {job.error}"}), 500
+    if job.status != DONE:
+        return job_response(job, 409)
+    
+    filename, data = job.result
+    return send_file(
+        io.BytesIO(data),
+        as_attachment=True,
+        download_name=filename,
+        mimetype=XLSX_MIMETYPE
+    )
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
@@ -37,3 +37,7 @@ SUBJECTS = {
     "Sr.Kg": ["English", "Mathematics", "Environmental Science", "Art", "Physical Education"],
     "1st": ["English", "Mathematics", "Science", "Social Studies", "Art", "Physical Education"],
 }
+
+# Subject of every regular period on an exam day; it has no teacher and is
+# left out of the subject distribution checks
+EXAM_SUBJECT = "Exam"
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from datetime import time
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+
+from src.config import BREAK_TIMINGS
 
 @dataclass
 class ClassInfo:
@@ -8,9 +10,14 @@ class ClassInfo:
     division: str
     start_time: time
     end_time: time
-    breaks: List[Tuple[time, time]]
+    breaks: Optional[List[Tuple[time, time]]] = None  # None uses BREAK_TIMINGS; [] means no breaks
     
     @property
     def class_name(self) -> str:
         """Return formatted class name with division."""
         return f"{self.name}-{self.division}"
+    
+    def is_break_time(self, t: time) -> bool:
+        """Check if a time falls within one of the class's breaks."""
+        breaks = self.breaks if self.breaks is not None else BREAK_TIMINGS.get(self.name, [])
+        return any(start <= t < end for start, end in breaks)
@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from datetime import time
 from typing import Optional
 
+from src.utils.helpers import time_to_minutes
+
 @dataclass
 class Period:
     start_time: time
@@ -11,11 +13,17 @@ class Period:
     is_assembly: bool = False
     is_break: bool = False
     
+    @property
+    def start_minute(self) -> int:
+        return time_to_minutes(self.start_time)
+    
+    @property
+    def end_minute(self) -> int:
+        return time_to_minutes(self.end_time)
+    
     @property
     def duration_minutes(self) -> int:
-        start_minutes = self.start_time.hour * 60 + self.start_time.minute
-        end_minutes = self.end_time.hour * 60 + self.end_time.minute
-        return end_minutes - start_minutes
+        return self.end_minute - self.start_minute
     
     def __str__(self) -> str:
         if self.is_assembly:
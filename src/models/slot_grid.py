@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional, Tuple
+
+from src.models.period import Period
+from src.utils.helpers import minutes_to_time
+
+REGULAR = "regular"
+BREAK = "break"
+ASSEMBLY = "assembly"
+
+@dataclass(frozen=True)
+class Slot:
+    """A block of a school day in minutes since midnight."""
+    index: int
+    start: int
+    end: int
+    kind: str = REGULAR
+
+    @property
+    def is_open(self) -> bool:
+        """True for teachable slots that still need a subject and teacher."""
+        return self.kind == REGULAR
+
+    def to_period(self, subject: str = "", teacher: Optional[str] = None) -> Period:
+        """Build a Period for this slot; time objects are only created here."""
+        if self.kind == BREAK:
+            subject = "Break"
+        elif self.kind == ASSEMBLY:
+            subject = "Assembly"
+        return Period(
+            start_time=minutes_to_time(self.start),
+            end_time=minutes_to_time(self.end),
+            subject=subject,
+            teacher=teacher,
+            is_assembly=self.kind == ASSEMBLY,
+            is_break=self.kind == BREAK
+        )
+
+@dataclass(frozen=True)
+class DayGrid:
+    """Integer slot grid for one class on one day."""
+    day: str
+    slots: Tuple[Slot, ...]
+
+    # Computed once per grid; the slots themselves never change
+    @cached_property
+    def open_slots(self) -> Tuple[Slot, ...]:
+        return tuple(slot for slot in self.slots if slot.is_open)
+
+    @cached_property
+    def fixed_slots(self) -> Tuple[Slot, ...]:
+        return tuple(slot for slot in self.slots if not slot.is_open)
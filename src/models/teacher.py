@@ -1,18 +1,21 @@
 from dataclasses import dataclass
-from typing import List, Dict, Union
+from typing import Dict, List, Union
 from datetime import time
 
+from src.utils.helpers import parse_time, time_to_minutes, interval_mask
+
+def _window_minute(value: Union[str, time]) -> int:
+    return time_to_minutes(parse_time(value) if isinstance(value, str) else value)
+
 @dataclass
 class Teacher:
     name: str
     subjects: List[str]
     classes: List[str]
     availability: Dict[str, List[List[Union[str, time]]]]  # Day -> List of [start_time, end_time]
-    
+
     def __post_init__(self):
         """Convert time strings to time objects if they aren't already"""
-        from src.utils.helpers import parse_time
-        
         for day, slots in self.availability.items():
             converted_slots = []
             for slot in slots:
@@ -21,26 +24,43 @@ class Teacher:
                     parse_time(slot[1]) if isinstance(slot[1], str) else slot[1]
                 ])
             self.availability[day] = converted_slots
-    
+        # Day -> bitmask of available minutes; not a field, so asdict() and replace() skip it
+        self._availability_masks: Dict[str, int] = {}
+        self.compile_availability()
+
+    def compile_availability(self) -> Dict[str, int]:
+        """Compile availability windows into per-day minute bitmasks.
+
+        Must be called again if ``availability`` is changed after construction;
+        the generator, optimizer, repair and term scheduler do so on creation.
+        """
+        masks = {}
+        for day, slots in self.availability.items():
+            mask = 0
+            for start, end in slots:
+                mask |= interval_mask(_window_minute(start), _window_minute(end))
+            masks[day] = mask
+        self._availability_masks = masks
+        return masks
+
+    def availability_mask(self, day: str) -> int:
+        """Return the bitmask of minutes the teacher is available on a day."""
+        return self._availability_masks.get(day, 0)
+
     def is_available(self, day: str, period_start: time, period_end: time) -> bool:
         """Check if teacher is available for a given time slot."""
-        if day not in self.availability:
+        return self.is_available_minutes(day, time_to_minutes(period_start), time_to_minutes(period_end))
+
+    def is_available_minutes(self, day: str, start_minute: int, end_minute: int) -> bool:
+        """Check availability for a block given in minutes since midnight."""
+        if day not in self._availability_masks:
             return False
-            
-        for start, end in self.availability[day]:
-            # Convert minutes since midnight for proper comparison
-            slot_start_mins = start.hour * 60 + start.minute
-            slot_end_mins = end.hour * 60 + end.minute
-            period_start_mins = period_start.hour * 60 + period_start.minute
-            period_end_mins = period_end.hour * 60 + period_end.minute
-            
-            if slot_start_mins <= period_start_mins and period_end_mins <= slot_end_mins:
-                return True
-        return False
-    
+        mask = interval_mask(start_minute, end_minute)
+        return self._availability_masks[day] & mask == mask
+
     def can_teach_subject(self, subject: str) -> bool:
         """Check if teacher can teach a subject."""
         return subject in self.subjects
-    
+
     def __str__(self) -> str:
         return f"{self.name} ({', '.join(self.subjects)})"
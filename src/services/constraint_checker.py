@@ -1,17 +1,72 @@
-from typing import Dict, List, Set
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import heapq
 from ..models.period import Period
-from ..config import MIN_PERIODS_PER_DAY, MAX_PERIODS_PER_DAY, WORKING_DAYS
+from .incremental_checker import PERIOD_COUNT, TEACHER_CONFLICTS, SUBJECT_DISTRIBUTION
+from .instrumentation import SolverStats
+from ..config import MIN_PERIODS_PER_DAY, MAX_PERIODS_PER_DAY, WORKING_DAYS, EXAM_SUBJECT
+
+@dataclass
+class TeacherConflict:
+    """Two overlapping periods taught by the same teacher."""
+    teacher: str
+    day: str
+    class_a: str
+    period_a: Period
+    class_b: str
+    period_b: Period
+
+def find_teacher_conflicts(timetables: Dict[str, Dict[str, List[Period]]]) -> List[TeacherConflict]:
+    """Find every overlapping pair of periods per teacher across many timetables.
+
+    Periods are bucketed by (teacher, day) and swept in start order while a heap
+    keeps the periods still running, so the cost is O(n log n) plus the number
+    of conflicts reported.
+    """
+    buckets: Dict[Tuple[str, str], List[Tuple[int, int, str, Period]]] = {}
+    for class_name, timetable in timetables.items():
+        for day, periods in timetable.items():
+            for period in periods:
+                if period.teacher:
+                    buckets.setdefault((period.teacher, day), []).append(
+                        (period.start_minute, period.end_minute, class_name, period)
+                    )
+
+    conflicts: List[TeacherConflict] = []
+    for (teacher, day), spans in buckets.items():
+        if len(spans) < 2:
+            continue
+        spans.sort(key=lambda span: (span[0], span[1]))
+        active: List[Tuple[int, int]] = []  # (end minute, index into spans)
+        for index, (start, end, class_name, period) in enumerate(spans):
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            for _, other in sorted(active, key=lambda item: item[1]):
+                _, _, other_class, other_period = spans[other]
+                conflicts.append(TeacherConflict(teacher, day, other_class, other_period, class_name, period))
+            heapq.heappush(active, (end, index))
+    return conflicts
+
+def _run_rule(stats: Optional[SolverStats], rule: str, check: Callable[[], List[str]]) -> List[str]:
+    """Run one rule, timing it and counting its violations when stats are given."""
+    if stats is None:
+        return check()
+    with stats.phase(f"check.{rule}"):
+        violations = check()
+    stats.count(f"violations.{rule}", len(violations))
+    return violations
 
 class ConstraintChecker:
-    def __init__(self, timetable: Dict[str, List[Period]]):
+    def __init__(self, timetable: Dict[str, List[Period]], stats: Optional[SolverStats] = None):
         self.timetable = timetable
+        self.stats = stats
     
     def check_all_constraints(self) -> List[str]:
         """Check all timetable constraints and return list of violations."""
         violations = []
-        violations.extend(self.check_period_count())
-        violations.extend(self.check_teacher_conflicts())
-        violations.extend(self.check_subject_distribution())
+        violations.extend(_run_rule(self.stats, PERIOD_COUNT, self.check_period_count))
+        violations.extend(_run_rule(self.stats, TEACHER_CONFLICTS, self.check_teacher_conflicts))
+        violations.extend(_run_rule(self.stats, SUBJECT_DISTRIBUTION, self.check_subject_distribution))
         return violations
     
     def check_period_count(self) -> List[str]:
@@ -34,37 +89,25 @@ class ConstraintChecker:
     
     def check_teacher_conflicts(self) -> List[str]:
         """Check if any teacher is scheduled for multiple classes at the same time."""
-        violations = []
-        for day in WORKING_DAYS:
-            teacher_schedules: Dict[str, List[Period]] = {}
-            
-            for period in self.timetable[day]:
-                if period.teacher:
-                    if period.teacher not in teacher_schedules:
-                        teacher_schedules[period.teacher] = []
-                    teacher_schedules[period.teacher].append(period)
-            
-            # Check for overlapping periods
-            for teacher, periods in teacher_schedules.items():
-                for i, p1 in enumerate(periods):
-                    for p2 in periods[i+1:]:
-                        if (p1.start_time <= p2.start_time < p1.end_time or
-                            p2.start_time <= p1.start_time < p2.end_time):
-                            violations.append(
-                                f"Teacher {teacher} has conflicting periods on {day} "
-                                f"at {p1.start_time}-{p1.end_time} and {p2.start_time}-{p2.end_time}"
-                            )
-        return violations
+        timetable = {day: self.timetable[day] for day in WORKING_DAYS}
+        return [
+            f"Teacher {c.teacher} has conflicting periods on {c.day} "
+            f"at {c.period_a.start_time}-{c.period_a.end_time} and {c.period_b.start_time}-{c.period_b.end_time}"
+            for c in find_teacher_conflicts({"": timetable})
+        ]
     
     def check_subject_distribution(self) -> List[str]:
-        """Check if subjects are well-distributed throughout the week."""
+        """Check if subjects are well-distributed throughout the week.
+
+        Exam periods still count as periods of their day but not here.
+        """
         violations = []
         subject_counts: Dict[str, int] = {}
         
         # Count subjects
         for day in WORKING_DAYS:
             for period in self.timetable[day]:
-                if not (period.is_break or period.is_assembly):
+                if not (period.is_break or period.is_assembly or period.subject == EXAM_SUBJECT):
                     subject_counts[period.subject] = subject_counts.get(period.subject, 0) + 1
         
         # Check for subjects that appear too frequently or rarely
@@ -80,3 +123,38 @@ class ConstraintChecker:
                 )
         
         return violations
+
+class SchoolConstraintChecker:
+    """Check constraints for many class timetables at once.
+
+    Per-class rules run as in ConstraintChecker; teacher conflicts are found
+    school-wide so double-bookings across divisions are reported too.
+    """
+
+    def __init__(self, timetables: Dict[str, Dict[str, List[Period]]], stats: Optional[SolverStats] = None):
+        self.timetables = timetables
+        self.stats = stats
+
+    def check_all_constraints(self) -> List[str]:
+        """Check all constraints for every class and return list of violations."""
+        violations = []
+        for class_name, timetable in self.timetables.items():
+            checker = ConstraintChecker(timetable)
+            for rule, check in ((PERIOD_COUNT, checker.check_period_count),
+                                (SUBJECT_DISTRIBUTION, checker.check_subject_distribution)):
+                violations.extend(f"{class_name}: {v}" for v in _run_rule(self.stats, rule, check))
+        violations.extend(_run_rule(self.stats, TEACHER_CONFLICTS, self.check_teacher_conflicts))
+        return violations
+
+    def check_teacher_conflicts(self) -> List[str]:
+        """Report every pair of classes that share a teacher at overlapping times."""
+        return [
+            f"Teacher {c.teacher} is double-booked on {c.day}: "
+            f"{c.class_a} at {c.period_a.start_time}-{c.period_a.end_time} and "
+            f"{c.class_b} at {c.period_b.start_time}-{c.period_b.end_time}"
+            for c in self.find_teacher_conflicts()
+        ]
+
+    def find_teacher_conflicts(self) -> List[TeacherConflict]:
+        """Return structured teacher conflicts across all timetables."""
+        return find_teacher_conflicts(self.timetables)
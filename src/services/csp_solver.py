@@ -0,0 +1,256 @@
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+import time as clock
+
+from src.models.teacher import Teacher
+from src.config import WORKING_DAYS, MAX_PERIODS_PER_DAY
+
+if TYPE_CHECKING:
+    from src.services.timetable_generator import TimetableGenerator
+
+@dataclass
+class SearchStats:
+    """Counters describing how much search the CSP engine did."""
+    nodes: int = 0              # Values assigned to a variable
+    backtracks: int = 0         # Variables whose domain was exhausted
+    backjumps: int = 0          # Levels skipped by conflict-directed backjumping
+    prunings: int = 0           # Values removed by forward checking
+    wipeouts: int = 0           # Forward checks that emptied a future domain
+    elapsed_seconds: float = 0.0
+
+class CSPSolver:
+    """Backtracking search (FC-CBJ) over the periods a class still needs.
+
+    Every required period of a subject is a variable whose domain is the set of
+    open slots where an eligible teacher is available and not already booked.
+    Assigning a slot prunes it from every other variable (forward checking),
+    caps each day at MAX_PERIODS_PER_DAY, and keeps periods of the same subject
+    in slot order to break symmetry. Variables are chosen by minimum remaining
+    values, and dead ends jump straight back to the most recent variable in
+    their conflict set.
+    """
+
+    def __init__(self, generator: "TimetableGenerator", max_nodes: int = 200000):
+        self.generator = generator
+        self.max_nodes = max_nodes
+        self.stats = SearchStats()
+
+        # Open slots across the week, in chronological order
+        self.slots: List[Tuple[str, int, int]] = []
+        self.grid_index: List[int] = []
+        for day in WORKING_DAYS:
+            for grid_slot in generator.day_grid(day).open_slots:
+                self.slots.append((day, grid_slot.start, grid_slot.end))
+                self.grid_index.append(grid_slot.index)
+        self.slots_by_day: Dict[str, List[int]] = {day: [] for day in WORKING_DAYS}
+        for index, (day, _, _) in enumerate(self.slots):
+            self.slots_by_day[day].append(index)
+
+        # Variables: (subject, k) for the k-th period of each subject
+        self.variables: List[Tuple[str, int]] = [
+            (subject, k)
+            for subject, count in generator.subject_distribution.items()
+            for k in range(count)
+        ]
+        self.units_of: Dict[str, List[int]] = {}
+        for var, (subject, _) in enumerate(self.variables):
+            self.units_of.setdefault(subject, []).append(var)
+
+        # Eligible teachers per (subject, slot); fixed for the whole search
+        self.candidates: Dict[Tuple[str, int], List[Teacher]] = {}
+        for subject in self.units_of:
+            for index, (day, start, end) in enumerate(self.slots):
+                teachers = [
+                    teacher for teacher in generator.subject_teachers.get(subject, ())
+                    if teacher.is_available_minutes(day, start, end)
+                    and generator.occupancy.is_free(teacher.name, day, start, end)
+                ]
+                if teachers:
+                    self.candidates[(subject, index)] = teachers
+
+        self.domains: List[Set[int]] = [
+            {index for index in range(len(self.slots)) if (subject, index) in self.candidates}
+            for subject, _ in self.variables
+        ]
+        self.assignment: Dict[int, int] = {}
+        self.day_count: Counter = Counter()
+        self.subject_day_count: Counter = Counter()
+        # Pruning events caused by each variable: (pruned_var, slots, culprits)
+        self.prune_log: Dict[int, List[Tuple[int, List[int], Tuple[int, ...]]]] = {}
+        # Multiset of past variables responsible for pruning each variable
+        self.past_fc: List[Counter] = [Counter() for _ in self.variables]
+
+    def solve(self) -> Dict[str, Dict[int, Tuple[str, str]]]:
+        """Search for a complete assignment.
+
+        Returns day -> grid slot index -> (subject, teacher name).
+        """
+        started = clock.perf_counter()
+        try:
+            if any(not domain for domain in self.domains) or not self._capacity_ok():
+                raise ValueError("Could not distribute all required periods")
+            if self._search() is not None:
+                raise ValueError("Could not distribute all required periods")
+        finally:
+            self.stats.elapsed_seconds = clock.perf_counter() - started
+        return self._build_assignment()
+
+    def _search(self) -> Optional[Set[int]]:
+        """Assign remaining variables; return None on success or a conflict set."""
+        var = self._select_variable()
+        if var is None:
+            return None
+
+        conflict: Set[int] = set()
+        for slot in self._order_values(var):
+            if self.stats.nodes >= self.max_nodes:
+                raise ValueError(f"CSP search gave up after {self.max_nodes} nodes")
+            self.stats.nodes += 1
+            self._assign(var, slot)
+            wiped = self._forward_check(var, slot)
+            if wiped is None and not self._capacity_ok():
+                # Not enough room left for the remaining periods; blame every past choice
+                self.stats.wipeouts += 1
+                conflict |= set(self.assignment)
+            elif wiped is None:
+                result = self._search()
+                if result is None:
+                    return None
+                if var not in result:
+                    # Nothing this variable can do fixes the failure below it
+                    self._unassign(var, slot)
+                    self.stats.backjumps += 1
+                    return result
+                conflict |= result
+            else:
+                self.stats.wipeouts += 1
+                conflict |= set(self.past_fc[wiped])
+            self._unassign(var, slot)
+
+        self.stats.backtracks += 1
+        conflict |= set(self.past_fc[var])
+        conflict.discard(var)
+        return conflict
+
+    def _select_variable(self) -> Optional[int]:
+        """Minimum remaining values, ties broken by fewest eligible teachers."""
+        best = None
+        best_key = None
+        for var in range(len(self.variables)):
+            if var in self.assignment:
+                continue
+            subject = self.variables[var][0]
+            key = (len(self.domains[var]), len(self.generator.subject_teachers.get(subject, ())), var)
+            if best_key is None or key < best_key:
+                best, best_key = var, key
+        return best
+
+    def _order_values(self, var: int) -> List[int]:
+        """Prefer slots on the day this unit would land on if spread evenly."""
+        subject, k = self.variables[var]
+        total = len(self.units_of[subject])
+        target_day = k * len(WORKING_DAYS) // total
+
+        def key(slot: int) -> Tuple[int, int, int, int]:
+            day = self.slots[slot][0]
+            day_index = WORKING_DAYS.index(day)
+            return (
+                abs(day_index - target_day),
+                self.subject_day_count[(subject, day)],
+                self.day_count[day],
+                slot
+            )
+
+        return sorted(self.domains[var], key=key)
+
+    def _assign(self, var: int, slot: int) -> None:
+        subject = self.variables[var][0]
+        day = self.slots[slot][0]
+        self.assignment[var] = slot
+        self.day_count[day] += 1
+        self.subject_day_count[(subject, day)] += 1
+        self.prune_log[var] = []
+
+    def _unassign(self, var: int, slot: int) -> None:
+        for pruned_var, slots, culprits in self.prune_log.pop(var):
+            self.domains[pruned_var].update(slots)
+            self.past_fc[pruned_var].subtract(culprits)
+            self.past_fc[pruned_var] += Counter()  # Drop zero counts
+        subject = self.variables[var][0]
+        day = self.slots[slot][0]
+        del self.assignment[var]
+        self.day_count[day] -= 1
+        self.subject_day_count[(subject, day)] -= 1
+
+    def _prune(self, cause: int, var: int, slots: List[int], culprits: Tuple[int, ...]) -> bool:
+        """Remove slots from a future variable; return False on a wipeout."""
+        removed = [slot for slot in slots if slot in self.domains[var]]
+        if removed:
+            self.domains[var].difference_update(removed)
+            self.past_fc[var].update(culprits)
+            self.prune_log[cause].append((var, removed, culprits))
+            self.stats.prunings += len(removed)
+        return bool(self.domains[var])
+
+    def _forward_check(self, var: int, slot: int) -> Optional[int]:
+        """Prune future domains after assigning var; return a wiped-out variable."""
+        subject, k = self.variables[var]
+        day = self.slots[slot][0]
+        future = [other for other in range(len(self.variables)) if other not in self.assignment]
+
+        for other in future:
+            other_subject, other_k = self.variables[other]
+            slots = [slot]
+            if other_subject == subject:
+                # Periods of a subject are interchangeable; keep them in slot order
+                domain = self.domains[other]
+                if other_k > k:
+                    slots = [s for s in domain if s <= slot]
+                else:
+                    slots = [s for s in domain if s >= slot]
+            if not self._prune(var, other, slots, (var,)):
+                return other
+
+        if self.day_count[day] >= MAX_PERIODS_PER_DAY:
+            day_slots = self.slots_by_day[day]
+            culprits = tuple(v for v, s in self.assignment.items() if self.slots[s][0] == day)
+            for other in future:
+                if not self._prune(var, other, day_slots, culprits):
+                    return other
+        return None
+
+    def _capacity_ok(self) -> bool:
+        """Pigeonhole check: can the open slots still hold every unassigned period?"""
+        future = [var for var in range(len(self.variables)) if var not in self.assignment]
+        if not future:
+            return True
+        usable: Set[int] = set()
+        by_subject: Dict[str, Set[int]] = {}
+        needed: Counter = Counter()
+        for var in future:
+            subject = self.variables[var][0]
+            usable |= self.domains[var]
+            by_subject.setdefault(subject, set()).update(self.domains[var])
+            needed[subject] += 1
+        if any(len(by_subject[subject]) < count for subject, count in needed.items()):
+            return False
+        room = 0
+        for day, day_slots in self.slots_by_day.items():
+            open_slots = sum(1 for slot in day_slots if slot in usable)
+            room += min(open_slots, MAX_PERIODS_PER_DAY - self.day_count[day])
+        return room >= len(future)
+
+    def _build_assignment(self) -> Dict[str, Dict[int, Tuple[str, str]]]:
+        """Pick teachers for the assignment and book them in the occupancy index."""
+        result: Dict[str, Dict[int, Tuple[str, str]]] = {day: {} for day in WORKING_DAYS}
+        teacher_load: Counter = Counter()
+        for var, slot in sorted(self.assignment.items(), key=lambda item: item[1]):
+            subject = self.variables[var][0]
+            day, start, end = self.slots[slot]
+            # Least-loaded eligible teacher; input order breaks ties
+            teacher = min(self.candidates[(subject, slot)], key=lambda t: teacher_load[t.name])
+            teacher_load[teacher.name] += 1
+            self.generator.occupancy.book(teacher.name, day, start, end)
+            result[day][self.grid_index[slot]] = (subject, teacher.name)
+        return result
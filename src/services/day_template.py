@@ -0,0 +1,71 @@
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from src.models.class_info import ClassInfo
+from src.models.slot_grid import Slot, DayGrid, REGULAR, BREAK, ASSEMBLY
+from src.utils.helpers import time_to_minutes
+from src.config import PERIOD_DURATION, ASSEMBLY_DAY, ASSEMBLY_TIME, BREAK_TIMINGS
+
+Interval = Tuple[int, int]
+
+def class_breaks(class_info: ClassInfo) -> Tuple[Interval, ...]:
+    """Sorted break intervals in minutes; ClassInfo.breaks, or the configured ones when it is None."""
+    breaks = class_info.breaks if class_info.breaks is not None else BREAK_TIMINGS.get(class_info.name, [])
+    return tuple(sorted((time_to_minutes(start), time_to_minutes(end)) for start, end in breaks))
+
+@lru_cache(maxsize=256)
+def compile_day_template(
+    start_minute: int,
+    end_minute: int,
+    breaks: Tuple[Interval, ...],
+    period_minutes: int,
+    assembly_minute: Optional[int] = None
+) -> Tuple[Slot, ...]:
+    """Lay out one school day as slots of regular periods, breaks and assembly.
+
+    Cached on its arguments, so every division and every day with the same
+    timings shares one template. A break or assembly that does not line up
+    with the period grid still starts on time: the minutes before it are left
+    as a gap instead of a period that would overlap it. Periods that would run
+    past ``end_minute`` are not created.
+    """
+    fixed = sorted(
+        list(breaks) +
+        ([(assembly_minute, assembly_minute + period_minutes)] if assembly_minute is not None else [])
+    )
+    kinds = {interval: BREAK for interval in breaks}
+    if assembly_minute is not None:
+        kinds[(assembly_minute, assembly_minute + period_minutes)] = ASSEMBLY
+
+    slots = []
+    current = start_minute
+    pending = [interval for interval in fixed if interval[1] > start_minute and interval[0] < end_minute]
+    while current < end_minute:
+        while pending and pending[0][1] <= current:
+            pending.pop(0)  # Overlapped by an earlier block
+        if pending and pending[0][0] <= current:
+            # Inside or at the start of a fixed block
+            block = pending.pop(0)
+            end = min(block[1], end_minute)
+            slots.append(Slot(index=len(slots), start=current, end=end, kind=kinds[block]))
+            current = end
+            continue
+        end = current + period_minutes
+        if pending and pending[0][0] < end:
+            current = pending[0][0]  # Leave the gap before an off-grid block
+            continue
+        if end > end_minute:
+            break
+        slots.append(Slot(index=len(slots), start=current, end=end, kind=REGULAR))
+        current = end
+    return tuple(slots)
+
+def day_grid_for(class_info: ClassInfo, day: str) -> DayGrid:
+    """The slot grid for a class on a day, from the shared template cache."""
+    return DayGrid(day=day, slots=compile_day_template(
+        time_to_minutes(class_info.start_time),
+        time_to_minutes(class_info.end_time),
+        class_breaks(class_info),
+        int(PERIOD_DURATION.total_seconds()) // 60,
+        time_to_minutes(ASSEMBLY_TIME) if day == ASSEMBLY_DAY else None
+    ))
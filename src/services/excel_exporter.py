@@ -0,0 +1,85 @@
+from collections import Counter
+from typing import BinaryIO, Dict, List, Set, Tuple, Union
+from openpyxl import Workbook
+
+from src.models.period import Period
+from src.utils.helpers import minutes_to_time
+from src.config import WORKING_DAYS
+
+CLASS_HEADER = ['Day', 'Start Time', 'End Time', 'Subject', 'Teacher']
+TEACHER_HEADER = ['Day', 'Start Time', 'End Time', 'Class', 'Subject']
+SUMMARY_HEADER = ['Sheet', 'Kind', 'Teaching Periods', 'Breaks', 'Assemblies', 'Distinct Subjects']
+
+# Characters Excel does not allow in sheet names
+_INVALID_SHEET_CHARS = str.maketrans({c: '_' for c in '[]:*?/\\'})
+
+def _sheet_title(name: str, used: Set[str]) -> str:
+    """Return a valid, unique sheet title (max 31 characters)."""
+    base = name.translate(_INVALID_SHEET_CHARS)[:31] or 'Sheet'
+    title, n = base, 2
+    while title.lower() in used:
+        suffix = f" ({n})"
+        title = base[:31 - len(suffix)] + suffix
+        n += 1
+    used.add(title.lower())
+    return title
+
+def export_school_workbook(
+    timetables: Dict[str, Dict[str, List[Period]]],
+    target: Union[str, BinaryIO]
+) -> None:
+    """Write every class, every teacher and a summary into one workbook.
+
+    Uses openpyxl write-only mode, so class rows stream straight to disk. Only
+    the small teacher rows and summary counters are held until the end.
+    ``target`` is a filename or a binary file object such as BytesIO.
+    """
+    workbook = Workbook(write_only=True)
+    used_titles: Set[str] = set()
+    summary_sheet = workbook.create_sheet(_sheet_title('Summary', used_titles))
+    summary_sheet.append(SUMMARY_HEADER)
+
+    labels: Dict[int, str] = {}
+
+    def label(minute: int) -> str:
+        # Each distinct time is formatted once for the whole workbook
+        if minute not in labels:
+            labels[minute] = minutes_to_time(minute).strftime('%I:%M %p')
+        return labels[minute]
+
+    # teacher -> (day index, start minute, row) so rows can be put in time order
+    teacher_rows: Dict[str, List[Tuple[int, int, List[str]]]] = {}
+    summary_rows = []
+    for class_name, timetable in timetables.items():
+        sheet = workbook.create_sheet(_sheet_title(class_name, used_titles))
+        sheet.append(CLASS_HEADER)
+        kinds: Counter = Counter()
+        subjects: Set[str] = set()
+        for day_index, day in enumerate(WORKING_DAYS):
+            for period in timetable.get(day, []):
+                start, end = label(period.start_minute), label(period.end_minute)
+                sheet.append([day, start, end, period.subject, period.teacher or 'N/A'])
+                if period.is_break:
+                    kinds['break'] += 1
+                elif period.is_assembly:
+                    kinds['assembly'] += 1
+                else:
+                    kinds['regular'] += 1
+                    subjects.add(period.subject)
+                    if period.teacher:
+                        teacher_rows.setdefault(period.teacher, []).append(
+                            (day_index, period.start_minute, [day, start, end, class_name, period.subject])
+                        )
+        summary_rows.append([sheet.title, 'Class', kinds['regular'], kinds['break'], kinds['assembly'], len(subjects)])
+
+    for teacher in sorted(teacher_rows):
+        rows = sorted(teacher_rows[teacher], key=lambda entry: entry[:2])
+        sheet = workbook.create_sheet(_sheet_title(f"Teacher - {teacher}", used_titles))
+        sheet.append(TEACHER_HEADER)
+        for _, _, row in rows:
+            sheet.append(row)
+        summary_rows.append([sheet.title, 'Teacher', len(rows), 0, 0, len({row[4] for _, _, row in rows})])
+
+    for row in summary_rows:
+        summary_sheet.append(row)
+    workbook.save(target)
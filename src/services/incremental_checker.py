@@ -0,0 +1,186 @@
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+from src.models.period import Period
+from src.config import MIN_PERIODS_PER_DAY, MAX_PERIODS_PER_DAY, WORKING_DAYS, EXAM_SUBJECT
+
+PERIOD_COUNT = "period_count"
+TEACHER_CONFLICTS = "teacher_conflicts"
+SUBJECT_DISTRIBUTION = "subject_distribution"
+RULES = (PERIOD_COUNT, TEACHER_CONFLICTS, SUBJECT_DISTRIBUTION)
+
+@dataclass
+class SwapMove:
+    """Swap subject and teacher between two regular periods of one class."""
+    class_name: str
+    day_a: str
+    index_a: int
+    day_b: str
+    index_b: int
+
+@dataclass
+class ReassignTeacherMove:
+    """Give a regular period to another teacher."""
+    class_name: str
+    day: str
+    index: int
+    teacher: Optional[str]
+
+@dataclass
+class ChangeSubjectMove:
+    """Change the subject of a regular period."""
+    class_name: str
+    day: str
+    index: int
+    subject: str
+
+Move = Union[SwapMove, ReassignTeacherMove, ChangeSubjectMove]
+
+# Subject of a placeholder period for an open slot nobody teaches in
+FREE_SUBJECT = ""
+
+def is_free_period(period: Period) -> bool:
+    return not period.subject
+
+class IncrementalConstraintChecker:
+    """Maintain violation counts for a set of class timetables under single edits.
+
+    Counts match ConstraintChecker: days outside MIN/MAX_PERIODS_PER_DAY,
+    overlapping teacher pairs, and subjects outside the distribution bounds.
+    Teacher bookings are kept as minute intervals per (teacher, day), so
+    periods on differently aligned grids that overlap are counted too.
+    Applying or evaluating a move only touches the counters for the cells
+    and the (teacher, day) bookings it changes.
+
+    Periods with FREE_SUBJECT stand for empty slots: they are not counted, so
+    swapping with one moves a period into that slot. Exam periods count for
+    their day but not for the subject distribution, and cannot be moved.
+    """
+
+    def __init__(self, timetables: Dict[str, Dict[str, List[Period]]]):
+        self.timetables = timetables
+        self.day_counts: Counter = Counter()       # (class, day) -> regular periods
+        self.subject_counts: Counter = Counter()   # (class, subject) -> periods
+        self.total_periods: Counter = Counter()    # class -> regular periods
+        # (teacher, day) -> booked (start, end) minute intervals
+        self.bookings: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+        self.violations: Dict[str, int] = {rule: 0 for rule in RULES}
+
+        for class_name, timetable in timetables.items():
+            for day in WORKING_DAYS:
+                for period in timetable[day]:
+                    if period.is_break or period.is_assembly or is_free_period(period):
+                        continue
+                    self.day_counts[(class_name, day)] += 1
+                    if period.subject == EXAM_SUBJECT:
+                        continue
+                    self.subject_counts[(class_name, period.subject)] += 1
+                    self.total_periods[class_name] += 1
+                    if period.teacher:
+                        self._book(period.teacher, day, period)
+
+        for class_name in timetables:
+            for day in WORKING_DAYS:
+                self.violations[PERIOD_COUNT] += self._day_violation(class_name, day)
+        for class_name, subject in list(self.subject_counts):
+            self.violations[SUBJECT_DISTRIBUTION] += self._subject_violation(class_name, subject)
+
+    @property
+    def total_violations(self) -> int:
+        return sum(self.violations.values())
+
+    def apply(self, move: Move) -> Dict[str, int]:
+        """Apply a move to the timetables and return the change in violations per rule."""
+        before = dict(self.violations)
+        if isinstance(move, SwapMove):
+            period_a = self._regular_period(move.class_name, move.day_a, move.index_a)
+            period_b = self._regular_period(move.class_name, move.day_b, move.index_b)
+            content_a = (period_a.subject, period_a.teacher)
+            content_b = (period_b.subject, period_b.teacher)
+            self._retag(move.class_name, move.day_a, period_a, *content_b)
+            self._retag(move.class_name, move.day_b, period_b, *content_a)
+        elif isinstance(move, ReassignTeacherMove):
+            period = self._regular_period(move.class_name, move.day, move.index)
+            self._retag(move.class_name, move.day, period, period.subject, move.teacher)
+        elif isinstance(move, ChangeSubjectMove):
+            period = self._regular_period(move.class_name, move.day, move.index)
+            self._retag(move.class_name, move.day, period, move.subject, period.teacher)
+        else:
+            raise TypeError(f"Unsupported move: {move!r}")
+        return {rule: self.violations[rule] - before[rule] for rule in RULES}
+
+    def evaluate(self, move: Move) -> Dict[str, int]:
+        """Return the change in violations a move would cause, without keeping it."""
+        undo = self.inverse(move)
+        delta = self.apply(move)
+        self.apply(undo)
+        return delta
+
+    def inverse(self, move: Move) -> Move:
+        """Return the move that undoes ``move`` from the current state."""
+        if isinstance(move, SwapMove):
+            return move
+        period = self._regular_period(move.class_name, move.day, move.index)
+        if isinstance(move, ReassignTeacherMove):
+            return ReassignTeacherMove(move.class_name, move.day, move.index, period.teacher)
+        return ChangeSubjectMove(move.class_name, move.day, move.index, period.subject)
+
+    def _regular_period(self, class_name: str, day: str, index: int) -> Period:
+        period = self.timetables[class_name][day][index]
+        if period.is_break or period.is_assembly or period.subject == EXAM_SUBJECT:
+            raise ValueError(f"{class_name} {day} period {index} is not a regular period")
+        return period
+
+    def _retag(self, class_name: str, day: str, period: Period, subject: str, teacher: Optional[str]) -> None:
+        """Change a period's content, updating only the counters it touches."""
+        was_free, now_free = is_free_period(period), not subject
+        if was_free != now_free:
+            # The class total changes, which moves every subject's bounds
+            subjects = {(class_name, s) for c, s in self.subject_counts if c == class_name}
+            self.violations[PERIOD_COUNT] -= self._day_violation(class_name, day)
+        else:
+            subjects = set()
+        subjects |= {(class_name, s) for s in (period.subject, subject) if s}
+        self.violations[SUBJECT_DISTRIBUTION] -= sum(self._subject_violation(*key) for key in subjects)
+
+        if not was_free:
+            self.subject_counts[(class_name, period.subject)] -= 1
+        if not now_free:
+            self.subject_counts[(class_name, subject)] += 1
+        if was_free != now_free:
+            step = 1 if was_free else -1
+            self.day_counts[(class_name, day)] += step
+            self.total_periods[class_name] += step
+            self.violations[PERIOD_COUNT] += self._day_violation(class_name, day)
+        if period.teacher:
+            self._unbook(period.teacher, day, period)
+        if teacher:
+            self._book(teacher, day, period)
+        period.subject = subject
+        period.teacher = teacher
+
+        self.violations[SUBJECT_DISTRIBUTION] += sum(self._subject_violation(*key) for key in subjects)
+
+    def _day_violation(self, class_name: str, day: str) -> int:
+        count = self.day_counts[(class_name, day)]
+        return int(count < MIN_PERIODS_PER_DAY or count > MAX_PERIODS_PER_DAY)
+
+    def _book(self, teacher: str, day: str, period: Period) -> None:
+        """Add a booking and count the pairs it forms with overlapping ones."""
+        spans = self.bookings.setdefault((teacher, day), [])
+        start, end = period.start_minute, period.end_minute
+        self.violations[TEACHER_CONFLICTS] += sum(1 for s, e in spans if s < end and start < e)
+        spans.append((start, end))
+
+    def _unbook(self, teacher: str, day: str, period: Period) -> None:
+        spans = self.bookings[(teacher, day)]
+        start, end = period.start_minute, period.end_minute
+        spans.remove((start, end))
+        self.violations[TEACHER_CONFLICTS] -= sum(1 for s, e in spans if s < end and start < e)
+
+    def _subject_violation(self, class_name: str, subject: str) -> int:
+        count = self.subject_counts[(class_name, subject)]
+        if count <= 0:
+            return 0
+        return int(count > self.total_periods[class_name] * 0.3 or count < 2)
@@ -0,0 +1,58 @@
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, Optional
+import time
+
+# Counter names
+AVAILABILITY_CHECKS = "availability_checks"    # Teacher availability and occupancy tests
+CANDIDATES_SCANNED = "candidates_scanned"      # Teachers considered for a slot
+SLOTS_UNFILLED = "slots_unfilled"              # Open slots left empty, no teacher free
+CACHE_HITS = "cache_hits"
+
+# Event kinds passed to the callback
+PHASE = "phase"
+COUNTER = "counter"
+
+def phase(stats: Optional["SolverStats"], name: str):
+    """``stats.phase(name)``, or a no-op context when stats is None."""
+    return stats.phase(name) if stats is not None else nullcontext()
+
+@dataclass
+class SolverStats:
+    """Per-phase timings and hot-path counters collected during a run.
+
+    Pass one to TimetableGenerator, SchoolTimetableGenerator or the
+    constraint checkers as ``stats``; without it they record nothing.
+    ``callback(kind, name, value)`` is called when a phase ends (kind PHASE,
+    value in seconds) and for counters flushed with ``emit_counters``.
+    """
+    timings: Dict[str, float] = field(default_factory=dict)
+    counters: Dict[str, int] = field(default_factory=dict)
+    callback: Optional[Callable[[str, str, float], None]] = field(default=None, repr=False)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block; repeated phases with the same name accumulate."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add an externally measured duration to a phase."""
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+        if self.callback is not None:
+            self.callback(PHASE, name, seconds)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def emit_counters(self) -> None:
+        """Send every counter to the callback, e.g. at the end of a run."""
+        if self.callback is not None:
+            for name, value in self.counters.items():
+                self.callback(COUNTER, name, value)
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        return {"timings": dict(self.timings), "counters": dict(self.counters)}
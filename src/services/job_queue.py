@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+import threading
+import time
+import uuid
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted while the queue is at its limit."""
+
+@dataclass
+class Job:
+    id: str
+    status: str = PENDING
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = field(default=None, repr=False)
+    error: Optional[str] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def to_dict(self) -> dict:
+        """Status fields for a JSON response; the result is served separately."""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+class JobQueue:
+    """Run jobs on a bounded thread pool and keep their results for polling.
+
+    At most ``max_workers`` jobs run at once and at most ``max_pending`` wait
+    behind them; further submissions raise QueueFullError. Only the latest
+    ``max_finished`` finished jobs are kept.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8, max_finished: int = 100):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="timetable-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Job:
+        """Queue ``fn(*args, **kwargs)`` and return its Job immediately."""
+        with self._lock:
+            active = sum(1 for job in self._jobs.values() if not job.is_finished)
+            if active >= self.max_workers + self.max_pending:
+                raise QueueFullError(f"Job queue is full ({active} jobs running or waiting)")
+            job = Job(id=uuid.uuid4().hex)
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: Job, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        job.started_at = time.time()
+        job.status = RUNNING
+        try:
+            job.result = fn(*args, **kwargs)
+            job.status = DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+            self._prune()
+
+    def _prune(self) -> None:
+        with self._lock:
+            finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+            for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+                del self._jobs[job_id]
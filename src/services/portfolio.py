@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+import multiprocessing
+import os
+import queue
+import time as clock
+
+from src.models.class_info import ClassInfo
+from src.models.period import Period
+from src.models.teacher import Teacher
+from src.services.timetable_generator import TimetableGenerator
+
+@dataclass
+class PortfolioResult:
+    """The first feasible timetable of a portfolio run and how to reproduce it."""
+    seed: int
+    timetable: Dict[str, List[Period]]
+    attempts: int          # Seeds that finished, including the winner
+    elapsed_seconds: float
+
+def _solve_with_seed(
+    class_info: ClassInfo,
+    teachers: List[Teacher],
+    subject_distribution: Dict[str, int],
+    engine: str,
+    seed: int
+) -> Tuple[int, Optional[Dict[str, List[Period]]], Optional[str]]:
+    """Worker: run one seeded generator and return (seed, timetable, error)."""
+    generator = TimetableGenerator(
+        class_info=class_info,
+        teachers=teachers,
+        subject_distribution=subject_distribution,
+        engine=engine,
+        seed=seed
+    )
+    try:
+        return seed, generator.generate_timetable(), None
+    except ValueError as e:
+        return seed, None, str(e)
+
+def solve_portfolio(
+    class_info: ClassInfo,
+    teachers: List[Teacher],
+    subject_distribution: Dict[str, int],
+    seeds: Optional[Iterable[int]] = None,
+    max_workers: Optional[int] = None,
+    engine: str = "greedy"
+) -> PortfolioResult:
+    """Run seeded generator variants across CPU cores; the first feasible one wins.
+
+    As soon as one seed produces a timetable the worker pool is terminated,
+    so seeds still running stop using CPU and queued seeds never start.
+    Passing the returned seed to ``TimetableGenerator`` reproduces the
+    winning timetable.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    seeds = list(seeds) if seeds is not None else list(range(max_workers))
+    if not seeds:
+        raise ValueError("At least one seed is required")
+
+    started = clock.perf_counter()
+    errors: List[str] = []
+    # Filled by the pool's result thread: (seed, timetable, error) or a worker exception
+    results: "queue.SimpleQueue" = queue.SimpleQueue()
+    # Leaving the block calls Pool.terminate(), which stops workers mid-solve
+    with multiprocessing.Pool(processes=min(max_workers, len(seeds))) as pool:
+        for seed in seeds:
+            pool.apply_async(
+                _solve_with_seed,
+                (class_info, teachers, subject_distribution, engine, seed),
+                callback=results.put,
+                error_callback=results.put
+            )
+        for attempts in range(1, len(seeds) + 1):
+            result = results.get()
+            if isinstance(result, BaseException):
+                raise result
+            seed, timetable, error = result
+            if timetable is not None:
+                return PortfolioResult(
+                    seed=seed,
+                    timetable=timetable,
+                    attempts=attempts,
+                    elapsed_seconds=clock.perf_counter() - started
+                )
+            errors.append(f"seed {seed}: {error}")
+
+    raise ValueError("No seed produced a valid timetable (" + "; ".join(errors) + ")")
@@ -0,0 +1,238 @@
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+from src.models.period import Period
+from src.models.slot_grid import DayGrid
+from src.models.teacher import Teacher
+from src.services.teacher_occupancy import TeacherOccupancy
+from src.config import WORKING_DAYS, MAX_PERIODS_PER_DAY
+
+if TYPE_CHECKING:
+    from src.services.timetable_generator import TimetableGenerator
+
+@dataclass
+class RepairChange:
+    """One period slot that repair changed; ``before`` or ``after`` is None for an added or removed period."""
+    class_name: str
+    day: str
+    before: Optional[Period]
+    after: Optional[Period]
+
+@dataclass
+class RepairResult:
+    timetables: Dict[str, Dict[str, List[Period]]]
+    changes: List[RepairChange] = field(default_factory=list)
+    # (class name, day, period) that could not be kept anywhere and were dropped
+    unresolved: List[Tuple[str, str, Period]] = field(default_factory=list)
+
+def _base_class(class_name: str) -> str:
+    """"1st-A" -> "1st", the name teachers list in ``Teacher.classes``."""
+    return class_name.rsplit("-", 1)[0]
+
+class TimetableRepair:
+    """Minimal-perturbation repair after teacher availability changes.
+
+    Every period whose teacher is no longer available (or no longer on the
+    staff list) is repaired with the cheapest fix found, and every other
+    period is kept where it is:
+
+    1. substitute another qualified teacher in the same slot (one change);
+    2. swap with another period of the same class, same day first, so both
+       teachers are available at their new times (two changes);
+    3. move the period into an empty open slot of the class, which needs
+       day grids (two changes);
+    4. otherwise drop it and report it as unresolved.
+
+    Teachers are compiled again before repair, so ``availability`` may be
+    edited in place. The given timetables are not modified.
+    """
+
+    def __init__(
+        self,
+        timetables: Dict[str, Dict[str, List[Period]]],
+        teachers: List[Teacher],
+        grids: Optional[Dict[str, Dict[str, DayGrid]]] = None
+    ):
+        self.timetables = {
+            class_name: {day: list(timetable[day]) for day in WORKING_DAYS}
+            for class_name, timetable in timetables.items()
+        }
+        self.grids = grids or {}
+        self.teachers = {teacher.name: teacher for teacher in teachers}
+        for teacher in teachers:
+            teacher.compile_availability()
+        self.subject_teachers: Dict[str, List[Teacher]] = {}
+        for teacher in teachers:
+            for subject in dict.fromkeys(teacher.subjects):
+                self.subject_teachers.setdefault(subject, []).append(teacher)
+        self.occupancy = TeacherOccupancy.from_timetables(self.timetables)
+
+    @classmethod
+    def from_generators(cls, generators: Dict[str, "TimetableGenerator"]) -> "TimetableRepair":
+        """Build a repair over generated timetables, keyed by class name."""
+        teachers: Dict[str, Teacher] = {}
+        for generator in generators.values():
+            for teacher in generator.teachers:
+                teachers.setdefault(teacher.name, teacher)
+        return cls(
+            timetables={name: generator.timetable for name, generator in generators.items()},
+            teachers=list(teachers.values()),
+            grids={
+                name: {day: generator.day_grid(day) for day in WORKING_DAYS}
+                for name, generator in generators.items()
+            }
+        )
+
+    def broken_periods(self) -> List[Tuple[str, str, Period]]:
+        """Periods whose teacher cannot teach at their time any more."""
+        return [
+            (class_name, day, period)
+            for class_name, day, period in self._regular_periods()
+            if not self._available(period.teacher, day, period)
+        ]
+
+    def repair(self) -> RepairResult:
+        result = RepairResult(timetables=self.timetables)
+        broken = self.broken_periods()
+        # Free the broken bookings first so they never block another fix
+        for _, day, period in broken:
+            self.occupancy.release(period.teacher, day, period.start_minute, period.end_minute)
+
+        for class_name, day, period in broken:
+            changes = (
+                self._substitute(class_name, day, period) or
+                self._swap(class_name, day, period) or
+                self._move(class_name, day, period)
+            )
+            if changes is None:
+                self._set(class_name, day, period, None)
+                changes = [RepairChange(class_name, day, period, None)]
+                result.unresolved.append((class_name, day, period))
+            result.changes.extend(changes)
+        return result
+
+    def _substitute(self, class_name: str, day: str, period: Period) -> Optional[List[RepairChange]]:
+        teacher = self._find_teacher(class_name, period.subject, day, period)
+        if teacher is None:
+            return None
+        after = replace(period, teacher=teacher.name)
+        self._set(class_name, day, period, after)
+        self._book(after, day)
+        return [RepairChange(class_name, day, period, after)]
+
+    def _swap(self, class_name: str, day: str, period: Period) -> Optional[List[RepairChange]]:
+        for other_day, other in self._swap_candidates(class_name, day, period):
+            # The other period's teacher moves into the broken slot...
+            if not (self._available(other.teacher, day, period) and
+                    self.occupancy.is_free(other.teacher, day, period.start_minute, period.end_minute)):
+                continue
+            # ...and the broken period's subject into the other slot, with its
+            # original teacher when possible
+            self._release(other, other_day)
+            teacher = self._find_teacher(class_name, period.subject, other_day, other, prefer=period.teacher)
+            if teacher is None:
+                self._book(other, other_day)
+                continue
+            moved_in = replace(period, subject=other.subject, teacher=other.teacher)
+            moved_out = replace(other, subject=period.subject, teacher=teacher.name)
+            self._set(class_name, day, period, moved_in)
+            self._set(class_name, other_day, other, moved_out)
+            self._book(moved_in, day)
+            self._book(moved_out, other_day)
+            return [
+                RepairChange(class_name, day, period, moved_in),
+                RepairChange(class_name, other_day, other, moved_out),
+            ]
+        return None
+
+    def _move(self, class_name: str, day: str, period: Period) -> Optional[List[RepairChange]]:
+        grids = self.grids.get(class_name, {})
+        for other_day in self._days_from(day):
+            grid = grids.get(other_day)
+            periods = self.timetables[class_name][other_day]
+            taught = sum(1 for p in periods if not (p.is_break or p.is_assembly))
+            if grid is None or (other_day != day and taught >= MAX_PERIODS_PER_DAY):
+                continue
+            used = {p.start_minute for p in periods}
+            for slot in grid.open_slots:
+                if slot.start in used:
+                    continue
+                target = slot.to_period(period.subject)
+                teacher = self._find_teacher(class_name, period.subject, other_day, target, prefer=period.teacher)
+                if teacher is None:
+                    continue
+                added = replace(target, teacher=teacher.name)
+                self._set(class_name, day, period, None)
+                periods = self.timetables[class_name][other_day]
+                periods.append(added)
+                periods.sort(key=lambda p: p.start_minute)
+                self._book(added, other_day)
+                return [
+                    RepairChange(class_name, day, period, None),
+                    RepairChange(class_name, other_day, None, added),
+                ]
+        return None
+
+    def _swap_candidates(self, class_name: str, day: str, period: Period) -> Iterator[Tuple[str, Period]]:
+        """Other taught periods of the class, nearest first: same day by distance, then other days."""
+        for other_day in self._days_from(day):
+            others = [
+                p for p in self.timetables[class_name][other_day]
+                if p is not period and p.teacher and p.subject != period.subject
+                and not (p.is_break or p.is_assembly)
+                and self._available(p.teacher, other_day, p)
+            ]
+            others.sort(key=lambda p: abs(p.start_minute - period.start_minute))
+            for other in others:
+                yield other_day, other
+
+    def _find_teacher(
+        self,
+        class_name: str,
+        subject: str,
+        day: str,
+        slot: Period,
+        prefer: Optional[str] = None
+    ) -> Optional[Teacher]:
+        """Qualified, available, unbooked teacher for a slot; ``prefer`` first, then the least loaded."""
+        candidates = [
+            teacher for teacher in self.subject_teachers.get(subject, ())
+            if _base_class(class_name) in teacher.classes
+            and teacher.is_available_minutes(day, slot.start_minute, slot.end_minute)
+            and self.occupancy.is_free(teacher.name, day, slot.start_minute, slot.end_minute)
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda t: (
+            t.name != prefer, self.occupancy.booked_minutes(t.name, day), t.name
+        ))
+
+    def _available(self, teacher_name: Optional[str], day: str, slot: Period) -> bool:
+        teacher = self.teachers.get(teacher_name)
+        return teacher is not None and teacher.is_available_minutes(day, slot.start_minute, slot.end_minute)
+
+    def _regular_periods(self) -> Iterator[Tuple[str, str, Period]]:
+        for class_name, timetable in self.timetables.items():
+            for day in WORKING_DAYS:
+                for period in timetable[day]:
+                    if period.teacher and not (period.is_break or period.is_assembly):
+                        yield class_name, day, period
+
+    def _set(self, class_name: str, day: str, old: Period, new: Optional[Period]) -> None:
+        periods = self.timetables[class_name][day]
+        index = next(i for i, p in enumerate(periods) if p is old)
+        if new is None:
+            del periods[index]
+        else:
+            periods[index] = new
+
+    def _book(self, period: Period, day: str) -> None:
+        self.occupancy.book(period.teacher, day, period.start_minute, period.end_minute)
+
+    def _release(self, period: Period, day: str) -> None:
+        self.occupancy.release(period.teacher, day, period.start_minute, period.end_minute)
+
+    @staticmethod
+    def _days_from(day: str) -> List[str]:
+        """The given day first, then the rest of the week in order."""
+        return [day] + [d for d in WORKING_DAYS if d != day]
@@ -0,0 +1,117 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.models.class_info import ClassInfo
+from src.models.period import Period
+from src.models.teacher import Teacher
+from src.services.excel_exporter import export_school_workbook
+from src.services.instrumentation import SolverStats, phase
+from src.services.repair import RepairResult, TimetableRepair
+from src.services.teacher_occupancy import TeacherOccupancy
+from src.services.timetable_generator import TimetableGenerator
+from src.config import CLASSES, DIVISIONS, CLASS_TIMINGS, BREAK_TIMINGS
+
+
+class SchoolTimetableGenerator:
+    """Generate timetables for every class and division in one pass.
+
+    All per-class generators share a single ``TeacherOccupancy`` so a teacher
+    booked by one division is never offered to another at the same time.
+    """
+
+    def __init__(
+        self,
+        classes: List[ClassInfo],
+        teachers: List[Teacher],
+        subject_distributions: Dict[str, Dict[str, int]],
+        stats: Optional[SolverStats] = None
+    ):
+        self.classes = classes
+        self.teachers = teachers
+        self.subject_distributions = subject_distributions
+        self.occupancy = TeacherOccupancy()
+        self.stats = stats  # Shared by every class generator
+        self.generators: Dict[str, TimetableGenerator] = {}
+        self.timetables: Dict[str, Dict[str, List[Period]]] = {}
+
+        for class_info in classes:
+            self.generators[class_info.class_name] = TimetableGenerator(
+                class_info=class_info,
+                teachers=self._teachers_for(class_info),
+                subject_distribution=self._distribution_for(class_info),
+                occupancy=self.occupancy,
+                stats=stats
+            )
+
+    @classmethod
+    def from_config(
+        cls,
+        teachers: List[Teacher],
+        subject_distributions: Dict[str, Dict[str, int]],
+        divisions: Optional[List[str]] = None,
+        stats: Optional[SolverStats] = None
+    ) -> "SchoolTimetableGenerator":
+        """Build a generator for every configured class and division."""
+        classes = [
+            ClassInfo(
+                name=name,
+                division=division,
+                start_time=CLASS_TIMINGS[name]["start"],
+                end_time=CLASS_TIMINGS[name]["end"],
+                breaks=list(BREAK_TIMINGS[name])
+            )
+            for name in CLASSES
+            for division in (divisions or DIVISIONS)
+        ]
+        return cls(classes, teachers, subject_distributions, stats=stats)
+
+    def generate_timetable(self) -> Dict[str, Dict[str, List[Period]]]:
+        """Generate timetables for all classes, keyed by class name with division."""
+        for _ in self.iter_generate():
+            pass
+        return self.timetables
+
+    def iter_generate(self) -> Iterator[Tuple[str, Dict[str, List[Period]]]]:
+        """Yield (class name, timetable) as each class is finished.
+
+        Classes already yielded stay in ``timetables`` if a later one fails.
+        """
+        for class_name, generator in self.generators.items():
+            try:
+                self.timetables[class_name] = generator.generate_timetable()
+            except ValueError as e:
+                raise ValueError(f"{class_name}: {e}") from e
+            yield class_name, self.timetables[class_name]
+
+    def repair(self) -> RepairResult:
+        """Repair the generated timetables after teacher availability changes.
+
+        Only periods whose teacher is no longer available are changed; the
+        repaired timetables replace ``timetables`` and each generator's
+        timetable, and the shared occupancy is rebuilt from them.
+        """
+        with phase(self.stats, "repair"):
+            repairer = TimetableRepair.from_generators(self.generators)
+            result = repairer.repair()
+        self.timetables = result.timetables
+        self.occupancy = repairer.occupancy
+        for class_name, generator in self.generators.items():
+            generator.timetable = result.timetables[class_name]
+            generator.occupancy = self.occupancy
+        return result
+
+    def export_to_excel(self, filename: str) -> None:
+        """Export every class, every teacher and a summary into one workbook."""
+        with phase(self.stats, "export"):
+            export_school_workbook(self.timetables, filename)
+
+    def _teachers_for(self, class_info: ClassInfo) -> List[Teacher]:
+        """Return teachers assigned to the class, preserving input order."""
+        return [t for t in self.teachers if class_info.name in t.classes]
+
+    def _distribution_for(self, class_info: ClassInfo) -> Dict[str, int]:
+        """Look up the subject distribution by class-division first, then class."""
+        if class_info.class_name in self.subject_distributions:
+            return self.subject_distributions[class_info.class_name]
+        if class_info.name in self.subject_distributions:
+            return self.subject_distributions[class_info.name]
+        raise ValueError(f"No subject distribution for class {class_info.class_name}")
@@ -0,0 +1,54 @@
+from typing import Dict, List, Tuple
+
+from src.models.period import Period
+from src.utils.helpers import interval_mask
+
+
+class TeacherOccupancy:
+    """Shared teacher x day x minute occupancy index.
+
+    Each (teacher, day) pair maps to an integer bitmask where bit ``m`` is set
+    when the teacher is booked during minute ``m`` of that day. Checking or
+    booking a period is a couple of bit operations regardless of how many
+    classes have already been scheduled.
+    """
+
+    def __init__(self):
+        self._booked: Dict[Tuple[str, str], int] = {}
+
+    @classmethod
+    def from_timetables(cls, timetables: Dict[str, Dict[str, List[Period]]]) -> "TeacherOccupancy":
+        """Book every taught period of existing class timetables."""
+        occupancy = cls()
+        for timetable in timetables.values():
+            for day, periods in timetable.items():
+                for period in periods:
+                    if period.teacher and not (period.is_break or period.is_assembly):
+                        occupancy.book(period.teacher, day, period.start_minute, period.end_minute)
+        return occupancy
+
+    def copy(self) -> "TeacherOccupancy":
+        """Independent copy; bookings on either side do not affect the other."""
+        occupancy = TeacherOccupancy()
+        occupancy._booked = dict(self._booked)
+        return occupancy
+
+    def is_free(self, teacher: str, day: str, start_minute: int, end_minute: int) -> bool:
+        """Check if a teacher has no booking overlapping the interval."""
+        mask = interval_mask(start_minute, end_minute)
+        return not self._booked.get((teacher, day), 0) & mask
+
+    def book(self, teacher: str, day: str, start_minute: int, end_minute: int) -> None:
+        """Mark a teacher as busy for the interval."""
+        key = (teacher, day)
+        self._booked[key] = self._booked.get(key, 0) | interval_mask(start_minute, end_minute)
+
+    def release(self, teacher: str, day: str, start_minute: int, end_minute: int) -> None:
+        """Free a previously booked interval."""
+        key = (teacher, day)
+        if key in self._booked:
+            self._booked[key] &= ~interval_mask(start_minute, end_minute)
+
+    def booked_minutes(self, teacher: str, day: str) -> int:
+        """Return the number of minutes a teacher is booked on a day."""
+        return bin(self._booked.get((teacher, day), 0)).count("1")
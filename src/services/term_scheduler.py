@@ -0,0 +1,199 @@
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.models.period import Period
+from src.models.teacher import Teacher
+from src.services.instrumentation import SolverStats, phase
+from src.services.school_timetable_generator import SchoolTimetableGenerator
+from src.services.teacher_occupancy import TeacherOccupancy
+from src.config import WORKING_DAYS, SUBJECTS, EXAM_SUBJECT
+
+Timetables = Dict[str, Dict[str, List[Period]]]
+
+@dataclass(frozen=True)
+class WeekVariant:
+    """How one week of the term differs from the base week.
+
+    ``holidays`` have no periods at all. On ``exam_days`` every regular
+    period becomes an exam with no teacher. ``swaps`` replace one subject by
+    another, e.g. ``{"Physical Education": "Art"}`` for an Art week. When
+    ``classes`` is given (class names with or without division) only those
+    classes change. Lists and dicts are stored as tuples so equal variants
+    compare equal and are solved once.
+    """
+    holidays: Tuple[str, ...] = ()
+    exam_days: Tuple[str, ...] = ()
+    swaps: Tuple[Tuple[str, str], ...] = ()
+    classes: Optional[Tuple[str, ...]] = None
+
+    def __post_init__(self):
+        swaps = self.swaps.items() if isinstance(self.swaps, dict) else self.swaps
+        object.__setattr__(self, "holidays", tuple(self.holidays))
+        object.__setattr__(self, "exam_days", tuple(self.exam_days))
+        object.__setattr__(self, "swaps", tuple(sorted(tuple(s) for s in swaps)))
+        if self.classes is not None:
+            object.__setattr__(self, "classes", tuple(self.classes))
+        for day in self.holidays + self.exam_days:
+            if day not in WORKING_DAYS:
+                raise ValueError(f"Unknown day '{day}' in week variant")
+
+@dataclass
+class WeekDelta:
+    """The class days a variant week changes, and nothing else."""
+    days: Dict[Tuple[str, str], List[Period]] = field(default_factory=dict)  # (class name, day) -> periods
+    # (class name, day, base period) whose swap found no free qualified teacher; kept as in the base week
+    unresolved: List[Tuple[str, str, Period]] = field(default_factory=list)
+
+@dataclass
+class TermSchedule:
+    """A term as one base week plus a delta per week.
+
+    Weeks with the same variant share one ``WeekDelta``, and plain weeks
+    share an empty one, so a 40-week term holds the base week and only the
+    days that actually change.
+    """
+    base: Timetables
+    deltas: List[WeekDelta]
+
+    def __len__(self) -> int:
+        return len(self.deltas)
+
+    def week(self, index: int) -> Timetables:
+        """Timetables of one week (0-based). Unchanged days are the base lists; treat them as read-only."""
+        delta = self.deltas[index]
+        return {
+            class_name: {day: delta.days.get((class_name, day), periods) for day, periods in timetable.items()}
+            for class_name, timetable in self.base.items()
+        }
+
+    def iter_weeks(self) -> Iterator[Tuple[int, Timetables]]:
+        for index in range(len(self.deltas)):
+            yield index, self.week(index)
+
+    def changed_days(self, index: int) -> List[Tuple[str, str]]:
+        """(class name, day) pairs that differ from the base week."""
+        return list(self.deltas[index].days)
+
+class TermScheduler:
+    """Schedule a term by solving the base week once and deriving every other week.
+
+    For each distinct variant only the class days it touches are re-solved,
+    against a copy of the base week's teacher occupancy: holidays and exam
+    days release their bookings, and each swapped period gets a teacher who
+    is qualified, available and free that week, preferring the teacher who
+    had the slot.
+    """
+
+    def __init__(self, school: SchoolTimetableGenerator, stats: Optional[SolverStats] = None):
+        self.school = school
+        self.stats = stats if stats is not None else school.stats
+
+    def schedule(self, variants: Sequence[Optional[WeekVariant]]) -> TermSchedule:
+        """One week per entry of ``variants``; None is a plain base week."""
+        with phase(self.stats, "term.base"):
+            for generator in self.school.generators.values():
+                for teacher in generator.teachers:
+                    teacher.compile_availability()
+            base = self.school.timetables or self.school.generate_timetable()
+            occupancy = TeacherOccupancy.from_timetables(base)
+
+        plain = WeekDelta()
+        solved: Dict[WeekVariant, WeekDelta] = {}
+        deltas = []
+        for variant in variants:
+            if variant is None:
+                deltas.append(plain)
+                continue
+            if variant not in solved:
+                with phase(self.stats, "term.variant"):
+                    solved[variant] = self._solve_variant(base, occupancy, variant)
+            deltas.append(solved[variant])
+        return TermSchedule(base=base, deltas=deltas)
+
+    def _solve_variant(self, base: Timetables, occupancy: TeacherOccupancy, variant: WeekVariant) -> WeekDelta:
+        delta = WeekDelta()
+        swaps = dict(variant.swaps)
+        affected = [
+            (class_name, day)
+            for class_name in base
+            if self._applies(variant, class_name)
+            for day in WORKING_DAYS
+            if day in variant.holidays or day in variant.exam_days or
+            any(p.subject in swaps and not (p.is_break or p.is_assembly) for p in base[class_name][day])
+        ]
+        if not affected:
+            return delta
+
+        # Closed days free their teachers before any swap looks for one
+        occupancy = occupancy.copy()
+        for class_name, day in affected:
+            if day in variant.holidays or day in variant.exam_days:
+                for period in base[class_name][day]:
+                    if period.teacher and not (period.is_break or period.is_assembly):
+                        occupancy.release(period.teacher, day, period.start_minute, period.end_minute)
+
+        for class_name, day in affected:
+            if day in variant.holidays:
+                delta.days[(class_name, day)] = []
+            elif day in variant.exam_days:
+                delta.days[(class_name, day)] = [
+                    p if p.is_break or p.is_assembly else replace(p, subject=EXAM_SUBJECT, teacher=None)
+                    for p in base[class_name][day]
+                ]
+            else:
+                delta.days[(class_name, day)] = self._swap_day(class_name, day, base, occupancy, swaps, delta)
+        return delta
+
+    def _swap_day(
+        self,
+        class_name: str,
+        day: str,
+        base: Timetables,
+        occupancy: TeacherOccupancy,
+        swaps: Dict[str, str],
+        delta: WeekDelta
+    ) -> List[Period]:
+        generator = self.school.generators[class_name]
+        periods = []
+        for period in base[class_name][day]:
+            subject = swaps.get(period.subject)
+            if subject is None or period.is_break or period.is_assembly:
+                periods.append(period)
+                continue
+            if subject not in SUBJECTS[generator.class_info.name]:
+                raise ValueError(f"Invalid subject '{subject}' for class {generator.class_info.name}")
+            # Released just before the search, so an unresolved period can keep its teacher
+            if period.teacher:
+                occupancy.release(period.teacher, day, period.start_minute, period.end_minute)
+            teacher = self._find_teacher(generator.subject_teachers.get(subject, ()), occupancy, day, period)
+            if teacher is None:
+                delta.unresolved.append((class_name, day, period))
+                swapped = period
+            else:
+                swapped = replace(period, subject=subject, teacher=teacher.name)
+            periods.append(swapped)
+            if swapped.teacher:
+                occupancy.book(swapped.teacher, day, swapped.start_minute, swapped.end_minute)
+        return periods
+
+    @staticmethod
+    def _find_teacher(
+        teachers: Sequence[Teacher],
+        occupancy: TeacherOccupancy,
+        day: str,
+        period: Period
+    ) -> Optional[Teacher]:
+        """The slot's own teacher when qualified and free, else the least loaded one."""
+        candidates = [
+            t for t in teachers
+            if t.is_available_minutes(day, period.start_minute, period.end_minute)
+            and occupancy.is_free(t.name, day, period.start_minute, period.end_minute)
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda t: (t.name != period.teacher, occupancy.booked_minutes(t.name, day), t.name))
+
+    def _applies(self, variant: WeekVariant, class_name: str) -> bool:
+        if variant.classes is None:
+            return True
+        return class_name in variant.classes or self.school.generators[class_name].class_info.name in variant.classes
@@ -0,0 +1,250 @@
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from datetime import time, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import hashlib
+import io
+import json
+import os
+import pickle
+import threading
+
+from src import config
+from src.models.class_info import ClassInfo
+from src.models.period import Period
+from src.models.teacher import Teacher
+from src.services.excel_exporter import export_school_workbook
+from src.services.instrumentation import SolverStats, phase, CACHE_HITS
+
+# Config constants that change what the generator produces
+CONFIG_KEYS = (
+    "PERIOD_DURATION", "ASSEMBLY_DAY", "ASSEMBLY_TIME", "WORKING_DAYS",
+    "MIN_PERIODS_PER_DAY", "MAX_PERIODS_PER_DAY", "CLASS_TIMINGS",
+    "BREAK_TIMINGS", "SUBJECTS",
+)
+
+def _canonical(value: Any) -> Any:
+    """Convert generator inputs into plain JSON-serialisable values."""
+    if isinstance(value, time):
+        return value.strftime("%H:%M:%S")
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if is_dataclass(value):
+        return {f.name: _canonical(getattr(value, f.name)) for f in fields(value) if f.init}
+    if isinstance(value, dict):
+        return [[str(k), _canonical(v)] for k, v in sorted(value.items(), key=lambda item: str(item[0]))]
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+def cache_key(
+    class_info: ClassInfo,
+    teachers: List[Teacher],
+    subject_distribution: Dict[str, int],
+    **generator_options: Any
+) -> str:
+    """Hash every generator input, including the config constants in effect.
+
+    Teacher order is kept because it changes which teacher the generator picks,
+    and subject order because seeded and CSP runs order subjects by it.
+    """
+    payload = {
+        "class_info": _canonical(class_info),
+        "teachers": _canonical(teachers),
+        "subject_distribution": [[str(s), _canonical(n)] for s, n in subject_distribution.items()],
+        "options": _canonical(generator_options),
+        "config": {name: _canonical(getattr(config, name)) for name in CONFIG_KEYS},
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+class TimetableCache:
+    """Two-tier cache of generated timetables and their exported artifacts.
+
+    An in-memory LRU holds the most recent entries; an optional directory
+    keeps pickled entries on disk, evicting the least recently used files once
+    the directory grows past ``max_disk_bytes``. Cached timetables are shared
+    objects and must not be mutated by callers.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_memory_entries: int = 128,
+        max_disk_bytes: int = 100 * 1024 * 1024
+    ):
+        self.directory = directory
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Dict[str, List[Period]]]:
+        """Return the cached timetable for a key, or None."""
+        return self._get((key, "timetable"))
+
+    def put(self, key: str, timetable: Dict[str, List[Period]]) -> None:
+        self._put((key, "timetable"), timetable)
+
+    def get_artifact(self, key: str, kind: str) -> Optional[bytes]:
+        """Return a cached export (e.g. kind="xlsx") for a key, or None."""
+        return self._get((key, kind))
+
+    def put_artifact(self, key: str, kind: str, data: bytes) -> None:
+        self._put((key, kind), data)
+
+    def _get(self, entry: Tuple[str, str]) -> Any:
+        with self._lock:
+            if entry in self._memory:
+                self._memory.move_to_end(entry)
+                self.hits += 1
+                return self._memory[entry]
+            value = self._read_disk(entry)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(entry, value)
+            return value
+
+    def _put(self, entry: Tuple[str, str], value: Any) -> None:
+        with self._lock:
+            self._remember(entry, value)
+            self._write_disk(entry, value)
+
+    def _remember(self, entry: Tuple[str, str], value: Any) -> None:
+        self._memory[entry] = value
+        self._memory.move_to_end(entry)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, entry: Tuple[str, str]) -> str:
+        key, kind = entry
+        return os.path.join(self.directory, f"{key}.{kind}")
+
+    def _read_disk(self, entry: Tuple[str, str]) -> Any:
+        if not self.directory:
+            return None
+        path = self._path(entry)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # Mark as recently used for disk eviction
+        return data if entry[1] != "timetable" else pickle.loads(data)
+
+    def _write_disk(self, entry: Tuple[str, str], value: Any) -> None:
+        if not self.directory:
+            return
+        data = value if entry[1] != "timetable" else pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        path = self._path(entry)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        files = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+def cached_generate(
+    cache: TimetableCache,
+    class_info: ClassInfo,
+    teachers: List[Teacher],
+    subject_distribution: Dict[str, int],
+    stats: Optional[SolverStats] = None,
+    **generator_options: Any
+) -> Tuple[str, Dict[str, List[Period]]]:
+    """Return (cache key, timetable), generating and caching on a miss.
+
+    ``stats`` is not part of the key; on a hit it only records CACHE_HITS.
+    """
+    from src.services.timetable_generator import TimetableGenerator
+
+    key = cache_key(class_info, teachers, subject_distribution, **generator_options)
+    timetable = cache.get(key)
+    if timetable is None:
+        generator = TimetableGenerator(
+            class_info=class_info,
+            teachers=teachers,
+            subject_distribution=subject_distribution,
+            stats=stats,
+            **generator_options
+        )
+        timetable = generator.generate_timetable()
+        cache.put(key, timetable)
+    elif stats is not None:
+        stats.count(CACHE_HITS)
+    return key, timetable
+
+def school_cache_key(school) -> str:
+    """Key for a SchoolTimetableGenerator: its per-class keys in generation order.
+
+    Order matters because the classes share one teacher occupancy.
+    """
+    digest = hashlib.sha256()
+    for generator in school.generators.values():
+        key = cache_key(
+            generator.class_info,
+            generator.teachers,
+            generator.subject_distribution,
+            engine=generator.engine,
+            seed=generator.seed
+        )
+        digest.update(key.encode("ascii"))
+    return digest.hexdigest()
+
+def cached_generate_school(
+    cache: TimetableCache,
+    school,
+    progress: Optional[Callable[[str, int, int], None]] = None
+) -> Tuple[str, Dict[str, Dict[str, List[Period]]]]:
+    """Return (cache key, timetables by class), generating the school on a miss.
+
+    ``progress(class_name, done, total)`` is called as each class finishes.
+    """
+    key = school_cache_key(school)
+    timetables = cache.get(key)
+    if timetables is None:
+        total = len(school.generators)
+        for done, (class_name, _) in enumerate(school.iter_generate(), start=1):
+            if progress is not None:
+                progress(class_name, done, total)
+        timetables = school.timetables
+        cache.put(key, timetables)
+    elif school.stats is not None:
+        school.stats.count(CACHE_HITS)
+    return key, timetables
+
+def cached_workbook(
+    cache: TimetableCache,
+    key: str,
+    timetables: Dict[str, Dict[str, List[Period]]],
+    stats: Optional[SolverStats] = None
+) -> bytes:
+    """Return the xlsx export for a cache key, building it in memory once."""
+    data = cache.get_artifact(key, "xlsx")
+    if data is None:
+        buffer = io.BytesIO()
+        with phase(stats, "export"):
+            export_school_workbook(timetables, buffer)
+        data = buffer.getvalue()
+        cache.put_artifact(key, "xlsx", data)
+    return data
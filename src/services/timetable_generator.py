@@ -1,10 +1,20 @@
-from typing import Dict, List, Optional
-from datetime import time, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+from datetime import timedelta
+import heapq
+import random
+import time as clock
 import pandas as pd
 
 from src.models.class_info import ClassInfo
 from src.models.period import Period
+from src.models.slot_grid import DayGrid
 from src.models.teacher import Teacher
+from src.services.day_template import class_breaks, compile_day_template
+from src.services.instrumentation import (
+    SolverStats, phase, AVAILABILITY_CHECKS, CANDIDATES_SCANNED, SLOTS_UNFILLED
+)
+from src.services.teacher_occupancy import TeacherOccupancy
+from src.utils.helpers import time_to_minutes
 from src.config import (
     PERIOD_DURATION,
     ASSEMBLY_DAY,
@@ -13,143 +23,293 @@ from src.config import (
     MIN_PERIODS_PER_DAY,
     MAX_PERIODS_PER_DAY,
     CLASS_TIMINGS,
-    BREAK_TIMINGS,
     SUBJECTS
 )
 
+T = TypeVar("T")
+
+# "greedy" fills slots in order and never revisits a choice;
+# "csp" runs the backtracking search in csp_solver
+ENGINES = ("greedy", "csp")
+
+class SubjectQueue:
+    """Priority queue of subjects ordered by remaining periods (desc), then rank, then name.
+
+    Wraps the generator's ``remaining_periods`` dict. Stale heap entries are
+    skipped lazily, so assigning a period is a single push instead of a
+    re-sort of every subject. ``ranks`` breaks ties between subjects with the
+    same remaining count; without it ties go by name.
+    """
+
+    def __init__(self, remaining: Dict[str, int], ranks: Optional[Dict[str, int]] = None):
+        self.remaining = remaining
+        self.ranks = ranks or {}
+        self._heap: List[Tuple[int, int, str]] = [
+            self._entry(subject) for subject, count in remaining.items() if count > 0
+        ]
+        heapq.heapify(self._heap)
+
+    def _entry(self, subject: str) -> Tuple[int, int, str]:
+        return (-self.remaining[subject], self.ranks.get(subject, 0), subject)
+
+    def _is_current(self, entry: Tuple[int, int, str]) -> bool:
+        count = self.remaining.get(entry[2], 0)
+        return count > 0 and -entry[0] == count
+
+    def select(self, choose: Callable[[str], Optional[T]]) -> Optional[Tuple[str, T]]:
+        """Return the first subject (in priority order) that ``choose`` accepts.
+
+        ``choose`` returns a non-None value to accept a subject. The accepted
+        subject's remaining count is decremented in place.
+        """
+        tried: List[Tuple[int, int, str]] = []
+        result = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if not self._is_current(entry):
+                continue
+            subject = entry[2]
+            choice = choose(subject)
+            if choice is not None:
+                self.decrement(subject)
+                result = (subject, choice)
+                break
+            tried.append(entry)
+        for entry in tried:
+            heapq.heappush(self._heap, entry)
+        return result
+
+    def decrement(self, subject: str) -> None:
+        """Record that one period of a subject has been assigned."""
+        self.remaining[subject] -= 1
+        if self.remaining[subject] > 0:
+            heapq.heappush(self._heap, self._entry(subject))
+
 class TimetableGenerator:
     def __init__(
         self,
         class_info: ClassInfo,
         teachers: List[Teacher],
-        subject_distribution: Dict[str, int]
+        subject_distribution: Dict[str, int],
+        occupancy: Optional[TeacherOccupancy] = None,
+        engine: str = "greedy",
+        seed: Optional[int] = None,
+        stats: Optional[SolverStats] = None
     ):
+        setup_start = clock.perf_counter()
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {', '.join(ENGINES)}")
         self.class_info = class_info
         self.teachers = teachers
         self.subject_distribution = subject_distribution
+        # Shared with other generators when scheduling a whole school
+        self.occupancy = occupancy if occupancy is not None else TeacherOccupancy()
+        self.engine = engine
+        self.search_stats = None  # Set by the CSP engine
+        # Optional instrumentation; every hook is skipped when this is None
+        self.stats = stats
         self.timetable: Dict[str, List[Period]] = {day: [] for day in WORKING_DAYS}
         self.remaining_periods = dict(subject_distribution)
         
+        # A seed randomizes subject tie-breaks and teacher order reproducibly;
+        # without one the generator is fully deterministic
+        self.seed = seed
+        ranks = None
+        if seed is not None:
+            rng = random.Random(seed)
+            order = list(subject_distribution)
+            rng.shuffle(order)
+            ranks = {subject: rank for rank, subject in enumerate(order)}
+        self.subject_queue = SubjectQueue(self.remaining_periods, ranks)
+        
+        # Inverted index: subject -> teachers who can teach it, in input order;
+        # availability is compiled again in case it was edited in place
+        self.subject_teachers: Dict[str, List[Teacher]] = {}
+        for teacher in teachers:
+            teacher.compile_availability()
+            for subject in dict.fromkeys(teacher.subjects):
+                self.subject_teachers.setdefault(subject, []).append(teacher)
+        if seed is not None:
+            for subject_teachers in self.subject_teachers.values():
+                rng.shuffle(subject_teachers)
+        
+        # Integer time model: everything below works in minutes since midnight
+        self.period_minutes = int(PERIOD_DURATION.total_seconds()) // 60
+        self.start_minute = time_to_minutes(class_info.start_time)
+        self.end_minute = time_to_minutes(class_info.end_time)
+        self.assembly_minute = time_to_minutes(ASSEMBLY_TIME)
+        self.breaks = class_breaks(class_info)
+        self._grids: Dict[str, DayGrid] = {}
+        
         # Validate subjects
         valid_subjects = SUBJECTS[class_info.name]
         for subject in subject_distribution.keys():
             if subject not in valid_subjects:
                 raise ValueError(f"Invalid subject '{subject}' for class {class_info.name}")
+        
+        if stats is not None:
+            stats.record("setup", clock.perf_counter() - setup_start)
     
     def generate_timetable(self) -> Dict[str, List[Period]]:
         """Generate a weekly timetable for the class."""
-        for day in WORKING_DAYS:
-            day_schedule = self._generate_day_schedule(day)
+        for _ in self.iter_generate():
+            pass
+        return self.timetable
+    
+    def iter_generate(self) -> Iterator[Tuple[str, List[Period]]]:
+        """Generate the week, yielding (day, periods) as soon as each day is done.
+        
+        Before each day the remaining demand is checked against the open slots
+        still ahead, so an infeasible week raises ValueError at that point
+        instead of after the last day. The CSP engine solves the week as a
+        whole and yields its days once it has finished.
+        """
+        if self.engine == "csp":
+            with phase(self.stats, "generate.csp"):
+                self._generate_with_csp()
+            for day in WORKING_DAYS:
+                yield day, self.timetable[day]
+            return
+        
+        for index, day in enumerate(WORKING_DAYS):
+            self._check_remaining_capacity(WORKING_DAYS[index:])
+            with phase(self.stats, f"generate.{day}"):
+                day_schedule = self._generate_day_schedule(day)
             if not day_schedule:
                 raise ValueError(f"Could not generate valid schedule for {day}")
             self.timetable[day] = day_schedule
+            yield day, day_schedule
             
         # Verify all subjects are distributed
         if any(count > 0 for count in self.remaining_periods.values()):
             raise ValueError("Could not distribute all required periods")
-            
+    
+    def _check_remaining_capacity(self, days: List[str]) -> None:
+        """Raise if the periods still needed cannot fit into the open slots of ``days``.
+        
+        Checks the total against all open slots, then each subject against the
+        slots where one of its teachers is available and not yet booked.
+        """
+        demand = sum(count for count in self.remaining_periods.values() if count > 0)
+        if demand == 0:
+            return
+        slots = [(day, slot) for day in days for slot in self.day_grid(day).open_slots]
+        if demand > len(slots):
+            raise ValueError(
+                f"Could not distribute all required periods: {demand} periods left "
+                f"for {len(slots)} open slots"
+            )
+        for subject, count in self.remaining_periods.items():
+            if count <= 0:
+                continue
+            teachers = self.subject_teachers.get(subject, ())
+            usable = sum(
+                1 for day, slot in slots
+                if any(
+                    t.is_available_minutes(day, slot.start, slot.end) and
+                    self.occupancy.is_free(t.name, day, slot.start, slot.end)
+                    for t in teachers
+                )
+            )
+            if count > usable:
+                raise ValueError(
+                    f"Could not distribute all required periods: {subject} needs {count} more "
+                    f"periods but has teachers for only {usable} slots"
+                )
+    
+    def _generate_with_csp(self) -> Dict[str, List[Period]]:
+        """Generate the week with the backtracking CSP engine."""
+        from src.services.csp_solver import CSPSolver
+        
+        solver = CSPSolver(self)
+        self.search_stats = solver.stats
+        try:
+            assigned = solver.solve()
+        finally:
+            if self.stats is not None:
+                for name in ("nodes", "backtracks", "backjumps", "prunings", "wipeouts"):
+                    self.stats.count(f"csp.{name}", getattr(solver.stats, name))
+        
+        for day in WORKING_DAYS:
+            day_schedule = []
+            for slot in self.day_grid(day).slots:
+                if not slot.is_open:
+                    day_schedule.append(slot.to_period())
+                elif slot.index in assigned[day]:
+                    subject, teacher = assigned[day][slot.index]
+                    day_schedule.append(slot.to_period(subject, teacher))
+            if not day_schedule:
+                raise ValueError(f"Could not generate valid schedule for {day}")
+            self.timetable[day] = day_schedule
+        for subject in self.remaining_periods:
+            self.remaining_periods[subject] = 0
+        
         return self.timetable
     
+    def day_grid(self, day: str) -> DayGrid:
+        """Lay out a day as an integer slot grid of regular, break and assembly slots."""
+        if day not in self._grids:
+            # The slot layout itself comes from the template cache shared by all divisions
+            self._grids[day] = DayGrid(day=day, slots=compile_day_template(
+                self.start_minute,
+                self.end_minute,
+                self.breaks,
+                self.period_minutes,
+                self.assembly_minute if day == ASSEMBLY_DAY else None
+            ))
+        return self._grids[day]
+    
     def _generate_day_schedule(self, day: str) -> List[Period]:
         """Generate schedule for a single day."""
         periods: List[Period] = []
-        current_time = self.class_info.start_time
-        
-        while current_time < self.class_info.end_time:
-            # Check for assembly
-            if day == ASSEMBLY_DAY and self._time_equals(current_time, ASSEMBLY_TIME):
-                period = Period(
-                    start_time=current_time,
-                    end_time=self._add_minutes(current_time, PERIOD_DURATION.seconds // 60),
-                    subject="Assembly",
-                    is_assembly=True
-                )
-                periods.append(period)
-                current_time = period.end_time
-                continue
-            
-            # Check for breaks
-            is_break = False
-            for break_start, break_end in BREAK_TIMINGS[self.class_info.name]:
-                if self._time_equals(current_time, break_start):
-                    period = Period(
-                        start_time=break_start,
-                        end_time=break_end,
-                        subject="Break",
-                        is_break=True
-                    )
-                    periods.append(period)
-                    current_time = break_end
-                    is_break = True
-                    break
-            
-            if is_break:
+        
+        for slot in self.day_grid(day).slots:
+            if not slot.is_open:
+                periods.append(slot.to_period())
                 continue
             
-            # Regular period
-            period = self._create_regular_period(current_time, day)
-            if period:
-                periods.append(period)
-                current_time = period.end_time
-            else:
-                # If we couldn't create a period, move to next slot
-                current_time = self._add_minutes(current_time, PERIOD_DURATION.seconds // 60)
+            # Regular period; if no teacher is free the slot stays empty
+            choice = self._fill_slot(day, slot.start, slot.end)
+            if choice is not None:
+                periods.append(slot.to_period(choice[0], choice[1].name))
+            elif self.stats is not None:
+                self.stats.count(SLOTS_UNFILLED)
+                self.stats.count(f"{SLOTS_UNFILLED}.{day}")
         
         return periods
     
-    def _create_regular_period(
-        self,
-        start_time: time,
-        day: str
-    ) -> Optional[Period]:
-        """Create a regular teaching period."""
-        end_time = self._add_minutes(start_time, PERIOD_DURATION.seconds // 60)
-        
-        # Try subjects that still need to be allocated
-        subjects_to_try = sorted(
-            [
-                (subject, remaining)
-                for subject, remaining in self.remaining_periods.items()
-                if remaining > 0
-            ],
-            key=lambda x: (-x[1], x[0])  # Sort by remaining count (desc) then subject name
-        )
-        
-        # If no subjects need allocation, return None
-        if not subjects_to_try:
+    def _fill_slot(self, day: str, start_minute: int, end_minute: int) -> Optional[Tuple[str, Teacher]]:
+        """Pick a subject and teacher for an open slot and book the teacher."""
+        stats = self.stats
+        scanned = checks = 0
+        
+        def find_teacher(subject: str) -> Optional[Teacher]:
+            nonlocal scanned, checks
+            for teacher in self.subject_teachers.get(subject, ()):
+                available = teacher.is_available_minutes(day, start_minute, end_minute)
+                free = available and self.occupancy.is_free(teacher.name, day, start_minute, end_minute)
+                if stats is not None:
+                    scanned += 1
+                    checks += 2 if available else 1
+                if free:
+                    return teacher
             return None
         
-        # Try each subject
-        for subject, _ in subjects_to_try:
-            # Find available teacher
-            for teacher in self.teachers:
-                if (teacher.can_teach_subject(subject) and
-                    teacher.is_available(day, start_time, end_time)):
-                    # Create period and update remaining count
-                    self.remaining_periods[subject] -= 1
-                    return Period(
-                        start_time=start_time,
-                        end_time=end_time,
-                        subject=subject,
-                        teacher=teacher.name
-                    )
-        
-        # No teacher available for any remaining subject
-        return None
-    
-    @staticmethod
-    def _add_minutes(t: time, minutes: int) -> time:
-        """Add minutes to a time object."""
-        minutes_since_midnight = t.hour * 60 + t.minute + minutes
-        return time(minutes_since_midnight // 60, minutes_since_midnight % 60)
-    
-    @staticmethod
-    def _time_equals(t1: time, t2: time) -> bool:
-        """Compare two time objects."""
-        return t1.hour == t2.hour and t1.minute == t2.minute
+        # Take the highest-priority subject that has an available teacher
+        choice = self.subject_queue.select(find_teacher)
+        if stats is not None:
+            stats.count(CANDIDATES_SCANNED, scanned)
+            stats.count(AVAILABILITY_CHECKS, checks)
+        if choice is not None:
+            self.occupancy.book(choice[1].name, day, start_minute, end_minute)
+        return choice
     
     def export_to_excel(self, filename: str) -> None:
         """Export the timetable to an Excel file."""
+        with phase(self.stats, "export"):
+            self._export_to_excel(filename)
+    
+    def _export_to_excel(self, filename: str) -> None:
         data = []
         for day in WORKING_DAYS:
             for period in self.timetable[day]:
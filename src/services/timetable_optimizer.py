@@ -0,0 +1,262 @@
+from collections import Counter
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import math
+import random
+import time as clock
+
+from src.models.period import Period
+from src.models.slot_grid import DayGrid
+from src.models.teacher import Teacher
+from src.services.incremental_checker import (
+    IncrementalConstraintChecker,
+    SwapMove,
+    FREE_SUBJECT,
+    is_free_period,
+    PERIOD_COUNT,
+    TEACHER_CONFLICTS
+)
+from src.config import WORKING_DAYS
+
+if TYPE_CHECKING:
+    from src.services.timetable_generator import TimetableGenerator
+
+@dataclass
+class SoftConstraintWeights:
+    spread: float = 1.0        # Per pair of same-subject periods on one day
+    consecutive: float = 2.0   # Per back-to-back repeat of a subject
+    teacher_load: float = 0.5  # Per unit of squared daily load, favours even weeks
+    period_count: float = 5.0  # Per day outside MIN/MAX_PERIODS_PER_DAY
+
+class TimetableOptimizer:
+    """Simulated annealing over period swaps to improve soft constraints.
+
+    Works on copies of the given timetables. When day grids are supplied, open
+    slots left empty by the generator become free placeholders, so a swap can
+    also move a period to another day. A swap is only considered if both
+    teachers are available at their new times and it adds no teacher
+    conflicts; the soft score is then recomputed for the two affected days and
+    teachers only. ``optimize`` runs until the wall-clock budget is spent and
+    returns the best timetables seen.
+    """
+
+    def __init__(
+        self,
+        timetables: Dict[str, Dict[str, List[Period]]],
+        teachers: List[Teacher],
+        weights: Optional[SoftConstraintWeights] = None,
+        seed: Optional[int] = None,
+        grids: Optional[Dict[str, Dict[str, DayGrid]]] = None
+    ):
+        self.timetables = {
+            class_name: {
+                day: self._with_free_slots(timetable[day], (grids or {}).get(class_name, {}).get(day))
+                for day in WORKING_DAYS
+            }
+            for class_name, timetable in timetables.items()
+        }
+        self.teachers = {teacher.name: teacher for teacher in teachers}
+        for teacher in teachers:
+            teacher.compile_availability()
+        self.weights = weights or SoftConstraintWeights()
+        self.rng = random.Random(seed)
+        self.checker = IncrementalConstraintChecker(self.timetables)
+
+        # (day, index) of every regular period, per class
+        self.cells: Dict[str, List[Tuple[str, int]]] = {
+            class_name: [
+                (day, index)
+                for day in WORKING_DAYS
+                for index, period in enumerate(timetable[day])
+                if not (period.is_break or period.is_assembly)
+            ]
+            for class_name, timetable in self.timetables.items()
+        }
+        self.teacher_load: Counter = Counter()
+        self._count_teacher_load()
+
+        self.score = self.total_score()
+        self.best_score = self.score
+        self.iterations = 0
+        self.accepted = 0
+
+    @classmethod
+    def from_generators(
+        cls,
+        generators: Dict[str, "TimetableGenerator"],
+        **kwargs
+    ) -> "TimetableOptimizer":
+        """Build an optimizer over generated timetables, keyed by class name."""
+        teachers: Dict[str, Teacher] = {}
+        for generator in generators.values():
+            for teacher in generator.teachers:
+                teachers.setdefault(teacher.name, teacher)
+        return cls(
+            timetables={name: generator.timetable for name, generator in generators.items()},
+            teachers=list(teachers.values()),
+            grids={
+                name: {day: generator.day_grid(day) for day in WORKING_DAYS}
+                for name, generator in generators.items()
+            },
+            **kwargs
+        )
+
+    @staticmethod
+    def _with_free_slots(periods: List[Period], grid: Optional[DayGrid]) -> List[Period]:
+        """Copy a day's periods, adding free placeholders for unused open slots."""
+        day = [replace(p) for p in periods]
+        if grid is not None:
+            used = {p.start_minute for p in periods}
+            day.extend(
+                slot.to_period(FREE_SUBJECT)
+                for slot in grid.open_slots if slot.start not in used
+            )
+            day.sort(key=lambda p: p.start_minute)
+        return day
+
+    def total_score(self) -> float:
+        """Weighted soft-constraint penalty of the current timetables (lower is better)."""
+        score = sum(
+            self._day_score(class_name, day)
+            for class_name in self.timetables for day in WORKING_DAYS
+        )
+        teachers = {teacher for teacher, _ in self.teacher_load}
+        score += sum(self._teacher_score(teacher) for teacher in teachers)
+        return score + self.weights.period_count * self.checker.violations[PERIOD_COUNT]
+
+    def optimize(
+        self,
+        time_budget: float,
+        start_temperature: float = 2.0,
+        end_temperature: float = 0.01
+    ) -> Dict[str, Dict[str, List[Period]]]:
+        """Anneal for ``time_budget`` seconds and return the best timetables found."""
+        started = clock.perf_counter()
+        deadline = started + time_budget
+        best = self._snapshot()
+        movable = [class_name for class_name, cells in self.cells.items() if len(cells) > 1]
+
+        while movable:
+            now = clock.perf_counter()
+            if now >= deadline:
+                break
+            progress = (now - started) / time_budget if time_budget > 0 else 1.0
+            temperature = start_temperature * (end_temperature / start_temperature) ** progress
+            self.iterations += 1
+
+            class_name = self.rng.choice(movable)
+            (day_a, index_a), (day_b, index_b) = self.rng.sample(self.cells[class_name], 2)
+            delta = self._try_swap(SwapMove(class_name, day_a, index_a, day_b, index_b), temperature)
+            if delta is None:
+                continue
+            self.accepted += 1
+            self.score += delta
+            if self.score < self.best_score - 1e-9:
+                self.best_score = self.score
+                best = self._snapshot()
+
+        self._restore(best)
+        self.score = self.best_score
+        return {
+            class_name: {
+                day: [p for p in periods if not is_free_period(p)]
+                for day, periods in timetable.items()
+            }
+            for class_name, timetable in self.timetables.items()
+        }
+
+    def _try_swap(self, move: SwapMove, temperature: float) -> Optional[float]:
+        """Apply the swap if accepted and return its score delta, else None."""
+        timetable = self.timetables[move.class_name]
+        period_a = timetable[move.day_a][move.index_a]
+        period_b = timetable[move.day_b][move.index_b]
+        if (period_a.subject, period_a.teacher) == (period_b.subject, period_b.teacher):
+            return None
+        if not (self._can_teach_at(period_b.teacher, move.day_a, period_a) and
+                self._can_teach_at(period_a.teacher, move.day_b, period_b)):
+            return None
+
+        teacher_a, teacher_b = period_a.teacher, period_b.teacher
+        days = {(move.class_name, move.day_a), (move.class_name, move.day_b)}
+        teachers = {t for t in (teacher_a, teacher_b) if t}
+        before = self._local_score(days, teachers)
+
+        hard = self.checker.apply(move)
+        self._move_load(teacher_a, move.day_a, move.day_b)
+        self._move_load(teacher_b, move.day_b, move.day_a)
+        delta = self._local_score(days, teachers) - before
+        delta += self.weights.period_count * hard[PERIOD_COUNT]
+
+        if hard[TEACHER_CONFLICTS] > 0 or not self._accept(delta, temperature):
+            # A swap is its own inverse
+            self.checker.apply(move)
+            self._move_load(teacher_a, move.day_b, move.day_a)
+            self._move_load(teacher_b, move.day_a, move.day_b)
+            return None
+        return delta
+
+    def _accept(self, delta: float, temperature: float) -> bool:
+        if delta <= 0:
+            return True
+        return self.rng.random() < math.exp(-delta / temperature)
+
+    def _can_teach_at(self, teacher_name: Optional[str], day: str, slot: Period) -> bool:
+        """Check the teacher's availability for the slot they would move into."""
+        if not teacher_name:
+            return True
+        teacher = self.teachers.get(teacher_name)
+        return teacher is not None and teacher.is_available_minutes(day, slot.start_minute, slot.end_minute)
+
+    def _move_load(self, teacher: Optional[str], from_day: str, to_day: str) -> None:
+        if teacher and from_day != to_day:
+            self.teacher_load[(teacher, from_day)] -= 1
+            self.teacher_load[(teacher, to_day)] += 1
+
+    def _local_score(self, days, teachers) -> float:
+        return (
+            sum(self._day_score(class_name, day) for class_name, day in days) +
+            sum(self._teacher_score(teacher) for teacher in teachers)
+        )
+
+    def _day_score(self, class_name: str, day: str) -> float:
+        """Spread and consecutive-repeat penalties for one class on one day."""
+        regular = [
+            p for p in self.timetables[class_name][day]
+            if not (p.is_break or p.is_assembly or is_free_period(p))
+        ]
+        counts = Counter(p.subject for p in regular)
+        spread = sum(count * (count - 1) // 2 for count in counts.values())
+        consecutive = sum(
+            1 for first, second in zip(regular, regular[1:])
+            if first.subject == second.subject and first.end_time == second.start_time
+        )
+        return self.weights.spread * spread + self.weights.consecutive * consecutive
+
+    def _teacher_score(self, teacher: str) -> float:
+        return self.weights.teacher_load * sum(self.teacher_load[(teacher, day)] ** 2 for day in WORKING_DAYS)
+
+    def _snapshot(self) -> Dict[str, List[Tuple[str, Optional[str]]]]:
+        return {
+            class_name: [(self.timetables[class_name][day][index].subject,
+                          self.timetables[class_name][day][index].teacher)
+                         for day, index in cells]
+            for class_name, cells in self.cells.items()
+        }
+
+    def _restore(self, snapshot: Dict[str, List[Tuple[str, Optional[str]]]]) -> None:
+        for class_name, cells in self.cells.items():
+            for (day, index), (subject, teacher) in zip(cells, snapshot[class_name]):
+                period = self.timetables[class_name][day][index]
+                period.subject = subject
+                period.teacher = teacher
+        self.checker = IncrementalConstraintChecker(self.timetables)
+        self._count_teacher_load()
+
+    def _count_teacher_load(self) -> None:
+        """Recount (teacher, day) -> regular periods from the timetables."""
+        self.teacher_load.clear()
+        for timetable in self.timetables.values():
+            for day in WORKING_DAYS:
+                for period in timetable[day]:
+                    if period.teacher and not (period.is_break or period.is_assembly):
+                        self.teacher_load[(period.teacher, day)] += 1
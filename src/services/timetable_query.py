@@ -0,0 +1,196 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from src.models.period import Period
+from src.models.teacher import Teacher
+from src.services.repair import RepairChange
+from src.utils.helpers import time_to_minutes
+from src.config import WORKING_DAYS
+
+MINUTES_PER_DAY = 24 * 60
+
+Minute = Union[time, int]
+
+def _minute(value: Minute) -> int:
+    return value if isinstance(value, int) else time_to_minutes(value)
+
+def _taught(period: Optional[Period]) -> bool:
+    return period is not None and not (period.is_break or period.is_assembly)
+
+class TimetableQuery:
+    """Indexed lookups over generated school timetables, for substitutions.
+
+    Three indexes are kept:
+
+    - teacher -> day -> periods sorted by start, so "where is this teacher
+      at 11:15" is one bisect;
+    - day -> minute -> bitset of busy teachers (one bit per teacher), so the
+      free teachers at a time are one AND-NOT against the available set;
+    - subject -> day -> occurrences sorted by start, for "which classes have
+      Mathematics after lunch".
+
+    Without ``teachers`` everybody who teaches somewhere counts as available
+    all day; with them their availability windows apply and teachers without
+    periods are included. The timetables are not modified: after changing a
+    period, pass the change to ``update`` (or repair's changes to ``apply``).
+    """
+
+    def __init__(
+        self,
+        timetables: Dict[str, Dict[str, List[Period]]],
+        teachers: Optional[List[Teacher]] = None
+    ):
+        self.teacher_names: List[str] = []
+        self._bit: Dict[str, int] = {}
+        self._periods: Dict[str, Dict[str, List[Tuple[int, int, str, Period]]]] = {}
+        self._busy: Dict[str, List[int]] = {}
+        self._subjects: Dict[str, Dict[str, List[Tuple[int, str, Period]]]] = {}
+        self._available: Optional[Dict[str, List[int]]] = None
+
+        for teacher in teachers or []:
+            self._teacher_bit(teacher.name)
+        for class_name, timetable in timetables.items():
+            for day, periods in timetable.items():
+                for period in periods:
+                    self._add(class_name, day, period)
+        if teachers is not None:
+            self._available = {}
+            for teacher in teachers:
+                bit = 1 << self._bit[teacher.name]
+                for day, windows in teacher.availability.items():
+                    minutes = self._available.setdefault(day, [0] * MINUTES_PER_DAY)
+                    for start, end in windows:
+                        for minute in range(time_to_minutes(start), time_to_minutes(end)):
+                            minutes[minute] |= bit
+
+    def teacher_location(self, teacher: str, day: str, at: Minute) -> Optional[Tuple[str, Period]]:
+        """(class name, period) the teacher is teaching at a time, or None."""
+        minute = _minute(at)
+        periods = self._periods.get(teacher, {}).get(day, [])
+        index = bisect_right(periods, (minute, MINUTES_PER_DAY)) - 1
+        # Scan back over earlier starts in case of a longer overlapping booking
+        while index >= 0:
+            start, end, class_name, period = periods[index]
+            if end > minute:
+                return class_name, period
+            index -= 1
+        return None
+
+    def free_teachers(self, day: str, at: Minute, until: Optional[Minute] = None) -> List[str]:
+        """Teachers available and not teaching at ``at``, or for all of [at, until)."""
+        start = _minute(at)
+        end = _minute(until) if until is not None else start + 1
+        busy = self._busy.get(day)
+        available = self._available.get(day) if self._available is not None else None
+        if self._available is not None and available is None:
+            return []
+        free = (1 << len(self.teacher_names)) - 1
+        for minute in range(start, end):
+            if busy is not None:
+                free &= ~busy[minute]
+            if available is not None:
+                free &= available[minute]
+        return sorted(self._names(free))
+
+    def subject_occurrences(
+        self,
+        subject: str,
+        day: Optional[str] = None,
+        after: Optional[Minute] = None,
+        before: Optional[Minute] = None
+    ) -> List[Tuple[str, str, Period]]:
+        """(class name, day, period) for a subject, optionally on one day and
+        starting at or after ``after`` and before ``before``; in day then time order."""
+        by_day = self._subjects.get(subject, {})
+        low = (_minute(after),) if after is not None else (-1,)
+        high = (_minute(before),) if before is not None else (MINUTES_PER_DAY,)
+        occurrences = []
+        for d in self._days(by_day) if day is None else [day]:
+            entries = by_day.get(d, [])
+            for _, class_name, period in entries[bisect_left(entries, low):bisect_left(entries, high)]:
+                occurrences.append((class_name, d, period))
+        return occurrences
+
+    def update(self, class_name: str, day: str, before: Optional[Period], after: Optional[Period]) -> None:
+        """Re-index one period that was replaced, added (``before`` None) or removed (``after`` None).
+
+        Raises ValueError, leaving the indexes unchanged, if ``before`` is not
+        an indexed period of that class and day.
+        """
+        if before is not None:
+            self._remove(class_name, day, before)
+        if after is not None:
+            self._add(class_name, day, after)
+
+    def apply(self, changes: Iterable[RepairChange]) -> None:
+        """Re-index every change reported by ``TimetableRepair.repair``."""
+        for change in changes:
+            self.update(change.class_name, change.day, change.before, change.after)
+
+    def _add(self, class_name: str, day: str, period: Period) -> None:
+        if not _taught(period):
+            return
+        start, end = period.start_minute, period.end_minute
+        insort(self._subjects.setdefault(period.subject, {}).setdefault(day, []), (start, class_name, period))
+        if not period.teacher:
+            return
+        bit = 1 << self._teacher_bit(period.teacher)
+        insort(self._periods[period.teacher].setdefault(day, []), (start, end, class_name, period))
+        busy = self._busy.setdefault(day, [0] * MINUTES_PER_DAY)
+        for minute in range(start, end):
+            busy[minute] |= bit
+
+    def _remove(self, class_name: str, day: str, period: Period) -> None:
+        if not _taught(period):
+            return
+        start, end = period.start_minute, period.end_minute
+        # Both entries are located before either is deleted, so a bad update changes nothing
+        entries = self._subjects.get(period.subject, {}).get(day, [])
+        entry = self._index_of(entries, (start, class_name), class_name, day, period)
+        if period.teacher:
+            periods = self._periods.get(period.teacher, {}).get(day, [])
+            booking = self._index_of(periods, (start, end, class_name), class_name, day, period)
+        del entries[entry]
+        if not period.teacher:
+            return
+        del periods[booking]
+        # Clear the interval, then restore any other booking of the teacher overlapping it
+        bit = 1 << self._bit[period.teacher]
+        busy = self._busy[day]
+        for minute in range(start, end):
+            busy[minute] &= ~bit
+        for other_start, other_end, _, _ in periods:
+            for minute in range(max(start, other_start), min(end, other_end)):
+                busy[minute] |= bit
+
+    @staticmethod
+    def _index_of(entries: List[tuple], key: tuple, class_name: str, day: str, period: Period) -> int:
+        """Position of ``period`` among sorted index entries starting with ``key``."""
+        index = bisect_left(entries, key)
+        while index < len(entries) and entries[index][:len(key)] == key:
+            if entries[index][-1] == period:
+                return index
+            index += 1
+        raise ValueError(
+            f"{class_name} has no indexed {period.subject} period on {day} "
+            f"at {period.start_time}-{period.end_time}"
+            + (f" with {period.teacher}" if period.teacher else "")
+        )
+
+    def _teacher_bit(self, name: str) -> int:
+        if name not in self._bit:
+            self._bit[name] = len(self.teacher_names)
+            self.teacher_names.append(name)
+            self._periods[name] = {}
+        return self._bit[name]
+
+    def _names(self, bits: int) -> Iterable[str]:
+        while bits:
+            low = bits & -bits
+            yield self.teacher_names[low.bit_length() - 1]
+            bits ^= low
+
+    @staticmethod
+    def _days(by_day: Dict[str, object]) -> List[str]:
+        return [d for d in WORKING_DAYS if d in by_day] + [d for d in by_day if d not in WORKING_DAYS]
@@ -0,0 +1,173 @@
+from typing import Dict, List, Optional, Union
+import json
+import os
+import struct
+
+import numpy as np
+
+from src.models.period import Period
+from src.utils.helpers import minutes_to_time
+from src.config import WORKING_DAYS
+
+MAGIC = b"TTSTORE1"
+ALIGNMENT = 16
+
+# Period kinds
+REGULAR = 0
+BREAK = 1
+ASSEMBLY = 2
+
+NO_STRING = -1  # Teacher id of a period whose teacher is None
+
+RECORD_DTYPE = np.dtype([
+    ("class_id", "<u2"),
+    ("day", "u1"),
+    ("kind", "u1"),
+    ("start", "<u2"),  # Minutes since midnight
+    ("end", "<u2"),
+    ("subject", "<i4"),  # Index into the string table
+    ("teacher", "<i4"),
+])
+
+Timetable = Dict[str, List[Period]]
+PathLike = Union[str, os.PathLike]
+
+class StoredTimetables:
+    """A memory-mapped store file.
+
+    A file is ``MAGIC | uint32 header length | JSON header | padding | records``.
+    The header holds the string table (every subject and teacher name once),
+    the day and class names, the days each class's timetable has, and where
+    each class's records start. Records are RECORD_DTYPE rows sorted by
+    class, day and start minute. A teacher of "" is stored as a string, so
+    only None comes back as None.
+
+    ``records`` is a read-only view of the file; ``class_records`` slices it
+    without copying, and ``timetables`` builds Period objects on demand.
+    """
+
+    def __init__(
+        self,
+        records: np.ndarray,
+        strings: List[str],
+        days: List[str],
+        class_names: List[str],
+        class_offsets: List[int],
+        class_days: Optional[List[List[int]]] = None
+    ):
+        self.records = records
+        self.strings = strings
+        self.days = days
+        self.class_names = class_names
+        self.class_offsets = class_offsets
+        # Day ids per class; files without them give every class every day
+        self.class_days = class_days if class_days is not None else [list(range(len(days)))] * len(class_names)
+        self._string_ids = {name: index for index, name in enumerate(strings)}
+
+    def __len__(self) -> int:
+        return len(self.class_names)
+
+    def class_records(self, class_name: str) -> np.ndarray:
+        index = self.class_names.index(class_name)
+        return self.records[self.class_offsets[index]:self.class_offsets[index + 1]]
+
+    def string_id(self, name: str) -> int:
+        """Id of a subject or teacher name, or NO_STRING if it never occurs."""
+        return self._string_ids.get(name, NO_STRING)
+
+    def timetable(self, class_name: str) -> Timetable:
+        days = self.class_days[self.class_names.index(class_name)]
+        timetable: Timetable = {self.days[day]: [] for day in days}
+        for record in self.class_records(class_name).tolist():
+            _, day, kind, start, end, subject, teacher = record
+            timetable[self.days[day]].append(Period(
+                start_time=minutes_to_time(start),
+                end_time=minutes_to_time(end),
+                subject=self.strings[subject],
+                teacher=self.strings[teacher] if teacher != NO_STRING else None,
+                is_break=kind == BREAK,
+                is_assembly=kind == ASSEMBLY
+            ))
+        return timetable
+
+    def timetables(self) -> Dict[str, Timetable]:
+        return {class_name: self.timetable(class_name) for class_name in self.class_names}
+
+def _encode(timetables: Dict[str, Timetable], days: List[str]):
+    string_ids: Dict[str, int] = {}
+    rows = []
+    class_offsets = [0]
+    day_ids = {day: day_id for day_id, day in enumerate(days)}
+    class_days = []
+    for class_id, timetable in enumerate(timetables.values()):
+        class_days.append([day_ids[day] for day in timetable])
+        for day_id, day in enumerate(days):
+            for period in sorted(timetable.get(day, ()), key=lambda p: p.start_minute):
+                kind = BREAK if period.is_break else ASSEMBLY if period.is_assembly else REGULAR
+                rows.append((
+                    class_id, day_id, kind, period.start_minute, period.end_minute,
+                    string_ids.setdefault(period.subject, len(string_ids)),
+                    string_ids.setdefault(period.teacher, len(string_ids)) if period.teacher is not None else NO_STRING
+                ))
+        class_offsets.append(len(rows))
+    return np.array(rows, dtype=RECORD_DTYPE), list(string_ids), class_offsets, class_days
+
+def save_school(timetables: Dict[str, Timetable], path: PathLike) -> None:
+    """Write class timetables (keyed by class name) to one store file."""
+    days = list(WORKING_DAYS) + sorted({
+        day for timetable in timetables.values() for day in timetable if day not in WORKING_DAYS
+    })
+    records, strings, class_offsets, class_days = _encode(timetables, days)
+    header = json.dumps({
+        "strings": strings,
+        "days": days,
+        "classes": list(timetables),
+        "class_offsets": class_offsets,
+        "class_days": class_days,
+    }, separators=(",", ":")).encode("utf-8")
+    prefix = len(MAGIC) + 4 + len(header)
+    padding = -prefix % ALIGNMENT
+
+    tmp_path = f"{os.fspath(path)}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(b"\0" * padding)
+        f.write(records.tobytes())
+    os.replace(tmp_path, path)
+
+def save_timetable(timetable: Timetable, path: PathLike, class_name: str = "") -> None:
+    """Write a single class timetable to a store file."""
+    save_school({class_name: timetable}, path)
+
+def open_store(path: PathLike) -> StoredTimetables:
+    """Memory-map a store file; only the header is read up front."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{os.fspath(path)} is not a timetable store file")
+        (header_length,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_length).decode("utf-8"))
+    prefix = len(MAGIC) + 4 + header_length
+    offset = prefix + (-prefix % ALIGNMENT)
+    count = header["class_offsets"][-1]
+    if count:
+        records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=offset, shape=(count,))
+    else:
+        records = np.empty(0, dtype=RECORD_DTYPE)  # mmap cannot map zero bytes
+    return StoredTimetables(
+        records=records,
+        strings=header["strings"],
+        days=header["days"],
+        class_names=header["classes"],
+        class_offsets=header["class_offsets"],
+        class_days=header.get("class_days")
+    )
+
+def load_school(path: PathLike) -> Dict[str, Timetable]:
+    return open_store(path).timetables()
+
+def load_timetable(path: PathLike, class_name: Optional[str] = None) -> Timetable:
+    """Read one class timetable; the first class in the file when no name is given."""
+    store = open_store(path)
+    return store.timetable(class_name if class_name is not None else store.class_names[0])
@@ -0,0 +1,196 @@
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+from src.models.period import Period
+from src.services.incremental_checker import PERIOD_COUNT, TEACHER_CONFLICTS, SUBJECT_DISTRIBUTION
+from src.utils.helpers import minutes_to_time
+from src.config import MIN_PERIODS_PER_DAY, MAX_PERIODS_PER_DAY, WORKING_DAYS, EXAM_SUBJECT
+
+# Cell codes below zero; subject and teacher ids are indices into the name tables
+EMPTY = -1
+BREAK_ID = -2
+ASSEMBLY_ID = -3
+EXAM_ID = -4  # A regular period, but outside the subject distribution
+
+class TimetableTensor:
+    """Array-backed school timetable.
+
+    ``subjects`` and ``teachers`` are int16 arrays of shape [class, day, slot].
+    Slots are the sorted union of period (start, end) minutes across the
+    school, so the same slot index means the same interval in every class.
+    Classes on offset grids get separate slots; ``slot_overlaps`` tells the
+    conflict kernel which of those intervals overlap. Subject cells hold a
+    subject id, EMPTY, BREAK_ID, ASSEMBLY_ID or EXAM_ID; teacher cells hold a
+    teacher id or EMPTY.
+    """
+
+    def __init__(
+        self,
+        subjects: np.ndarray,
+        teachers: np.ndarray,
+        class_names: Sequence[str],
+        subject_names: Sequence[str],
+        teacher_names: Sequence[str],
+        slot_starts: np.ndarray,
+        slot_ends: np.ndarray
+    ):
+        self.subjects = subjects
+        self.teachers = teachers
+        self.class_names = list(class_names)
+        self.subject_names = list(subject_names)
+        self.teacher_names = list(teacher_names)
+        self.slot_starts = slot_starts
+        self.slot_ends = slot_ends
+
+    @classmethod
+    def from_timetables(cls, timetables: Dict[str, Dict[str, List[Period]]]) -> "TimetableTensor":
+        """Pack class timetables (keyed by class name) into tensors."""
+        class_names = list(timetables)
+        spans = sorted({
+            (p.start_minute, p.end_minute)
+            for timetable in timetables.values()
+            for day in WORKING_DAYS for p in timetable[day]
+        })
+        slot_of = {span: index for index, span in enumerate(spans)}
+        subject_ids: Dict[str, int] = {}
+        teacher_ids: Dict[str, int] = {}
+
+        shape = (len(class_names), len(WORKING_DAYS), len(spans))
+        subjects = np.full(shape, EMPTY, dtype=np.int16)
+        teachers = np.full(shape, EMPTY, dtype=np.int16)
+        for c, class_name in enumerate(class_names):
+            for d, day in enumerate(WORKING_DAYS):
+                for period in timetables[class_name][day]:
+                    s = slot_of[(period.start_minute, period.end_minute)]
+                    if period.is_break:
+                        subjects[c, d, s] = BREAK_ID
+                    elif period.is_assembly:
+                        subjects[c, d, s] = ASSEMBLY_ID
+                    elif period.subject == EXAM_SUBJECT:
+                        subjects[c, d, s] = EXAM_ID
+                    else:
+                        subjects[c, d, s] = subject_ids.setdefault(period.subject, len(subject_ids))
+                        if period.teacher:
+                            teachers[c, d, s] = teacher_ids.setdefault(period.teacher, len(teacher_ids))
+
+        return cls(
+            subjects=subjects,
+            teachers=teachers,
+            class_names=class_names,
+            subject_names=list(subject_ids),
+            teacher_names=list(teacher_ids),
+            slot_starts=np.array([start for start, _ in spans], dtype=np.int16),
+            slot_ends=np.array([end for _, end in spans], dtype=np.int16)
+        )
+
+    def to_timetables(self) -> Dict[str, Dict[str, List[Period]]]:
+        """Unpack tensors back into Period lists."""
+        timetables: Dict[str, Dict[str, List[Period]]] = {}
+        for c, class_name in enumerate(self.class_names):
+            timetables[class_name] = {}
+            for d, day in enumerate(WORKING_DAYS):
+                periods = []
+                for s in np.flatnonzero(self.subjects[c, d] != EMPTY):
+                    code = int(self.subjects[c, d, s])
+                    teacher = int(self.teachers[c, d, s])
+                    periods.append(Period(
+                        start_time=minutes_to_time(int(self.slot_starts[s])),
+                        end_time=minutes_to_time(int(self.slot_ends[s])),
+                        subject="Break" if code == BREAK_ID else "Assembly" if code == ASSEMBLY_ID
+                        else EXAM_SUBJECT if code == EXAM_ID else self.subject_names[code],
+                        teacher=self.teacher_names[teacher] if teacher >= 0 else None,
+                        is_assembly=code == ASSEMBLY_ID,
+                        is_break=code == BREAK_ID
+                    ))
+                timetables[class_name][day] = periods
+        return timetables
+
+    def slot_overlaps(self) -> np.ndarray:
+        """Boolean [slot, slot] matrix of slots whose intervals overlap."""
+        starts, ends = self.slot_starts, self.slot_ends
+        return (starts[:, None] < ends[None, :]) & (starts[None, :] < ends[:, None])
+
+    def violation_counts(self) -> Dict[str, int]:
+        """Count violations per ConstraintChecker rule."""
+        counts = violation_counts(
+            self.subjects, self.teachers, len(self.subject_names), len(self.teacher_names),
+            self.slot_overlaps()
+        )
+        return {rule: int(value) for rule, value in counts.items()}
+
+# Vectorized kernels. Every kernel accepts any number of leading batch axes in
+# front of [class, day, slot], so thousands of candidates can be scored at once.
+
+def period_counts(subjects: np.ndarray) -> np.ndarray:
+    """Regular periods per class and day, exams included: shape [..., class, day]."""
+    return ((subjects >= 0) | (subjects == EXAM_ID)).sum(axis=-1)
+
+def period_count_violations(subjects: np.ndarray) -> np.ndarray:
+    """Boolean [..., class, day] mask of days outside MIN/MAX_PERIODS_PER_DAY."""
+    counts = period_counts(subjects)
+    return (counts < MIN_PERIODS_PER_DAY) | (counts > MAX_PERIODS_PER_DAY)
+
+def teacher_slot_counts(teachers: np.ndarray, n_teachers: int) -> np.ndarray:
+    """Periods per teacher in each (day, slot) across classes: shape [..., day, slot, teacher]."""
+    batch_shape = teachers.shape[:-3]
+    n_classes, n_days, n_slots = teachers.shape[-3:]
+    flat = teachers.reshape(-1, n_classes, n_days, n_slots)
+    batch = flat.shape[0]
+    cells = (
+        np.arange(batch).reshape(-1, 1, 1, 1) * n_days * n_slots +
+        np.arange(n_days).reshape(1, 1, -1, 1) * n_slots +
+        np.arange(n_slots).reshape(1, 1, 1, -1)
+    )
+    valid = flat >= 0
+    index = np.broadcast_to(cells, flat.shape)[valid] * n_teachers + flat[valid]
+    counts = np.bincount(index, minlength=batch * n_days * n_slots * n_teachers)
+    return counts.reshape(batch_shape + (n_days, n_slots, n_teachers))
+
+def teacher_conflict_pairs(
+    teachers: np.ndarray,
+    n_teachers: int,
+    slot_overlaps: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Number of double-booked teacher pairs per candidate: shape [...].
+
+    Pairs within one slot are always counted. With ``slot_overlaps`` (see
+    TimetableTensor.slot_overlaps) pairs across different but overlapping
+    slots are counted too; without it slots are assumed not to overlap.
+    """
+    counts = teacher_slot_counts(teachers, n_teachers).astype(np.int64)
+    pairs = (counts * (counts - 1) // 2).sum(axis=(-3, -2, -1))
+    if slot_overlaps is not None:
+        across = np.triu(slot_overlaps, k=1).astype(np.int64)
+        if across.any():
+            pairs = pairs + np.einsum("...dst,...dut,su->...", counts, counts, across)
+    return pairs
+
+def subject_histogram(subjects: np.ndarray, n_subjects: int) -> np.ndarray:
+    """Periods per subject for each class: shape [..., class, subject]."""
+    leading = subjects.shape[:-2]
+    flat = subjects.reshape(-1, subjects.shape[-2] * subjects.shape[-1])
+    rows = np.broadcast_to(np.arange(flat.shape[0]).reshape(-1, 1), flat.shape)
+    valid = flat >= 0
+    counts = np.bincount(rows[valid] * n_subjects + flat[valid], minlength=flat.shape[0] * n_subjects)
+    return counts.reshape(leading + (n_subjects,))
+
+def subject_distribution_violations(subjects: np.ndarray, n_subjects: int) -> np.ndarray:
+    """Boolean [..., class, subject] mask of subjects above 30% or below 2 periods."""
+    histogram = subject_histogram(subjects, n_subjects)
+    totals = histogram.sum(axis=-1, keepdims=True)
+    present = histogram > 0
+    return present & ((histogram > totals * 0.3) | (histogram < 2))
+
+def violation_counts(
+    subjects: np.ndarray,
+    teachers: np.ndarray,
+    n_subjects: int,
+    n_teachers: int,
+    slot_overlaps: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    """Violations per rule for each candidate: arrays of shape [...]."""
+    return {
+        PERIOD_COUNT: period_count_violations(subjects).sum(axis=(-2, -1)),
+        TEACHER_CONFLICTS: teacher_conflict_pairs(teachers, n_teachers, slot_overlaps),
+        SUBJECT_DISTRIBUTION: subject_distribution_violations(subjects, n_subjects).sum(axis=(-2, -1)),
+    }
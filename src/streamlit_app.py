@@ -12,9 +12,25 @@ sys.path.insert(0, project_root)
 
 from src.models.class_info import ClassInfo
 from src.models.teacher import Teacher
-from src.services.timetable_generator import TimetableGenerator
+from src.services.constraint_checker import SchoolConstraintChecker
+from src.services.instrumentation import SolverStats
+from src.services.school_timetable_generator import SchoolTimetableGenerator
+from src.services.timetable_cache import TimetableCache, cached_generate, cached_generate_school, cached_workbook
 from src.utils.helpers import parse_time
-from src.config import CLASSES, DIVISIONS, SUBJECTS, CLASS_TIMINGS, BREAK_TIMINGS
+from src.utils.timetable_views import (
+    timetable_frame,
+    class_slot_grid,
+    class_week_table,
+    teacher_load,
+    free_teacher_matrix,
+    FREE,
+    BUSY,
+    UNAVAILABLE
+)
+from src.config import CLASSES, DIVISIONS, SUBJECTS, CLASS_TIMINGS, BREAK_TIMINGS, WORKING_DAYS
+
+# Every subject taught in any class, in first-seen order
+ALL_SUBJECTS = list(dict.fromkeys(s for name in CLASSES for s in SUBJECTS[name]))
 
 st.set_page_config(
     page_title="School Timetable Generator",
@@ -22,53 +38,24 @@ st.set_page_config(
     layout="wide"
 )
 
-def create_timetable_visualization(timetable):
-    """Create a Plotly visualization of the timetable"""
-    from collections import defaultdict
-    
-    # First, organize periods by time slots
-    time_slots = set()
-    day_periods = defaultdict(dict)
-    
-    for day, periods in timetable.items():
-        for period in periods:
-            if not (period.is_break or period.is_assembly):
-                time_str = f"{period.start_time.strftime('%H:%M')}-{period.end_time.strftime('%H:%M')}"
-                time_slots.add(time_str)
-                day_periods[day][time_str] = f"{period.subject}<br>({period.teacher})"
-    
-    # Sort time slots
-    time_slots = sorted(list(time_slots))
-    
-    # Create table data
-    table_data = []
-    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-    
-    # Header row
-    header = ["Time"] + days
-    
-    # Create cells
-    cells = []
-    cells.append(time_slots)  # First column is time slots
-    
-    # Add data for each day
-    for day in days:
-        day_data = []
-        for time_slot in time_slots:
-            cell_content = day_periods[day].get(time_slot, "")
-            day_data.append(cell_content)
-        cells.append(day_data)
+@st.cache_resource
+def get_timetable_cache():
+    """One cache per server process, shared across reruns and sessions"""
+    return TimetableCache(directory=os.path.join(project_root, ".timetable_cache"))
+
+def create_timetable_visualization(frame, class_name):
+    """Create a Plotly table of one class's week, breaks and assembly included"""
+    table = class_week_table(frame, class_name)
     
-    # Create the table
     fig = go.Figure(data=[go.Table(
         header=dict(
-            values=header,
+            values=["Time"] + WORKING_DAYS,
             fill_color='paleturquoise',
             align='center',
             font=dict(size=14)
         ),
         cells=dict(
-            values=cells,
+            values=[table.index.tolist()] + [table[day].tolist() for day in WORKING_DAYS],
             fill_color='lavender',
             align='center',
             font=dict(size=12),
@@ -79,7 +66,7 @@ def create_timetable_visualization(timetable):
     # Update layout
     fig.update_layout(
         title={
-            'text': "Weekly School Timetable",
+            'text': f"Weekly Timetable - {class_name}",
             'y':0.9,
             'x':0.5,
             'xanchor': 'center',
@@ -87,11 +74,122 @@ def create_timetable_visualization(timetable):
             'font': {'size': 24}
         },
         width=1200,
-        height=len(time_slots) * 50 + 200
+        height=len(table) * 50 + 200
     )
     
     return fig
 
+def create_school_grid(frame):
+    """Heatmap of every class against every weekly slot, coloured by subject"""
+    codes, text = class_slot_grid(frame)
+    fig = go.Figure(data=[go.Heatmap(
+        z=codes.to_numpy(),
+        x=codes.columns.tolist(),
+        y=codes.index.tolist(),
+        text=text.to_numpy(),
+        texttemplate="%{text}",
+        hovertemplate="%{y} %{x}<br>%{text}<extra></extra>",
+        colorscale="Turbo",
+        showscale=False
+    )])
+    fig.update_layout(
+        title="Whole School Timetable",
+        height=len(codes) * 40 + 200,
+        yaxis=dict(autorange="reversed")
+    )
+    return fig
+
+def create_teacher_load_heatmap(frame):
+    """Heatmap of teaching periods per teacher and day"""
+    load = teacher_load(frame)
+    fig = go.Figure(data=[go.Heatmap(
+        z=load.to_numpy(),
+        x=load.columns.tolist(),
+        y=load.index.tolist(),
+        texttemplate="%{z}",
+        colorscale="Blues"
+    )])
+    fig.update_layout(
+        title="Teacher Load (periods per day)",
+        height=len(load) * 25 + 200,
+        yaxis=dict(autorange="reversed")
+    )
+    return fig
+
+def create_free_teacher_matrix(frame, teachers):
+    """Matrix of which teachers are free, busy or unavailable in each slot"""
+    matrix = free_teacher_matrix(frame, teachers)
+    fig = go.Figure(data=[go.Heatmap(
+        z=matrix.to_numpy(),
+        x=matrix.columns.tolist(),
+        y=matrix.index.tolist(),
+        zmin=UNAVAILABLE,
+        zmax=FREE,
+        colorscale=[
+            [0.0, "lightgrey"], [0.33, "lightgrey"],
+            [0.33, "salmon"], [0.67, "salmon"],
+            [0.67, "lightgreen"], [1.0, "lightgreen"]
+        ],
+        colorbar=dict(tickvals=[UNAVAILABLE, BUSY, FREE], ticktext=["Unavailable", "Busy", "Free"])
+    )])
+    fig.update_layout(
+        title="Free Teachers",
+        height=len(matrix) * 25 + 200,
+        yaxis=dict(autorange="reversed")
+    )
+    return fig
+
+@st.cache_data
+def get_timetable_frame(key, _timetables):
+    """Flatten a result once; every view is a pivot of this frame"""
+    return timetable_frame(_timetables)
+
+def show_solver_stats(stats):
+    """Sidebar breakdown of phase timings and solver counters for the last run"""
+    st.sidebar.subheader("⏱️ Solver Stats")
+    if stats.timings:
+        timings = pd.DataFrame(
+            {"ms": [seconds * 1000 for seconds in stats.timings.values()]},
+            index=list(stats.timings)
+        )
+        st.sidebar.dataframe(timings.round(2), use_container_width=True)
+    if stats.counters:
+        counters = pd.DataFrame({"count": list(stats.counters.values())}, index=list(stats.counters))
+        st.sidebar.dataframe(counters, use_container_width=True)
+
+def show_results(result):
+    """Render the selected view only, so switching views never rebuilds the others"""
+    frame = get_timetable_frame(result["key"], result["timetables"])
+    class_names = list(result["timetables"])
+    
+    view = st.radio(
+        "View",
+        ["Class timetable", "Whole school grid", "Teacher load", "Free teachers"],
+        horizontal=True
+    )
+    if view == "Class timetable":
+        class_name = st.selectbox("Class", class_names) if len(class_names) > 1 else class_names[0]
+        fig = create_timetable_visualization(frame, class_name)
+    elif view == "Whole school grid":
+        fig = create_school_grid(frame)
+    elif view == "Teacher load":
+        fig = create_teacher_load_heatmap(frame)
+    else:
+        fig = create_free_teacher_matrix(frame, result["teachers"])
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Export button
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "📥 Export to Excel",
+            data=cached_workbook(
+                get_timetable_cache(), result["key"], result["timetables"], st.session_state.get("stats")
+            ),
+            file_name=result["filename"],
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+
 def load_teacher_data():
     """Create an interactive form for teacher data input"""
     st.sidebar.subheader("👨‍🏫 Teacher Information")
@@ -104,12 +202,12 @@ def load_teacher_data():
             name = st.text_input(f"Name", key=f"teacher_name_{i}", value=f"Teacher {i+1}")
             subjects = st.multiselect(
                 "Subjects",
-                ["Mathematics", "Science", "English", "Social Studies", "Art", "Physical Education"],
+                ALL_SUBJECTS,
                 key=f"teacher_subjects_{i}"
             )
             classes = st.multiselect(
                 "Classes",
-                ["1st", "2nd", "3rd", "4th", "5th"],
+                CLASSES,
                 key=f"teacher_classes_{i}"
             )
             
@@ -141,39 +239,46 @@ def main():
     st.title("📚 School Timetable Generator")
     st.sidebar.title("⚙️ Configuration")
     
-    # Class selection in sidebar
-    st.sidebar.subheader("📝 Class Information")
-    selected_class = st.sidebar.selectbox("Select Class", ["1st", "2nd", "3rd", "4th", "5th"])
-    selected_division = st.sidebar.selectbox("Select Division", ["A", "B", "C"])
+    # Scope: one class with custom timings, or every configured class and division
+    scope = st.sidebar.radio("Generate for", ["Single class", "Whole school"])
     
-    # Class timing in sidebar
-    col1, col2 = st.sidebar.columns(2)
-    with col1:
-        start_time = st.time_input("School Start Time", value=time(9, 0))
-    with col2:
-        end_time = st.time_input("School End Time", value=time(15, 0))
-    
-    # Break times in sidebar
-    st.sidebar.subheader("⏰ Break Times")
-    num_breaks = st.sidebar.number_input("Number of Breaks", min_value=0, max_value=3, value=1)
-    breaks = []
-    
-    for i in range(num_breaks):
+    if scope == "Single class":
+        # Class selection in sidebar
+        st.sidebar.subheader("📝 Class Information")
+        selected_class = st.sidebar.selectbox("Select Class", CLASSES)
+        selected_division = st.sidebar.selectbox("Select Division", DIVISIONS)
+        
+        # Class timing in sidebar
         col1, col2 = st.sidebar.columns(2)
         with col1:
-            break_start = st.time_input(f"Break {i+1} Start", key=f"break_start_{i}", value=time(12, 0))
+            start_time = st.time_input("School Start Time", value=CLASS_TIMINGS[selected_class]["start"])
         with col2:
-            break_end = st.time_input(f"Break {i+1} End", key=f"break_end_{i}", value=time(12, 30))
-        breaks.append((break_start, break_end))
-    
-    # Create ClassInfo object
-    class_info = ClassInfo(
-        name=selected_class,
-        division=selected_division,
-        start_time=start_time,
-        end_time=end_time,
-        breaks=breaks
-    )
+            end_time = st.time_input("School End Time", value=CLASS_TIMINGS[selected_class]["end"])
+        
+        # Break times in sidebar
+        st.sidebar.subheader("⏰ Break Times")
+        num_breaks = st.sidebar.number_input("Number of Breaks", min_value=0, max_value=3, value=1)
+        breaks = []
+        
+        for i in range(num_breaks):
+            col1, col2 = st.sidebar.columns(2)
+            with col1:
+                break_start = st.time_input(f"Break {i+1} Start", key=f"break_start_{i}", value=time(12, 0))
+            with col2:
+                break_end = st.time_input(f"Break {i+1} End", key=f"break_end_{i}", value=time(12, 30))
+            breaks.append((break_start, break_end))
+        
+        # Create ClassInfo object
+        class_info = ClassInfo(
+            name=selected_class,
+            division=selected_division,
+            start_time=start_time,
+            end_time=end_time,
+            breaks=breaks
+        )
+        subjects = SUBJECTS[selected_class]
+    else:
+        subjects = ALL_SUBJECTS
     
     # Get teacher data from sidebar
     teachers = load_teacher_data()
@@ -182,7 +287,6 @@ def main():
     st.sidebar.subheader("📚 Subject Distribution")
     subject_distribution = {}
     
-    subjects = ["Mathematics", "Science", "English", "Social Studies", "Art", "Physical Education"]
     for subject in subjects:
         periods = st.sidebar.number_input(
             f"{subject} periods/week",
@@ -204,37 +308,55 @@ def main():
             st.error("Please specify at least one subject with periods.")
             return
         
+        # Collected even when generation fails, to show where the time went
+        stats = SolverStats()
+        st.session_state["stats"] = stats
         try:
             with st.spinner("Generating timetable..."):
-                # Generate timetable
-                generator = TimetableGenerator(
-                    class_info=class_info,
-                    teachers=teachers,
-                    subject_distribution=subject_distribution
-                )
-                
-                timetable = generator.generate_timetable()
-                
-                if timetable:
-                    st.success("✨ Timetable generated successfully!")
-                    
-                    # Display timetable
-                    fig = create_timetable_visualization(timetable)
-                    if fig:
-                        st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Export button
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        if st.button("📥 Export to Excel"):
-                            filename = f"timetable_{class_info.class_name}.xlsx"
-                            generator.export_to_excel(filename)
-                            st.success(f"✅ Timetable exported to {filename}")
+                # Generate, reusing any result for identical inputs
+                cache = get_timetable_cache()
+                if scope == "Single class":
+                    key, timetable = cached_generate(
+                        cache,
+                        class_info=class_info,
+                        teachers=teachers,
+                        subject_distribution=subject_distribution,
+                        stats=stats
+                    )
+                    timetables = {class_info.class_name: timetable}
+                    filename = f"timetable_{class_info.class_name}.xlsx"
                 else:
-                    st.error("❌ Could not generate a valid timetable. Please adjust the constraints.")
-                
+                    school = SchoolTimetableGenerator.from_config(teachers, {
+                        name: {s: n for s, n in subject_distribution.items() if s in SUBJECTS[name]}
+                        for name in CLASSES
+                    }, stats=stats)
+                    progress = st.progress(0.0)
+                    key, timetables = cached_generate_school(
+                        cache, school,
+                        progress=lambda name, done, total: progress.progress(
+                            done / total, text=f"{name} scheduled ({done}/{total})"
+                        )
+                    )
+                    progress.empty()
+                    filename = "timetable_school.xlsx"
+                SchoolConstraintChecker(timetables, stats=stats).check_all_constraints()
+            
+            # Kept in session state so switching views does not regenerate
+            st.session_state["result"] = {
+                "key": key,
+                "timetables": timetables,
+                "teachers": teachers,
+                "filename": filename
+            }
+            st.success("✨ Timetable generated successfully!")
         except Exception as e:
+            st.session_state.pop("result", None)
             st.error(f"❌ Error generating timetable: {str(e)}")
+    
+    if "stats" in st.session_state:
+        show_solver_stats(st.session_state["stats"])
+    if "result" in st.session_state:
+        show_results(st.session_state["result"])
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,152 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+import csv
+import io
+import json
+
+from src.models.period import Period
+from src.config import WORKING_DAYS
+
+CSV_COLUMNS = ['Class', 'Day', 'Start Time', 'End Time', 'Subject', 'Teacher']
+
+def iter_periods(timetables: Dict[str, Dict[str, List[Period]]]) -> Iterator[Tuple[str, str, Period]]:
+    """Yield (class name, day, period) in class, then day, then period order."""
+    for class_name, timetable in timetables.items():
+        for day in WORKING_DAYS:
+            for period in timetable.get(day, []):
+                yield class_name, day, period
+
+def iter_csv(timetables: Dict[str, Dict[str, List[Period]]], header: bool = True) -> Iterator[str]:
+    """Yield CSV lines, one per period, without building the whole file."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(row) -> str:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        return buffer.getvalue()
+
+    if header:
+        yield line(CSV_COLUMNS)
+    for class_name, day, period in iter_periods(timetables):
+        yield line([
+            class_name,
+            day,
+            period.start_time.strftime('%H:%M'),
+            period.end_time.strftime('%H:%M'),
+            period.subject,
+            period.teacher or ''
+        ])
+
+def iter_jsonl(timetables: Dict[str, Dict[str, List[Period]]]) -> Iterator[str]:
+    """Yield one JSON object per period, newline-terminated (JSON Lines)."""
+    for class_name, day, period in iter_periods(timetables):
+        yield json.dumps({
+            'class': class_name,
+            'day': day,
+            'start': period.start_time.strftime('%H:%M'),
+            'end': period.end_time.strftime('%H:%M'),
+            'subject': period.subject,
+            'teacher': period.teacher,
+            'is_break': period.is_break,
+            'is_assembly': period.is_assembly,
+        }) + '\n'
+
+def _ics_escape(text: str) -> str:
+    return (text.replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\n', '\\n'))
+
+def _ics_fold(line: str) -> str:
+    """Fold a content line to 75 octets as RFC 5545 requires."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Never split a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+        limit = 74  # Continuation lines start with a space
+    return '\r\n '.join(parts) + '\r\n'
+
+def _check_week_start(week_start: date) -> None:
+    """Events are placed by offset from ``week_start``, so it must be a Monday."""
+    if week_start.weekday() != 0:
+        raise ValueError(f"week_start must be a Monday, got {week_start:%A %Y-%m-%d}")
+
+def iter_teacher_ics(
+    teacher: str,
+    periods: List[Tuple[str, str, Period]],
+    week_start: date,
+    weeks: Optional[int] = None
+) -> Iterator[str]:
+    """Yield the lines of one teacher's iCalendar feed.
+
+    ``periods`` holds (class name, day, period) entries; each becomes a weekly
+    recurring event starting in the week of ``week_start``, which must be a
+    Monday (ValueError otherwise, raised before any line is produced).
+    """
+    _check_week_start(week_start)
+    return _teacher_ics_lines(teacher, periods, week_start, weeks)
+
+def _teacher_ics_lines(
+    teacher: str,
+    periods: List[Tuple[str, str, Period]],
+    week_start: date,
+    weeks: Optional[int]
+) -> Iterator[str]:
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    rule = 'RRULE:FREQ=WEEKLY' + (f';COUNT={weeks}' if weeks else '')
+    uid_owner = ''.join(c if c.isalnum() else '-' for c in teacher)
+
+    yield _ics_fold('BEGIN:VCALENDAR')
+    yield _ics_fold('VERSION:2.0')
+    yield _ics_fold('PRODID:-//School Timetable//EN')
+    yield _ics_fold('CALSCALE:GREGORIAN')
+    yield _ics_fold(f'X-WR-CALNAME:{_ics_escape(teacher)}')
+    for class_name, day, period in periods:
+        event_date = week_start + timedelta(days=WORKING_DAYS.index(day))
+        start = datetime.combine(event_date, period.start_time)
+        end = datetime.combine(event_date, period.end_time)
+        uid_class = ''.join(c if c.isalnum() else '-' for c in class_name)
+        yield _ics_fold('BEGIN:VEVENT')
+        yield _ics_fold(f'UID:{uid_owner}-{uid_class}-{day}-{start:%H%M}@timetable')
+        yield _ics_fold(f'DTSTAMP:{stamp}')
+        yield _ics_fold(f'DTSTART:{start:%Y%m%dT%H%M%S}')
+        yield _ics_fold(f'DTEND:{end:%Y%m%dT%H%M%S}')
+        yield _ics_fold(rule)
+        yield _ics_fold(f'SUMMARY:{_ics_escape(f"{period.subject} ({class_name})")}')
+        yield _ics_fold(f'LOCATION:{_ics_escape(class_name)}')
+        yield _ics_fold('END:VEVENT')
+    yield _ics_fold('END:VCALENDAR')
+
+def iter_ics_calendars(
+    timetables: Dict[str, Dict[str, List[Period]]],
+    week_start: date,
+    weeks: Optional[int] = None
+) -> Iterator[Tuple[str, Iterator[str]]]:
+    """Yield (teacher, line iterator) for every teacher's calendar.
+
+    One pass groups period references by teacher; the calendar text itself is
+    produced lazily as each line iterator is consumed. ``week_start`` must be
+    a Monday.
+    """
+    _check_week_start(week_start)
+    return _ics_calendars(timetables, week_start, weeks)
+
+def _ics_calendars(
+    timetables: Dict[str, Dict[str, List[Period]]],
+    week_start: date,
+    weeks: Optional[int]
+) -> Iterator[Tuple[str, Iterator[str]]]:
+    by_teacher: Dict[str, List[Tuple[str, str, Period]]] = {}
+    for class_name, day, period in iter_periods(timetables):
+        if period.teacher and not (period.is_break or period.is_assembly):
+            by_teacher.setdefault(period.teacher, []).append((class_name, day, period))
+    for teacher in sorted(by_teacher):
+        yield teacher, iter_teacher_ics(teacher, by_teacher[teacher], week_start, weeks)
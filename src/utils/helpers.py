@@ -1,32 +1,182 @@
 from datetime import time
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
+import json
+import os
+import re
+import numpy as np
 import pandas as pd
 
+# "8:15", "08:15:00", "8:15 PM", "0815", "815" or "9 AM"; groups are
+# (hour, minute, hour, minute, hour, AM/PM). Shared by the scalar and bulk parsers.
+TIME_PATTERN = r'^(?:(\d{1,2}):(\d{2})(?::\d{2})?|(\d{1,2})(\d{2})|(\d{1,2})(?=\s*[AP]M))\s*([AP]M)?$'
+_TIME_RE = re.compile(TIME_PATTERN)
+
+TEACHER_COLUMNS = ['name', 'subjects', 'classes', 'day', 'start_time', 'end_time']
+
+def _clock_minutes(hour: int, minute: int, meridiem: Optional[str]) -> Optional[int]:
+    """Minutes since midnight, or None when out of range."""
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem == 'PM' else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return hour * 60 + minute
+
 def parse_time(time_str: str) -> time:
     """Convert time string to time object."""
     try:
         # If already a time object, return it
         if isinstance(time_str, time):
             return time_str
+        
+        match = _TIME_RE.match(str(time_str).strip().upper())
+        if match:
+            h1, m1, h2, m2, h3, meridiem = match.groups()
+            minutes = _clock_minutes(int(h1 or h2 or h3), int(m1 or m2 or 0), meridiem)
+            if minutes is not None:
+                return minutes_to_time(minutes)
+            raise ValueError(time_str)
             
-        # Handle 12-hour format with AM/PM
+        # Fall back to pandas for any other 12-hour format with AM/PM
         if 'AM' in time_str.upper() or 'PM' in time_str.upper():
             return pd.to_datetime(time_str).time()
-            
-        # Handle 24-hour format (HH:MM)
-        if ':' in time_str:
-            hours, minutes = map(int, time_str.split(':'))
-            return time(hours, minutes)
-            
-        # Handle numeric format (HHMM)
-        time_str = str(time_str).zfill(4)
-        hours = int(time_str[:2])
-        minutes = int(time_str[2:])
-        return time(hours, minutes)
+        
+        raise ValueError(time_str)
             
     except Exception as e:
         raise ValueError(f"Invalid time format: {time_str}") from e
 
+def time_to_minutes(t: time) -> int:
+    """Convert a time object to minutes since midnight."""
+    return t.hour * 60 + t.minute
+
+def minutes_to_time(minutes: int) -> time:
+    """Convert minutes since midnight to a time object."""
+    return time(minutes // 60, minutes % 60)
+
+@lru_cache(maxsize=4096)
+def interval_mask(start_minute: int, end_minute: int) -> int:
+    """Return a bitmask with bits set for minutes [start_minute, end_minute)."""
+    if end_minute <= start_minute:
+        return 0
+    return ((1 << (end_minute - start_minute)) - 1) << start_minute
+
+def parse_times(values: pd.Series) -> np.ndarray:
+    """Parse a whole column of times to minutes since midnight in one pass.
+
+    Accepts the same formats as ``parse_time`` plus time objects; invalid
+    entries come back as -1.
+    """
+    values = values.map(lambda v: v.strftime('%H:%M') if isinstance(v, time) else v)
+    parts = values.astype(str).str.strip().str.upper().str.extract(TIME_PATTERN)
+    hours = parts[0].fillna(parts[2]).fillna(parts[4]).astype(float).to_numpy()
+    minutes = parts[1].fillna(parts[3]).fillna('0').astype(float).to_numpy()
+    meridiem = parts[5].to_numpy()
+    is_am, is_pm = meridiem == 'AM', meridiem == 'PM'
+    twelve_hour = is_am | is_pm
+
+    valid = ~np.isnan(hours) & (minutes <= 59)
+    valid &= np.where(twelve_hour, (hours >= 1) & (hours <= 12), hours <= 23)
+    hours = np.where(twelve_hour, hours % 12 + np.where(is_pm, 12, 0), hours)
+    return np.where(valid, hours * 60 + minutes, -1).astype(np.int64)
+
+def _read_teacher_rows(source: str) -> pd.DataFrame:
+    """Read a roster file into long format: one row per availability window."""
+    extension = os.path.splitext(source)[1].lower()
+    if extension == '.csv':
+        return pd.read_csv(source, dtype=str, keep_default_na=False)
+    if extension in ('.xlsx', '.xls'):
+        return pd.read_excel(source, dtype=str, keep_default_na=False)
+    if extension == '.json':
+        with open(source) as f:
+            records = json.load(f)
+        # Nested teacher objects are flattened into one row per window
+        rows = []
+        for record in records:
+            if 'availability' not in record:
+                rows.append(record)
+                continue
+            for day, slots in record['availability'].items():
+                for start, end in slots:
+                    rows.append({
+                        'name': record.get('name', ''),
+                        'subjects': ','.join(record.get('subjects', [])),
+                        'classes': ','.join(record.get('classes', [])),
+                        'day': day,
+                        'start_time': start,
+                        'end_time': end
+                    })
+        return pd.DataFrame(rows, columns=TEACHER_COLUMNS).fillna('')
+    raise ValueError(f"Unsupported teacher data format: {extension or source}")
+
+def load_teacher_data(source: str) -> List['Teacher']:
+    """Load teachers from a CSV, XLSX or JSON roster.
+
+    Rows have the columns in TEACHER_COLUMNS, one per availability window;
+    ``subjects`` and ``classes`` are comma-separated and merged across a
+    teacher's rows. All rows are validated before any Teacher is built, and a
+    single ValueError lists every bad row.
+    """
+    return teachers_from_rows(_read_teacher_rows(source))
+
+def teachers_from_rows(rows: pd.DataFrame) -> List['Teacher']:
+    """Validate long-format roster rows and build Teacher objects from them."""
+    from src.models.teacher import Teacher
+    from src.config import WORKING_DAYS
+
+    rows.columns = rows.columns.str.strip().str.lower().str.replace(' ', '_')
+    missing = [column for column in TEACHER_COLUMNS if column not in rows.columns]
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+    rows = rows[TEACHER_COLUMNS].astype(str).apply(lambda column: column.str.strip())
+    rows['day'] = rows['day'].str.capitalize()
+    start = parse_times(rows['start_time'])
+    end = parse_times(rows['end_time'])
+
+    problems = {
+        'missing name': (rows['name'] == '').to_numpy(),
+        'unknown day': ~rows['day'].isin(WORKING_DAYS).to_numpy(),
+        'invalid start time': start < 0,
+        'invalid end time': end < 0,
+        'end time not after start time': (start >= 0) & (end >= 0) & (end <= start),
+    }
+    bad = np.zeros(len(rows), dtype=bool)
+    for mask in problems.values():
+        bad |= mask
+    if bad.any():
+        lines = []
+        for index in np.flatnonzero(bad):
+            reasons = [problem for problem, mask in problems.items() if mask[index]]
+            lines.append(f"  row {index + 1}: {', '.join(reasons)}")
+        raise ValueError("Invalid teacher data:\n" + "\n".join(lines))
+
+    # Each distinct minute becomes one shared time object
+    times = {minute: minutes_to_time(int(minute)) for minute in np.unique(np.concatenate([start, end]))}
+    teachers: Dict[str, Dict[str, Any]] = {}
+    for name, subjects, classes, day, s, e in zip(
+        rows['name'], rows['subjects'], rows['classes'], rows['day'], start, end
+    ):
+        entry = teachers.setdefault(name, {'subjects': {}, 'classes': {}, 'availability': {}})
+        for value in subjects.split(','):
+            if value.strip():
+                entry['subjects'][value.strip()] = None
+        for value in classes.split(','):
+            if value.strip():
+                entry['classes'][value.strip()] = None
+        entry['availability'].setdefault(day, []).append([times[s], times[e]])
+
+    return [
+        Teacher(
+            name=name,
+            subjects=list(entry['subjects']),
+            classes=list(entry['classes']),
+            availability=entry['availability']
+        )
+        for name, entry in teachers.items()
+    ]
+
 def format_timetable(timetable: Dict[str, List[Any]], format_type: str = 'text') -> str:
     """Format timetable for display/export."""
     if format_type == 'text':
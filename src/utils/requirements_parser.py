@@ -0,0 +1,120 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+import re
+import pandas as pd
+
+from src.models.class_info import ClassInfo
+from src.models.teacher import Teacher
+from src.utils.helpers import parse_time, teachers_from_rows, TEACHER_COLUMNS
+
+# A section starts at a line holding just its title, e.g. "Subject Distribution:"
+SECTIONS = {
+    "teachers": "teachers",
+    "teacher": "teachers",
+    "availability": "availability",
+    "teacher availability": "availability",
+    "classes": "classes",
+    "class timings": "classes",
+    "subject distribution": "distribution",
+}
+SECTION_RE = re.compile(r'^\s*(' + '|'.join(SECTIONS) + r')\s*:?\s*$', re.IGNORECASE)
+# Table cells as they come out of PDF text: pipes, tabs or runs of spaces
+CELL_SPLIT_RE = re.compile(r'\s*\|\s*|\t+|\s{2,}')
+TIME = r'\d{1,2}(?::\d{2})?\s*(?:[AaPp][Mm])?'
+TIME_RANGE_RE = re.compile(rf'({TIME})\s*(?:-|–|to)\s*({TIME})')
+HEADER_WORDS = {"name", "teacher", "class", "day"}
+
+@dataclass
+class Requirements:
+    """Structured generator inputs read from a requirements document."""
+    teachers: List[Teacher] = field(default_factory=list)
+    classes: List[ClassInfo] = field(default_factory=list)
+    subject_distributions: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+def _split_list(text: str) -> List[str]:
+    return [item.strip() for item in re.split(r'[,/;]', text) if item.strip()]
+
+def parse_requirements(pages: Iterable[str]) -> Requirements:
+    """Parse requirement tables from page texts, consuming one page at a time.
+
+    Recognised sections and their row layouts:
+
+    - Teachers: name | subjects | classes
+    - Availability: name | day | start | end  (or name | day | start - end)
+    - Classes: class | divisions | start | end | breaks ("9:25-9:45, 12:45-13:15" or "none")
+    - Subject Distribution: class | subject | periods per week
+
+    Lines outside a section and header rows are ignored. Malformed rows are
+    collected and reported together in one ValueError.
+    """
+    section = None
+    teacher_info: Dict[str, Tuple[List[str], List[str]]] = {}
+    availability: List[Tuple[int, str, str, str, str]] = []
+    requirements = Requirements()
+    errors: List[str] = []
+
+    line_number = 0
+    for page in pages:
+        for line in page.splitlines():
+            line_number += 1
+            if not line.strip():
+                continue
+            match = SECTION_RE.match(line)
+            if match:
+                section = SECTIONS[match.group(1).lower()]
+                continue
+            if section is None:
+                continue
+            cells = [cell for cell in CELL_SPLIT_RE.split(line.strip()) if cell]
+            if not cells or cells[0].lower() in HEADER_WORDS:
+                continue
+            try:
+                if section == "teachers":
+                    name, subjects, classes = cells
+                    teacher_info[name] = (_split_list(subjects), _split_list(classes))
+                elif section == "availability":
+                    if len(cells) == 3:
+                        window = TIME_RANGE_RE.search(cells[2])
+                        if window is None:
+                            raise ValueError
+                        cells = cells[:2] + list(window.groups())
+                    name, day, start, end = cells
+                    availability.append((line_number, name, day, start, end))
+                elif section == "classes":
+                    name, divisions, start, end = cells[:4]
+                    # No breaks column keeps the configured breaks; "none" gives a class without any
+                    break_text = " ".join(cells[4:]).strip()
+                    breaks = [
+                        (parse_time(s), parse_time(e))
+                        for s, e in TIME_RANGE_RE.findall(break_text)
+                    ] if break_text else None
+                    for division in _split_list(divisions):
+                        requirements.classes.append(ClassInfo(
+                            name=name,
+                            division=division,
+                            start_time=parse_time(start),
+                            end_time=parse_time(end),
+                            breaks=list(breaks) if breaks is not None else None
+                        ))
+                else:
+                    class_name, subject, periods = cells
+                    requirements.subject_distributions.setdefault(class_name, {})[subject] = int(periods)
+            except ValueError:
+                errors.append(f"  line {line_number} ({section}): {line.strip()}")
+
+    unknown = [f"  line {n}: unknown teacher '{name}'" for n, name, *_ in availability if name not in teacher_info]
+    scheduled = {row[1] for row in availability}
+    unscheduled = [f"  teacher '{name}' has no availability" for name in teacher_info if name not in scheduled]
+    errors.extend(unknown + unscheduled)
+    if errors:
+        raise ValueError("Invalid requirements:\n" + "\n".join(errors))
+
+    rows = pd.DataFrame(
+        [
+            (name, ",".join(teacher_info[name][0]), ",".join(teacher_info[name][1]), day, start, end)
+            for _, name, day, start, end in availability
+        ],
+        columns=TEACHER_COLUMNS
+    )
+    requirements.teachers = teachers_from_rows(rows) if len(rows) else []
+    return requirements
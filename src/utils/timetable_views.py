@@ -0,0 +1,117 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from src.models.period import Period
+from src.models.teacher import Teacher
+from src.utils.exporters import iter_periods
+from src.utils.helpers import interval_mask
+from src.config import WORKING_DAYS
+
+# Cell codes in the class grid; subjects are numbered from zero
+BREAK_CODE = -2
+ASSEMBLY_CODE = -3
+
+# Cell values in the free-teacher matrix
+FREE = 1
+BUSY = 0
+UNAVAILABLE = -1
+
+def timetable_frame(timetables: Dict[str, Dict[str, List[Period]]]) -> pd.DataFrame:
+    """Flatten class timetables into one row per period, breaks and assembly included.
+
+    Every dashboard view is a pivot of this frame, so it is built once per
+    result and shared between them.
+    """
+    day_index = {day: index for index, day in enumerate(WORKING_DAYS)}
+    frame = pd.DataFrame.from_records(
+        [
+            (class_name, day, day_index[day], p.start_minute, p.end_minute, p.subject, p.teacher or "",
+             "break" if p.is_break else "assembly" if p.is_assembly else "regular")
+            for class_name, day, p in iter_periods(timetables)
+        ],
+        columns=["class", "day", "day_index", "start_minute", "end_minute", "subject", "teacher", "kind"]
+    )
+    frame["time"] = _labels(frame["start_minute"]) + "-" + _labels(frame["end_minute"])
+    frame["slot"] = frame["day"].str[:3] + " " + _labels(frame["start_minute"])
+    return frame
+
+def _labels(minutes: pd.Series) -> pd.Series:
+    return (minutes // 60).astype(str).str.zfill(2) + ":" + (minutes % 60).astype(str).str.zfill(2)
+
+def _slot_columns(frame: pd.DataFrame) -> pd.DataFrame:
+    """Distinct (day, start) slots in week order with their labels."""
+    return (frame[["day_index", "start_minute", "end_minute", "slot"]]
+            .drop_duplicates(["day_index", "start_minute"])
+            .sort_values(["day_index", "start_minute"])
+            .reset_index(drop=True))
+
+def class_slot_grid(frame: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Return (codes, text) grids indexed by class with one column per weekly slot.
+
+    ``codes`` holds a subject number, BREAK_CODE or ASSEMBLY_CODE (NaN for an
+    empty cell) for colouring; ``text`` holds the subject and teacher.
+    """
+    codes = pd.Series(pd.factorize(frame["subject"], sort=True)[0], index=frame.index)
+    codes[frame["kind"] == "break"] = BREAK_CODE
+    codes[frame["kind"] == "assembly"] = ASSEMBLY_CODE
+    text = frame["subject"].where(frame["teacher"] == "", frame["subject"] + "<br>" + frame["teacher"])
+
+    cells = frame.assign(code=codes, text=text)
+    slots = _slot_columns(frame)["slot"]
+    classes = list(dict.fromkeys(frame["class"]))
+    code_grid = cells.pivot_table(index="class", columns="slot", values="code", aggfunc="first")
+    text_grid = cells.pivot_table(index="class", columns="slot", values="text", aggfunc="first")
+    return (code_grid.reindex(index=classes, columns=slots),
+            text_grid.reindex(index=classes, columns=slots).fillna(""))
+
+def class_week_table(frame: pd.DataFrame, class_name: str) -> pd.DataFrame:
+    """One class as a time × day table of "subject<br>teacher" cells."""
+    cells = frame[frame["class"] == class_name].sort_values("start_minute")
+    text = cells["subject"].where(cells["teacher"] == "", cells["subject"] + "<br>(" + cells["teacher"] + ")")
+    table = cells.assign(text=text).pivot_table(index="time", columns="day", values="text", aggfunc="first")
+    times = list(dict.fromkeys(cells["time"]))
+    return table.reindex(index=times, columns=WORKING_DAYS).fillna("")
+
+def teacher_load(frame: pd.DataFrame) -> pd.DataFrame:
+    """Teaching periods per teacher (rows) and day (columns)."""
+    teaching = frame[(frame["kind"] == "regular") & (frame["teacher"] != "")]
+    load = pd.crosstab(teaching["teacher"], teaching["day"])
+    return load.reindex(columns=WORKING_DAYS, fill_value=0).sort_index()
+
+def free_teacher_matrix(frame: pd.DataFrame, teachers: Optional[List[Teacher]] = None) -> pd.DataFrame:
+    """FREE, BUSY or UNAVAILABLE for every teacher (rows) in every weekly slot (columns).
+
+    A teacher is busy when any of their periods overlaps the slot, so classes
+    on differently aligned grids are compared by time rather than by label.
+    Without ``teachers`` nobody is marked unavailable; a booked period always
+    shows as BUSY.
+    """
+    slots = _slot_columns(frame[frame["kind"] == "regular"])
+    teaching = frame[(frame["kind"] == "regular") & (frame["teacher"] != "")]
+    names = list(dict.fromkeys([t.name for t in teachers or []] + sorted(teaching["teacher"].unique())))
+    row_of = {name: row for row, name in enumerate(names)}
+
+    busy = np.zeros((len(names), len(slots)), dtype=bool)
+    for day_index, day_slots in slots.groupby("day_index"):
+        periods = teaching[teaching["day_index"] == day_index]
+        overlap = (
+            (periods["start_minute"].to_numpy()[:, None] < day_slots["end_minute"].to_numpy()[None, :]) &
+            (periods["end_minute"].to_numpy()[:, None] > day_slots["start_minute"].to_numpy()[None, :])
+        )
+        hit_periods, hit_slots = np.nonzero(overlap)
+        rows = periods["teacher"].map(row_of).to_numpy()
+        busy[rows[hit_periods], day_slots.index.to_numpy()[hit_slots]] = True
+
+    matrix = np.where(busy, BUSY, FREE)
+    slot_masks = [
+        (day_index, interval_mask(int(start), int(end)))
+        for day_index, start, end in zip(slots["day_index"], slots["start_minute"], slots["end_minute"])
+    ]
+    for teacher in teachers or []:
+        row = row_of[teacher.name]
+        available = [teacher.availability_mask(day) for day in WORKING_DAYS]
+        for column, (day_index, wanted) in enumerate(slot_masks):
+            if not busy[row, column] and wanted & ~available[day_index]:
+                matrix[row, column] = UNAVAILABLE
+    return pd.DataFrame(matrix, index=names, columns=slots["slot"])
@@ -0,0 +1,74 @@
+import threading
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_wtf")
+
+import src.app as app_module
+from src.services.job_queue import JobQueue
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    (tmp_path / "teachers.csv").write_text("name,subjects,classes,day,start_time,end_time\n")
+    calls = []
+    def fake_generate(teacher_file, class_name, division, scope='class'):
+        calls.append((teacher_file, class_name, division, scope))
+        return f"timetable_{class_name}-{division}.xlsx", b"xlsx"
+    monkeypatch.setattr(app_module, "generate_workbook", fake_generate)
+    monkeypatch.setattr(app_module, "jobs", JobQueue(max_workers=1, max_pending=1))
+    monkeypatch.setitem(app_module.app.config, "UPLOAD_FOLDER", str(tmp_path))
+    monkeypatch.setitem(app_module.app.config, "WTF_CSRF_ENABLED", False)
+    app_module.app.config["TESTING"] = True
+    with app_module.app.test_client() as client:
+        client.calls = calls
+        yield client
+    app_module.jobs.shutdown()
+
+def wait_for(client, status_url):
+    for _ in range(200):
+        body = client.get(status_url).get_json()
+        if body["status"] in ("done", "failed"):
+            return body
+        threading.Event().wait(0.01)
+    raise AssertionError("job did not finish")
+
+def test_submit_poll_and_download(client, tmp_path):
+    response = client.post("/jobs", json={"teacher_file": "teachers.csv", "class_name": "1st", "division": "A"})
+    assert response.status_code == 202
+    body = wait_for(client, response.get_json()["status_url"])
+    assert body["status"] == "done"
+    assert client.calls == [(str(tmp_path / "teachers.csv"), "1st", "A", "class")]
+
+    result = client.get(body["result_url"])
+    assert result.status_code == 200
+    assert result.data == b"xlsx"
+    assert "timetable_1st-A.xlsx" in result.headers["Content-Disposition"]
+    assert client.get("/jobs/unknown").status_code == 404
+
+@pytest.mark.parametrize("data", [{}, {"teacher_file": "missing.csv"}, {"teacher_file": "../../etc/passwd"}])
+def test_submit_rejects_missing_or_outside_teacher_file(client, data):
+    response = client.post("/jobs", json=data)
+    assert response.status_code == 400
+    assert client.calls == []
+
+def test_submit_when_queue_is_full(client):
+    release = threading.Event()
+    app_module.jobs.submit(release.wait, 5)
+    app_module.jobs.submit(release.wait, 5)
+    response = client.post("/jobs", json={"teacher_file": "teachers.csv"})
+    assert response.status_code == 429
+    release.set()
+
+def test_form_redirects_to_status_page(client):
+    response = client.post("/", data={
+        "class_name": "1st", "division": "A", "scope": "class", "teacher_file": "teachers.csv"
+    })
+    assert response.status_code == 302
+    assert "/view" in response.headers["Location"]
+    job_id = response.headers["Location"].rstrip("/").split("/")[-2]
+    wait_for(client, f"/jobs/{job_id}")
+
+    page = client.get(response.headers["Location"])
+    assert page.status_code == 200
+    assert page.mimetype == "text/html"
+    assert f"/jobs/{job_id}/result".encode() in page.data
@@ -0,0 +1,14 @@
+from benchmarks.run_benchmarks import compare, run_case
+from benchmarks.workload import make_school
+
+def test_small_synthetic_school_runs_every_phase():
+    workload = make_school(divisions=1, teachers=8, seed=1)
+    assert workload.size["classes"] == 3
+    result = run_case(workload, repeat=1)
+    assert result["status"] == "ok"
+    assert set(result["seconds"]) == {"generate", "check", "export_xlsx", "export_csv"}
+
+def test_compare_flags_only_real_slowdowns():
+    baseline = {"cases": {"a": {"seconds": {"generate": 1.0, "check": 0.001}}}}
+    current = {"cases": {"a": {"seconds": {"generate": 1.5, "check": 0.003}}}}
+    assert compare(current, baseline, threshold=1.25) == ["a generate: 1.0000s -> 1.5000s (1.50x)"]
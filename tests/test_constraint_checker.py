@@ -0,0 +1,101 @@
+import random
+import pytest
+from datetime import time
+from src.models.period import Period
+from src.services.constraint_checker import ConstraintChecker, SchoolConstraintChecker, find_teacher_conflicts
+from src.services.incremental_checker import (
+    TEACHER_CONFLICTS, IncrementalConstraintChecker, SwapMove, ReassignTeacherMove, ChangeSubjectMove
+)
+from src.services.timetable_tensor import TimetableTensor
+from src.utils.helpers import minutes_to_time
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+def make_timetable(teacher, start=time(8, 15), end=time(8, 45)):
+    return {
+        day: [Period(start_time=start, end_time=end, subject="Mathematics", teacher=teacher)]
+        for day in DAYS
+    }
+
+@pytest.fixture
+def school_timetables():
+    return {
+        "1st-A": make_timetable("John Doe"),
+        "1st-B": make_timetable("John Doe", time(8, 30), time(9, 0)),
+        "1st-C": make_timetable("John Doe"),
+        "1st-D": make_timetable("Jane Smith"),
+    }
+
+def test_school_checker_reports_every_conflicting_class_pair(school_timetables):
+    conflicts = SchoolConstraintChecker(school_timetables).find_teacher_conflicts()
+
+    monday = {frozenset((c.class_a, c.class_b)) for c in conflicts if c.day == "Monday"}
+    assert monday == {
+        frozenset(("1st-A", "1st-B")),
+        frozenset(("1st-A", "1st-C")),
+        frozenset(("1st-B", "1st-C")),
+    }
+    assert all(c.teacher == "John Doe" for c in conflicts)
+    assert len(conflicts) == 3 * len(DAYS)
+
+def test_back_to_back_periods_do_not_conflict():
+    timetable = {
+        day: [
+            Period(start_time=time(8, 15), end_time=time(8, 45), subject="English", teacher="Jane Smith"),
+            Period(start_time=time(8, 45), end_time=time(9, 15), subject="English", teacher="Jane Smith"),
+        ]
+        for day in DAYS
+    }
+    assert ConstraintChecker(timetable).check_teacher_conflicts() == []
+
+@pytest.mark.parametrize("offset", [0, 15])
+def test_incremental_checker_matches_full_recheck(offset):
+    rng = random.Random(7)
+    subjects = ["Mathematics", "English", "Science", "Art"]
+    teachers = ["John Doe", "Jane Smith", "Amy Lee"]
+    timetables = {
+        class_name: {
+            day: [
+                Period(start_time=minutes_to_time(shift + 495 + 30 * i), end_time=minutes_to_time(shift + 525 + 30 * i),
+                       subject=rng.choice(subjects), teacher=rng.choice(teachers))
+                for i in range(6)
+            ]
+            for day in DAYS
+        }
+        # With an offset, 1st-C runs on a grid shifted against the others
+        for class_name, shift in [("1st-A", 0), ("1st-B", 0), ("1st-C", offset)]
+    }
+    checker = IncrementalConstraintChecker(timetables)
+
+    def full_count():
+        per_class = sum(
+            len(ConstraintChecker(t).check_period_count()) + len(ConstraintChecker(t).check_subject_distribution())
+            for t in timetables.values()
+        )
+        return per_class + len(find_teacher_conflicts(timetables))
+
+    assert checker.total_violations == full_count()
+    for _ in range(200):
+        class_name = rng.choice(list(timetables))
+        day, index = rng.choice(DAYS), rng.randrange(6)
+        move = rng.choice([
+            SwapMove(class_name, day, index, rng.choice(DAYS), rng.randrange(6)),
+            ReassignTeacherMove(class_name, day, index, rng.choice(teachers)),
+            ChangeSubjectMove(class_name, day, index, rng.choice(subjects)),
+        ])
+        before = checker.total_violations
+        predicted = sum(checker.evaluate(move).values())
+        assert checker.total_violations == before
+        applied = sum(checker.apply(move).values())
+        assert predicted == applied
+        assert checker.total_violations == full_count()
+
+def test_tensor_kernels_match_incremental_counts(school_timetables):
+    tensor = TimetableTensor.from_timetables(school_timetables)
+
+    assert tensor.subjects.shape == (4, len(DAYS), 2)
+    assert tensor.to_timetables() == school_timetables
+    # The 8:30 period of 1st-B sits in its own slot but still overlaps A and C
+    counts = tensor.violation_counts()
+    assert counts[TEACHER_CONFLICTS] == len(find_teacher_conflicts(school_timetables)) == 3 * len(DAYS)
+    assert counts == IncrementalConstraintChecker(school_timetables).violations
@@ -0,0 +1,49 @@
+import pytest
+from datetime import time
+from src.models.class_info import ClassInfo
+from src.models.teacher import Teacher
+from src.services.timetable_generator import TimetableGenerator
+
+@pytest.fixture
+def class_info():
+    return ClassInfo(
+        name="1st",
+        division="A",
+        start_time=time(8, 15),
+        end_time=time(14, 15),
+        breaks=None
+    )
+
+@pytest.fixture
+def tight_teachers():
+    # Only X can teach Science, and only in the two slots Mathematics also wants
+    return [
+        Teacher(name="X", subjects=["Mathematics", "Science"], classes=["1st"],
+                availability={"Monday": [(time(8, 15), time(9, 15))]}),
+        Teacher(name="Y", subjects=["Mathematics"], classes=["1st"],
+                availability={"Monday": [(time(9, 45), time(10, 15))]}),
+    ]
+
+def test_csp_engine_solves_instance_greedy_gives_up_on(class_info, tight_teachers):
+    greedy = TimetableGenerator(class_info, tight_teachers, {"Mathematics": 2, "Science": 1})
+    with pytest.raises(ValueError):
+        greedy.generate_timetable()
+
+    csp = TimetableGenerator(class_info, tight_teachers, {"Mathematics": 2, "Science": 1}, engine="csp")
+    timetable = csp.generate_timetable()
+
+    monday = [p for p in timetable["Monday"] if not (p.is_break or p.is_assembly)]
+    assert sorted(p.subject for p in monday) == ["Mathematics", "Mathematics", "Science"]
+    science = next(p for p in monday if p.subject == "Science")
+    assert science.teacher == "X"
+    assert csp.search_stats.nodes >= 3
+
+def test_csp_engine_reports_infeasible_instance(class_info, tight_teachers):
+    generator = TimetableGenerator(class_info, tight_teachers, {"Mathematics": 3, "Science": 1}, engine="csp")
+    with pytest.raises(ValueError, match="Could not distribute all required periods"):
+        generator.generate_timetable()
+    assert generator.search_stats is not None
+
+def test_unknown_engine_is_rejected(class_info, tight_teachers):
+    with pytest.raises(ValueError, match="Unknown engine"):
+        TimetableGenerator(class_info, tight_teachers, {"Mathematics": 1}, engine="magic")
@@ -0,0 +1,33 @@
+from datetime import time
+from src.models.class_info import ClassInfo
+from src.models.slot_grid import BREAK, ASSEMBLY
+from src.services.day_template import class_breaks, compile_day_template, day_grid_for
+from src.services.timetable_generator import TimetableGenerator
+
+def test_off_grid_break_starts_on_time_and_leaves_a_gap():
+    # 8:15 start with 30 minute periods; a 9:25 break does not line up
+    slots = compile_day_template(495, 14 * 60 + 15, ((565, 585), (765, 795)), 30)
+    starts = [(s.start, s.end, s.kind) for s in slots]
+    assert (525, 555, "regular") in starts
+    assert (565, 585, BREAK) in starts
+    assert not any(s.start < 565 < s.end for s in slots)
+    assert slots[-1].end <= 14 * 60 + 15
+
+def test_generator_honours_class_info_breaks_and_shares_templates():
+    classes = [ClassInfo(name="1st", division=d, start_time=time(8, 15), end_time=time(11, 15),
+                         breaks=[(time(9, 45), time(10, 0))]) for d in "AB"]
+    first, second = (TimetableGenerator(c, [], {}) for c in classes)
+    monday = first.day_grid("Monday")
+    assert [(s.start, s.end) for s in monday.fixed_slots] == [(585, 600)]
+    assert second.day_grid("Monday").slots is monday.slots
+    assert day_grid_for(classes[0], "Tuesday").slots == first.day_grid("Tuesday").slots
+    assert any(s.kind == ASSEMBLY for s in first.day_grid("Tuesday").slots)
+
+def test_empty_breaks_mean_no_breaks_and_none_the_configured_ones():
+    def info(breaks):
+        return ClassInfo(name="1st", division="A", start_time=time(8, 15), end_time=time(14, 15), breaks=breaks)
+    assert class_breaks(info(None)) == ((565, 585), (765, 795))
+    assert class_breaks(info([])) == ()
+    assert not info([]).is_break_time(time(9, 30)) and info(None).is_break_time(time(9, 30))
+    monday = TimetableGenerator(info([]), [], {}).day_grid("Monday")
+    assert not monday.fixed_slots
@@ -0,0 +1,44 @@
+from datetime import time
+from openpyxl import load_workbook
+from src.models.period import Period
+from src.services.excel_exporter import (
+    CLASS_HEADER, SUMMARY_HEADER, TEACHER_HEADER, export_school_workbook
+)
+
+def make_day(teacher):
+    return [
+        Period(time(8, 15), time(8, 45), "Mathematics", teacher),
+        Period(time(8, 45), time(9, 5), "Break", is_break=True),
+        Period(time(9, 5), time(9, 35), "English", "Jane Smith"),
+    ]
+
+def test_school_workbook_round_trip(tmp_path):
+    timetables = {
+        "1st-A": {"Monday": make_day("John Doe"), "Tuesday": make_day("John Doe")},
+        # "/" is not allowed in sheet names
+        "1st/B": {"Monday": [Period(time(9, 35), time(10, 5), "Art", "Amy Lee")]},
+    }
+    path = tmp_path / "school.xlsx"
+    export_school_workbook(timetables, str(path))
+
+    workbook = load_workbook(path, read_only=True)
+    assert workbook.sheetnames == [
+        "Summary", "1st-A", "1st_B", "Teacher - Amy Lee", "Teacher - Jane Smith", "Teacher - John Doe"
+    ]
+
+    def rows(name):
+        return [list(row) for row in workbook[name].iter_rows(values_only=True)]
+
+    class_rows = rows("1st-A")
+    assert class_rows[0] == CLASS_HEADER
+    assert class_rows[1:4] == [
+        ["Monday", "08:15 AM", "08:45 AM", "Mathematics", "John Doe"],
+        ["Monday", "08:45 AM", "09:05 AM", "Break", "N/A"],
+        ["Monday", "09:05 AM", "09:35 AM", "English", "Jane Smith"],
+    ]
+    assert len(class_rows) == 7
+
+    jane = rows("Teacher - Jane Smith")
+    assert jane[0] == TEACHER_HEADER
+    assert [row[0] for row in jane[1:]] == ["Monday", "Tuesday"]
+    assert rows("Summary")[:2] == [SUMMARY_HEADER, ["1st-A", "Class", 4, 2, 0, 2]]
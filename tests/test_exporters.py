@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+import pytest
+from datetime import date, time
+from src.models.period import Period
+from src.utils.exporters import CSV_COLUMNS, iter_csv, iter_ics_calendars, iter_jsonl, iter_teacher_ics
+
+MONDAY = date(2026, 10, 12)
+
+@pytest.fixture
+def timetables():
+    return {
+        "1st-A": {
+            "Monday": [
+                Period(time(8, 15), time(8, 45), "Mathematics", "John Doe"),
+                Period(time(8, 45), time(9, 5), "Break", is_break=True),
+            ],
+            "Wednesday": [Period(time(9, 5), time(9, 35), "Art, Craft; Design", "Jane Smith")],
+        },
+    }
+
+def test_csv_and_jsonl_round_trip(timetables):
+    rows = list(csv.reader(io.StringIO("".join(iter_csv(timetables)))))
+    assert rows == [
+        CSV_COLUMNS,
+        ["1st-A", "Monday", "08:15", "08:45", "Mathematics", "John Doe"],
+        ["1st-A", "Monday", "08:45", "09:05", "Break", ""],
+        ["1st-A", "Wednesday", "09:05", "09:35", "Art, Craft; Design", "Jane Smith"],
+    ]
+
+    records = [json.loads(line) for line in iter_jsonl(timetables)]
+    periods = [
+        Period(time.fromisoformat(r["start"]), time.fromisoformat(r["end"]), r["subject"], r["teacher"],
+               is_assembly=r["is_assembly"], is_break=r["is_break"])
+        for r in records
+    ]
+    assert periods == timetables["1st-A"]["Monday"] + timetables["1st-A"]["Wednesday"]
+
+def test_teacher_ics_events_escaping_and_folding(timetables):
+    calendars = {teacher: "".join(lines) for teacher, lines in iter_ics_calendars(timetables, MONDAY, weeks=10)}
+    assert sorted(calendars) == ["Jane Smith", "John Doe"]
+
+    john = calendars["John Doe"]
+    assert "DTSTART:20261012T081500\r\n" in john and "DTEND:20261012T084500\r\n" in john
+    assert "RRULE:FREQ=WEEKLY;COUNT=10\r\n" in john
+    assert john.count("BEGIN:VEVENT") == 1  # The break is not an event
+
+    jane = calendars["Jane Smith"]
+    assert "DTSTART:20261014T090500\r\n" in jane and "DTEND:20261014T093500\r\n" in jane
+    assert "SUMMARY:Art\\, Craft\\; Design (1st-A)\r\n" in jane
+
+    long_name = "Dr. " + "Bartholomew " * 8 + "Ng"
+    lines = "".join(iter_teacher_ics(long_name, [], MONDAY)).split("\r\n")
+    name_line = next(i for i, line in enumerate(lines) if line.startswith("X-WR-CALNAME:"))
+    assert all(len(line.encode()) <= 75 for line in lines)
+    assert lines[name_line + 1].startswith(" ")
+    unfolded = lines[name_line]
+    for line in lines[name_line + 1:]:
+        if not line.startswith(" "):
+            break
+        unfolded += line[1:]
+    assert unfolded == "X-WR-CALNAME:" + long_name
+
+def test_week_start_must_be_a_monday(timetables):
+    with pytest.raises(ValueError, match="must be a Monday"):
+        iter_ics_calendars(timetables, date(2026, 10, 14))
+    with pytest.raises(ValueError, match="must be a Monday"):
+        iter_teacher_ics("John Doe", [], date(2026, 10, 13))
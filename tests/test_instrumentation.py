@@ -0,0 +1,24 @@
+from datetime import time
+from src.models.class_info import ClassInfo
+from src.models.teacher import Teacher
+from src.services.constraint_checker import ConstraintChecker
+from src.services.instrumentation import SolverStats, PHASE, CANDIDATES_SCANNED, SLOTS_UNFILLED
+from src.services.timetable_generator import TimetableGenerator
+
+def test_stats_record_phases_counters_and_violations():
+    class_info = ClassInfo(name="1st", division="A", start_time=time(8, 15), end_time=time(14, 15), breaks=None)
+    mornings = {day: [(time(8, 15), time(11, 15))] for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]}
+    teachers = [Teacher(name="John Doe", subjects=["Mathematics", "English"], classes=["1st"], availability=mornings)]
+    events = []
+    stats = SolverStats(callback=lambda kind, name, value: events.append((kind, name)))
+
+    generator = TimetableGenerator(class_info, teachers, {"Mathematics": 10, "English": 10}, stats=stats)
+    timetable = generator.generate_timetable()
+    ConstraintChecker(timetable, stats=stats).check_all_constraints()
+
+    assert {"setup", "generate.Monday", "check.period_count"} <= set(stats.timings)
+    assert (PHASE, "generate.Friday") in events
+    assert stats.counters[CANDIDATES_SCANNED] > 0
+    # The teacher is only free in the mornings, so afternoon slots stay empty
+    assert stats.counters[f"{SLOTS_UNFILLED}.Monday"] > 0
+    assert stats.counters["violations.teacher_conflicts"] == 0
@@ -0,0 +1,28 @@
+import threading
+import pytest
+from src.services.job_queue import JobQueue, QueueFullError, DONE, FAILED
+
+def wait_for(queue, job):
+    for _ in range(200):
+        if queue.get(job.id).is_finished:
+            return queue.get(job.id)
+        threading.Event().wait(0.01)
+    raise AssertionError("job did not finish")
+
+def test_jobs_run_in_background_and_respect_limits():
+    queue = JobQueue(max_workers=1, max_pending=1)
+    release = threading.Event()
+    blocked = queue.submit(release.wait, 5)
+    waiting = queue.submit(lambda: b"xlsx")
+    with pytest.raises(QueueFullError):
+        queue.submit(lambda: None)
+
+    release.set()
+    assert wait_for(queue, blocked).status == DONE
+    assert wait_for(queue, waiting).result == b"xlsx"
+
+    def broken():
+        raise ValueError("infeasible")
+    failed = wait_for(queue, queue.submit(broken))
+    assert failed.status == FAILED and failed.error == "infeasible"
+    queue.shutdown()
@@ -0,0 +1,32 @@
+import multiprocessing
+from datetime import time
+from src.models.class_info import ClassInfo
+from src.models.teacher import Teacher
+from src.services.portfolio import solve_portfolio
+from src.services.timetable_generator import TimetableGenerator
+
+def test_portfolio_returns_reproducible_seed():
+    class_info = ClassInfo(name="1st", division="A", start_time=time(8, 15), end_time=time(14, 15), breaks=None)
+    full_day = {day: [(time(8, 15), time(14, 15))] for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]}
+    teachers = [
+        Teacher(name="John Doe", subjects=["Mathematics", "Science"], classes=["1st"], availability=dict(full_day)),
+        Teacher(name="Jane Smith", subjects=["English", "Mathematics"], classes=["1st"], availability=dict(full_day)),
+    ]
+    distribution = {"Mathematics": 6, "Science": 4, "English": 6}
+
+    result = solve_portfolio(class_info, teachers, distribution, seeds=range(4), max_workers=2)
+
+    assert result.seed in range(4)
+    assert 1 <= result.attempts <= 4
+    replay = TimetableGenerator(class_info, teachers, distribution, seed=result.seed).generate_timetable()
+    assert replay == result.timetable
+
+def test_portfolio_stops_running_workers_after_a_winner():
+    class_info = ClassInfo(name="1st", division="A", start_time=time(8, 15), end_time=time(14, 15), breaks=None)
+    full_day = {day: [(time(8, 15), time(14, 15))] for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]}
+    teachers = [Teacher(name="John Doe", subjects=["Mathematics", "English"], classes=["1st"],
+                        availability=dict(full_day))]
+
+    solve_portfolio(class_info, teachers, {"Mathematics": 6, "English": 6}, seeds=range(8), max_workers=2)
+
+    assert multiprocessing.active_children() == []
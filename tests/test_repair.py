@@ -0,0 +1,57 @@
+from datetime import time
+from src.models.class_info import ClassInfo
+from src.models.teacher import Teacher
+from src.services.repair import TimetableRepair
+from src.services.school_timetable_generator import SchoolTimetableGenerator
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+def make_school():
+    classes = [ClassInfo(name="1st", division=d, start_time=time(8, 15), end_time=time(11, 15), breaks=None)
+               for d in ("A", "B")]
+    full_day = {day: [(time(8, 15), time(14, 15))] for day in DAYS}
+    teachers = [
+        Teacher(name="John Doe", subjects=["Mathematics"], classes=["1st"], availability=dict(full_day)),
+        Teacher(name="Mary Major", subjects=["Mathematics"], classes=["1st"], availability=dict(full_day)),
+        Teacher(name="Jane Smith", subjects=["English"], classes=["1st"], availability=dict(full_day)),
+        Teacher(name="Ann Lee", subjects=["English"], classes=["1st"], availability=dict(full_day)),
+        # Never needed by the generator, so free to substitute
+        Teacher(name="Sam Roe", subjects=["Mathematics"], classes=["1st"], availability=dict(full_day)),
+    ]
+    school = SchoolTimetableGenerator(classes, teachers, {"1st": {"Mathematics": 11, "English": 11}})
+    school.generate_timetable()
+    return school, teachers
+
+def test_sick_teacher_is_substituted_and_nothing_else_moves():
+    school, teachers = make_school()
+    before = {name: {day: list(t[day]) for day in DAYS} for name, t in school.timetables.items()}
+    teachers[0].availability["Monday"] = []
+
+    result = school.repair()
+
+    affected = [(c, p) for c, t in before.items() for p in t["Monday"] if p.teacher == "John Doe"]
+    assert affected and len(result.changes) == len(affected) and not result.unresolved
+    for change in result.changes:
+        assert change.after.teacher == "Sam Roe" and change.after.subject == change.before.subject
+    for name, timetable in result.timetables.items():
+        for day in DAYS:
+            kept = [p for p in before[name][day] if not (day == "Monday" and p.teacher == "John Doe")]
+            assert all(p in timetable[day] for p in kept)
+    assert school.occupancy.is_free("John Doe", "Monday", 0, 24 * 60)
+
+def test_swap_when_no_substitute_is_free():
+    school, teachers = make_school()
+    timetables = {"1st-A": school.timetables["1st-A"]}
+    first = timetables["1st-A"]["Monday"][0]
+    # Only the first slot is lost, and no other teacher of that subject is left
+    teacher = next(t for t in teachers if t.name == first.teacher)
+    teacher.availability["Monday"] = [(time(8, 45), time(14, 15))]
+    staff = [t for t in teachers if t.name == teacher.name or first.subject not in t.subjects]
+
+    result = TimetableRepair(timetables, staff).repair()
+
+    assert len(result.changes) == 2 and not result.unresolved
+    moved_in, moved_out = result.changes[0].after, result.changes[1].after
+    assert moved_in.start_minute == first.start_minute and moved_in.subject != first.subject
+    assert moved_out.subject == first.subject and moved_out.teacher == first.teacher
+    assert timetables["1st-A"]["Monday"][0] is first  # Input left untouched
@@ -0,0 +1,39 @@
+from datetime import time
+import pytest
+from src.utils.requirements_parser import parse_requirements
+
+PAGES = [
+    "School Timetable Requirements\n"
+    "Teachers:\n"
+    "Name | Subjects | Classes\n"
+    "John Doe | Mathematics, Science | 1st\n"
+    "Jane Smith | English | Jr.Kg, 1st\n",
+    "Availability\n"
+    "Name\tDay\tTime\n"
+    "John Doe\tMonday\t8:15 AM - 2:15 PM\n"
+    "Jane Smith    Tuesday    08:15    12:00\n"
+    "Classes\n"
+    "1st | A, B | 8:15 AM | 2:15 PM | 9:25-9:45, 12:45-13:15\n"
+    "Subject Distribution\n"
+    "1st | Mathematics | 6\n",
+]
+
+def test_parse_requirements_across_pages():
+    requirements = parse_requirements(iter(PAGES))
+    john, jane = requirements.teachers
+    assert john.subjects == ["Mathematics", "Science"]
+    assert john.availability["Monday"] == [[time(8, 15), time(14, 15)]]
+    assert jane.classes == ["Jr.Kg", "1st"] and jane.is_available("Tuesday", time(9, 0), time(9, 30))
+    assert [c.class_name for c in requirements.classes] == ["1st-A", "1st-B"]
+    assert requirements.classes[0].breaks[1] == (time(12, 45), time(13, 15))
+    assert requirements.subject_distributions == {"1st": {"Mathematics": 6}}
+
+def test_parse_requirements_reports_bad_rows():
+    pages = ["Teachers\nJohn Doe | Mathematics\nJane Smith | English | 1st\n"
+             "Subject Distribution\n1st | English | many\n"]
+    with pytest.raises(ValueError) as error:
+        parse_requirements(pages)
+    message = str(error.value)
+    assert "line 2 (teachers)" in message
+    assert "line 5 (distribution)" in message
+    assert "teacher 'Jane Smith' has no availability" in message
@@ -0,0 +1,81 @@
+import pytest
+from datetime import time
+from src.models.class_info import ClassInfo
+from src.models.teacher import Teacher
+from src.services.school_timetable_generator import SchoolTimetableGenerator
+
+FULL_DAY = {
+    day: [(time(8, 15), time(14, 15))]
+    for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+}
+
+@pytest.fixture
+def school_classes():
+    return [
+        ClassInfo(
+            name="1st",
+            division=division,
+            start_time=time(8, 15),
+            end_time=time(14, 15),
+            breaks=[(time(9, 25), time(9, 45)), (time(12, 45), time(13, 15))]
+        )
+        for division in ["A", "B", "C"]
+    ]
+
+@pytest.fixture
+def school_teachers():
+    return [
+        Teacher(name="John Doe", subjects=["Mathematics", "Science"], classes=["1st"],
+                availability=dict(FULL_DAY)),
+        Teacher(name="Jane Smith", subjects=["English", "Social Studies"], classes=["1st"],
+                availability=dict(FULL_DAY)),
+        Teacher(name="Amy Lee", subjects=["Mathematics", "English"], classes=["1st"],
+                availability=dict(FULL_DAY)),
+    ]
+
+def test_school_generation_has_no_teacher_double_booking(school_classes, school_teachers):
+    generator = SchoolTimetableGenerator(
+        classes=school_classes,
+        teachers=school_teachers,
+        subject_distributions={"1st": {"Mathematics": 6, "Science": 4, "English": 6, "Social Studies": 4}}
+    )
+
+    timetables = generator.generate_timetable()
+    assert set(timetables) == {"1st-A", "1st-B", "1st-C"}
+
+    booked = set()
+    for timetable in timetables.values():
+        for day, periods in timetable.items():
+            for period in periods:
+                if period.teacher:
+                    key = (period.teacher, day, period.start_time)
+                    assert key not in booked, f"{key} is double-booked"
+                    booked.add(key)
+
+def test_school_generation_skips_teachers_of_other_classes(school_classes, school_teachers):
+    school_teachers.append(
+        Teacher(name="Kim Park", subjects=["Mathematics"], classes=["Jr.Kg"],
+                availability=dict(FULL_DAY))
+    )
+    generator = SchoolTimetableGenerator(
+        classes=school_classes,
+        teachers=school_teachers,
+        subject_distributions={"1st": {"Mathematics": 6, "English": 6}}
+    )
+
+    for timetable in generator.generate_timetable().values():
+        for periods in timetable.values():
+            assert all(period.teacher != "Kim Park" for period in periods)
+
+def test_iter_generate_yields_each_class_when_done(school_classes, school_teachers):
+    generator = SchoolTimetableGenerator(
+        classes=school_classes,
+        teachers=school_teachers,
+        subject_distributions={"1st": {"Mathematics": 6, "English": 6}}
+    )
+
+    seen = []
+    for class_name, timetable in generator.iter_generate():
+        assert generator.timetables[class_name] is timetable
+        seen.append(class_name)
+    assert seen == ["1st-A", "1st-B", "1st-C"]
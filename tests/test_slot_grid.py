@@ -0,0 +1,29 @@
+from datetime import time
+from src.models.slot_grid import ASSEMBLY, BREAK, REGULAR, DayGrid, Slot
+from src.services.day_template import compile_day_template
+
+DAY_START, DAY_END = 8 * 60 + 15, 11 * 60 + 15
+
+def test_slot_to_period():
+    assert Slot(0, 495, 525).to_period("Art", "Alex Wu").end_time == time(8, 45)
+    brk = Slot(1, 525, 545, BREAK).to_period("ignored", "ignored")
+    assert brk.is_break and brk.subject == "Break" and brk.start_time == time(8, 45)
+    assembly = Slot(2, 545, 575, ASSEMBLY).to_period()
+    assert assembly.is_assembly and assembly.subject == "Assembly" and not assembly.is_break
+
+def test_slots_meet_breaks_and_assembly_exactly():
+    # 9:15-9:45 break on the grid; assembly at 10:15
+    grid = DayGrid("Tuesday", compile_day_template(DAY_START, DAY_END, ((555, 585),), 30, 615))
+    spans = [(s.start, s.end, s.kind) for s in grid.slots]
+    assert spans == [
+        (495, 525, REGULAR), (525, 555, REGULAR), (555, 585, BREAK),
+        (585, 615, REGULAR), (615, 645, ASSEMBLY), (645, 675, REGULAR),
+    ]
+    assert [s.start for s in grid.open_slots] == [495, 525, 585, 645]
+    assert [s.kind for s in grid.fixed_slots] == [BREAK, ASSEMBLY]
+    assert all(s.index == i for i, s in enumerate(grid.slots))
+
+def test_block_overlapping_the_end_of_day_is_cut():
+    slots = compile_day_template(DAY_START, DAY_END, ((660, 690),), 30)
+    assert slots[-1].end == DAY_END and slots[-1].kind == BREAK
+    assert slots[-2].end == 645  # 645-660 is too short for a period and stays a gap
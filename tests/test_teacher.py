@@ -0,0 +1,59 @@
+import pickle
+from dataclasses import asdict, replace
+from datetime import time
+from src.models.teacher import Teacher
+from src.services.repair import TimetableRepair
+
+def make_teacher(availability):
+    return Teacher(name="John Doe", subjects=["Mathematics"], classes=["1st"], availability=availability)
+
+def test_adjacent_windows_merge():
+    teacher = make_teacher({"Monday": [("8:15", "9:00"), (time(9, 0), time(10, 0))]})
+    assert teacher.availability["Monday"] == [[time(8, 15), time(9, 0)], [time(9, 0), time(10, 0)]]
+    assert teacher.is_available("Monday", time(8, 45), time(9, 15))
+    assert teacher.is_available("Monday", time(8, 15), time(10, 0))
+
+def test_interval_crossing_a_window_edge_is_unavailable():
+    teacher = make_teacher({"Monday": [(time(8, 15), time(9, 0)), (time(9, 30), time(10, 0))]})
+    assert teacher.is_available("Monday", time(8, 30), time(9, 0))
+    assert not teacher.is_available("Monday", time(8, 45), time(9, 15))  # Runs past the end
+    assert not teacher.is_available("Monday", time(9, 15), time(9, 45))  # Starts before the next window
+    assert not teacher.is_available("Monday", time(8, 0), time(8, 30))
+
+def test_days_without_availability():
+    teacher = make_teacher({"Monday": [(time(8, 15), time(9, 0))], "Tuesday": []})
+    assert not teacher.is_available("Tuesday", time(8, 15), time(8, 45))
+    assert not teacher.is_available("Wednesday", time(8, 15), time(8, 45))
+    assert teacher.availability_mask("Wednesday") == 0
+
+def test_edits_are_seen_after_compiling():
+    teacher = make_teacher({"Monday": [(time(8, 15), time(9, 0))]})
+    assert teacher.is_available("Monday", time(8, 15), time(8, 45))
+
+    teacher.availability["Monday"][0][1] = "8:30"
+    teacher.availability["Tuesday"] = [("8:15", "9:00")]
+    teacher.compile_availability()
+    assert not teacher.is_available("Monday", time(8, 15), time(8, 45))
+    assert teacher.is_available("Tuesday", time(8, 15), time(8, 45))
+
+    # Repair and the generator compile the teachers they are given
+    teacher.availability = {"Friday": [(time(8, 15), time(9, 0))]}
+    TimetableRepair({}, [teacher])
+    assert not teacher.is_available("Tuesday", time(8, 15), time(8, 45))
+    assert teacher.is_available("Friday", time(8, 15), time(8, 45))
+
+    copy = pickle.loads(pickle.dumps(teacher))
+    assert copy == teacher
+    assert copy.is_available("Friday", time(8, 15), time(8, 45))
+
+def test_asdict_and_replace_round_trip():
+    teacher = make_teacher({"Monday": [("8:15", "9:00")]})
+    data = asdict(teacher)
+    assert data == {"name": "John Doe", "subjects": ["Mathematics"], "classes": ["1st"],
+                    "availability": {"Monday": [[time(8, 15), time(9, 0)]]}}
+    assert Teacher(**data) == teacher
+
+    moved = replace(teacher, availability={"Tuesday": [[time(8, 15), time(9, 0)]]})
+    assert moved.is_available("Tuesday", time(8, 15), time(8, 45))
+    assert not moved.is_available("Monday", time(8, 15), time(8, 45))
+    assert teacher.is_available("Monday", time(8, 15), time(8, 45))
@@ -0,0 +1,44 @@
+from datetime import time
+import json
+import pytest
+from src.utils.helpers import load_teacher_data, parse_times
+import pandas as pd
+
+def test_parse_times_matches_scalar_formats():
+    values = pd.Series(["8:15 AM", "12:45 PM", "14:30", "0815", "9 AM", time(10, 0), "13:00 PM", "bad"])
+    assert parse_times(values).tolist() == [495, 765, 870, 495, 540, 600, -1, -1]
+
+def test_load_teacher_data_from_csv_and_json(tmp_path):
+    csv_path = tmp_path / "teachers.csv"
+    csv_path.write_text(
+        "Name,Subjects,Classes,Day,Start Time,End Time\n"
+        "John Doe,\"Mathematics, Science\",1st,Monday,8:15 AM,12:00 PM\n"
+        "John Doe,English,1st,Monday,13:00,14:15\n"
+        "Jane Smith,English,\"Jr.Kg, 1st\",tuesday,0815,1415\n"
+    )
+    john, jane = load_teacher_data(str(csv_path))
+    assert john.subjects == ["Mathematics", "Science", "English"]
+    assert john.availability["Monday"] == [[time(8, 15), time(12, 0)], [time(13, 0), time(14, 15)]]
+    assert jane.classes == ["Jr.Kg", "1st"] and jane.is_available("Tuesday", time(9, 0), time(9, 30))
+
+    json_path = tmp_path / "teachers.json"
+    json_path.write_text(json.dumps([{
+        "name": "Jane Smith", "subjects": ["English"], "classes": ["1st"],
+        "availability": {"Tuesday": [["8:15 AM", "2:15 PM"]]}
+    }]))
+    assert load_teacher_data(str(json_path))[0].availability == jane.availability
+
+def test_load_teacher_data_reports_every_bad_row(tmp_path):
+    path = tmp_path / "teachers.csv"
+    path.write_text(
+        "name,subjects,classes,day,start_time,end_time\n"
+        "John Doe,English,1st,Monday,25:00,12:00\n"
+        "John Doe,English,1st,Sunday,8:15,12:00\n"
+        "John Doe,English,1st,Monday,8:15,8:00\n"
+    )
+    with pytest.raises(ValueError) as error:
+        load_teacher_data(str(path))
+    message = str(error.value)
+    assert "row 1: invalid start time" in message
+    assert "row 2: unknown day" in message
+    assert "row 3: end time not after start time" in message
@@ -0,0 +1,82 @@
+import pytest
+from datetime import time
+from src.models.class_info import ClassInfo
+from src.models.teacher import Teacher
+from src.services.constraint_checker import SchoolConstraintChecker, find_teacher_conflicts
+from src.services.incremental_checker import IncrementalConstraintChecker, PERIOD_COUNT, SUBJECT_DISTRIBUTION
+from src.services.school_timetable_generator import SchoolTimetableGenerator
+from src.services.term_scheduler import EXAM_SUBJECT, TermScheduler, WeekVariant
+from src.services.timetable_tensor import TimetableTensor
+
+FULL_DAY = {
+    day: [(time(8, 15), time(14, 15))]
+    for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+}
+
+@pytest.fixture
+def school():
+    classes = [
+        ClassInfo(
+            name="1st",
+            division=division,
+            start_time=time(8, 15),
+            end_time=time(14, 15),
+            breaks=[(time(9, 25), time(9, 45)), (time(12, 45), time(13, 15))]
+        )
+        for division in ["A", "B"]
+    ]
+    teachers = [
+        Teacher(name="John Doe", subjects=["Mathematics"], classes=["1st"], availability=dict(FULL_DAY)),
+        Teacher(name="Jane Smith", subjects=["English"], classes=["1st"], availability=dict(FULL_DAY)),
+        Teacher(name="Pat Cole", subjects=["Physical Education"], classes=["1st"], availability=dict(FULL_DAY)),
+        Teacher(name="Alex Wu", subjects=["Art"], classes=["1st"], availability=dict(FULL_DAY)),
+        Teacher(name="Lee Hart", subjects=["Art"], classes=["1st"], availability=dict(FULL_DAY)),
+    ]
+    return SchoolTimetableGenerator(
+        classes, teachers, {"1st": {"Mathematics": 6, "English": 6, "Physical Education": 4}}
+    )
+
+def test_variant_weeks_store_only_changed_days(school):
+    art_week = WeekVariant(swaps={"Physical Education": "Art"})
+    exams = WeekVariant(holidays=["Friday"], exam_days=["Monday"], classes=["1st-A"])
+    term = TermScheduler(school).schedule([None, art_week, exams] * 10 + [art_week])
+
+    assert len(term) == 31
+    assert term.deltas[1] is term.deltas[4]  # Same variant solved once
+    assert term.changed_days(0) == []
+    assert term.changed_days(2) == [("1st-A", "Monday"), ("1st-A", "Friday")]
+
+    exam_week = term.week(2)
+    assert exam_week["1st-A"]["Friday"] == []
+    assert {p.subject for p in exam_week["1st-A"]["Monday"] if not (p.is_break or p.is_assembly)} == {EXAM_SUBJECT}
+    assert exam_week["1st-B"]["Monday"] is term.base["1st-B"]["Monday"]
+
+    changed = {day for _, day in term.changed_days(1)}
+    assert changed == {day for t in term.base.values() for day, periods in t.items()
+                       if any(p.subject == "Physical Education" for p in periods)}
+
+def test_swapped_subjects_get_free_qualified_teachers(school):
+    term = TermScheduler(school).schedule([WeekVariant(swaps={"Physical Education": "Art"})])
+    week = term.week(0)
+
+    assert not term.deltas[0].unresolved
+    taught = [p for t in week.values() for periods in t.values() for p in periods if p.teacher]
+    assert all(p.subject != "Physical Education" for p in taught)
+    assert {p.teacher for p in taught if p.subject == "Art"} <= {"Alex Wu", "Lee Hart"}
+    assert find_teacher_conflicts(week) == []
+
+def test_exam_days_add_no_constraint_violations(school):
+    term = TermScheduler(school).schedule([WeekVariant(exam_days=["Monday", "Tuesday"])])
+    exam_week = term.week(0)
+    base_violations = SchoolConstraintChecker(term.base).check_all_constraints()
+    exam_violations = SchoolConstraintChecker(exam_week).check_all_constraints()
+
+    # Exams fill 40% of the week, above the 30% cap a taught subject would have
+    assert not any(EXAM_SUBJECT in v for v in exam_violations)
+    assert set(exam_violations) <= set(base_violations)
+    counts = IncrementalConstraintChecker(exam_week).violations
+    assert counts[SUBJECT_DISTRIBUTION] == sum("Subject" in v for v in exam_violations) == 0
+    assert counts[PERIOD_COUNT] == sum("periods" in v for v in exam_violations)
+    tensor = TimetableTensor.from_timetables(exam_week)
+    assert tensor.violation_counts() == counts
+    assert tensor.to_timetables() == exam_week
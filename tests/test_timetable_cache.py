@@ -0,0 +1,49 @@
+from datetime import time
+import pytest
+from src import config
+from src.models.class_info import ClassInfo
+from src.models.teacher import Teacher
+from src.services.timetable_cache import TimetableCache, cache_key, cached_generate
+
+@pytest.fixture
+def inputs():
+    class_info = ClassInfo(name="1st", division="A", start_time=time(8, 15), end_time=time(14, 15), breaks=None)
+    full_day = {day: [(time(8, 15), time(14, 15))] for day in config.WORKING_DAYS}
+    teachers = [
+        Teacher(name="John Doe", subjects=["Mathematics", "Science"], classes=["1st"], availability=dict(full_day)),
+        Teacher(name="Jane Smith", subjects=["English", "Mathematics"], classes=["1st"], availability=dict(full_day)),
+    ]
+    return class_info, teachers, {"Mathematics": 6, "Science": 4, "English": 6}
+
+def test_cache_key_covers_inputs_and_config(inputs, monkeypatch):
+    class_info, teachers, distribution = inputs
+    key = cache_key(class_info, teachers, distribution)
+    assert key == cache_key(class_info, teachers, dict(distribution))
+    assert key != cache_key(class_info, teachers, dict(reversed(list(distribution.items()))))
+    assert key != cache_key(class_info, teachers[::-1], distribution)
+    assert key != cache_key(class_info, teachers, distribution, seed=1)
+    monkeypatch.setattr(config, "MAX_PERIODS_PER_DAY", 9)
+    assert key != cache_key(class_info, teachers, distribution)
+
+def test_disk_tier_survives_new_instance_and_evicts(inputs, tmp_path):
+    cache = TimetableCache(directory=str(tmp_path), max_memory_entries=1)
+    key, timetable = cached_generate(cache, *inputs)
+    assert cached_generate(cache, *inputs)[1] is timetable
+    cache.put_artifact(key, "xlsx", b"workbook")
+
+    reopened = TimetableCache(directory=str(tmp_path))
+    assert reopened.get(key) == timetable
+    assert reopened.get_artifact(key, "xlsx") == b"workbook"
+
+    small = TimetableCache(directory=str(tmp_path), max_disk_bytes=0)
+    small.put_artifact("other", "xlsx", b"x")
+    assert list(tmp_path.iterdir()) == []
+
+def test_reordered_distribution_with_a_seed_misses_the_cache(inputs):
+    class_info, teachers, distribution = inputs
+    cache = TimetableCache()
+    reordered = dict(reversed(list(distribution.items())))
+    first_key, _ = cached_generate(cache, class_info, teachers, distribution, seed=1)
+    second_key, _ = cached_generate(cache, class_info, teachers, reordered, seed=1)
+    assert first_key != second_key
+    assert (cache.hits, cache.misses) == (0, 2)
@@ -87,14 +87,16 @@ def test_period_creation(sample_class_info, sample_teachers, subject_distributio
         subject_distribution=subject_distribution
     )
     
-    # Test regular period creation
-    period = generator._create_regular_period(time(8, 15), "Monday")
-    assert period is not None
+    # Fill the first open slot of the day grid, as the generator does
+    slot = generator.day_grid("Monday").open_slots[0]
+    subject, teacher = generator._fill_slot("Monday", slot.start, slot.end)
+    period = slot.to_period(subject, teacher.name)
     assert isinstance(period, Period)
     assert period.start_time == time(8, 15)
     assert period.end_time == time(8, 45)
     assert period.teacher in [t.name for t in sample_teachers]
     assert period.subject in subject_distribution.keys()
+    assert not generator.occupancy.is_free(teacher.name, "Monday", slot.start, slot.end)
 
 def test_class_info_methods(sample_class_info):
     # Test class name formatting
@@ -104,3 +106,19 @@ def test_class_info_methods(sample_class_info):
     assert sample_class_info.is_break_time(time(9, 30))  # During first break
     assert sample_class_info.is_break_time(time(13, 0))  # During lunch break
     assert not sample_class_info.is_break_time(time(10, 0))  # Not during break
+
+def test_iter_generate_stops_early_when_demand_cannot_fit(sample_class_info, sample_teachers):
+    # Only John Doe teaches Science, and only on Monday
+    sample_teachers[0].availability = {"Monday": [(time(8, 15), time(14, 15))]}
+    generator = TimetableGenerator(
+        class_info=sample_class_info,
+        teachers=sample_teachers,
+        subject_distribution={"Science": 12, "English": 6}
+    )
+    
+    days = []
+    with pytest.raises(ValueError, match="Science needs"):
+        for day, periods in generator.iter_generate():
+            assert periods
+            days.append(day)
+    assert days == []
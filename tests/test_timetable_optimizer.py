@@ -0,0 +1,44 @@
+from collections import Counter
+from datetime import time
+from src.models.class_info import ClassInfo
+from src.models.teacher import Teacher
+from src.services.constraint_checker import SchoolConstraintChecker
+from src.services.school_timetable_generator import SchoolTimetableGenerator
+from src.services.timetable_optimizer import TimetableOptimizer
+
+FULL_DAY = {
+    day: [(time(8, 15), time(14, 15))]
+    for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+}
+
+def subject_counts(timetable):
+    return Counter(
+        p.subject for periods in timetable.values() for p in periods
+        if not (p.is_break or p.is_assembly)
+    )
+
+def test_optimizer_improves_score_and_keeps_hard_constraints():
+    generator = SchoolTimetableGenerator(
+        classes=[
+            ClassInfo(name="1st", division=d, start_time=time(8, 15), end_time=time(14, 15), breaks=None)
+            for d in ["A", "B"]
+        ],
+        teachers=[
+            Teacher(name="John Doe", subjects=["Mathematics", "Science"], classes=["1st"],
+                    availability=dict(FULL_DAY)),
+            Teacher(name="Jane Smith", subjects=["English", "Social Studies"], classes=["1st"],
+                    availability=dict(FULL_DAY)),
+        ],
+        subject_distributions={"1st": {"Mathematics": 6, "Science": 4, "English": 6, "Social Studies": 4}}
+    )
+    timetables = generator.generate_timetable()
+
+    optimizer = TimetableOptimizer.from_generators(generator.generators, seed=3)
+    start_score = optimizer.score
+    optimized = optimizer.optimize(time_budget=0.2)
+
+    assert optimizer.best_score <= start_score
+    assert optimizer.total_score() == optimizer.best_score
+    assert SchoolConstraintChecker(optimized).find_teacher_conflicts() == []
+    for class_name, timetable in optimized.items():
+        assert subject_counts(timetable) == subject_counts(timetables[class_name])
@@ -0,0 +1,95 @@
+import pytest
+from dataclasses import replace
+from datetime import time
+from src.models.period import Period
+from src.models.teacher import Teacher
+from src.services.timetable_query import TimetableQuery
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+@pytest.fixture
+def timetables():
+    def day(first, second):
+        return [
+            Period(time(8, 15), time(8, 45), *first),
+            Period(time(9, 25), time(9, 45), "Break", is_break=True),
+            Period(time(13, 15), time(13, 45), *second),
+        ]
+    return {
+        "1st-A": {d: day(("Mathematics", "John Doe"), ("English", "Jane Smith")) for d in DAYS},
+        "1st-B": {d: day(("English", "Jane Smith"), ("Mathematics", "John Doe")) for d in DAYS},
+    }
+
+@pytest.fixture
+def teachers():
+    full_day = {d: [(time(8, 15), time(14, 15))] for d in DAYS}
+    return [
+        Teacher(name="John Doe", subjects=["Mathematics"], classes=["1st"], availability=dict(full_day)),
+        Teacher(name="Jane Smith", subjects=["English"], classes=["1st"], availability=dict(full_day)),
+        Teacher(name="Sam Roe", subjects=["Mathematics"], classes=["1st"],
+                availability={"Tuesday": [(time(8, 15), time(10, 15))]}),
+    ]
+
+def test_lookups(timetables, teachers):
+    query = TimetableQuery(timetables, teachers)
+
+    class_name, period = query.teacher_location("Jane Smith", "Tuesday", time(8, 30))
+    assert class_name == "1st-B" and period.subject == "English"
+    assert query.teacher_location("Jane Smith", "Tuesday", time(8, 45)) is None
+
+    assert query.free_teachers("Tuesday", time(8, 30)) == ["Sam Roe"]
+    assert query.free_teachers("Tuesday", time(10, 0)) == ["Jane Smith", "John Doe", "Sam Roe"]
+    assert query.free_teachers("Tuesday", time(10, 0), until=time(10, 30)) == ["Jane Smith", "John Doe"]
+    assert query.free_teachers("Monday", time(8, 30)) == []
+
+    after_lunch = query.subject_occurrences("Mathematics", after=time(13, 15))
+    assert [(c, d) for c, d, _ in after_lunch] == [("1st-B", d) for d in DAYS]
+    assert len(query.subject_occurrences("Mathematics", day="Friday")) == 2
+
+def test_update_keeps_indexes_in_sync(timetables, teachers):
+    query = TimetableQuery(timetables, teachers)
+    before = timetables["1st-A"]["Tuesday"][0]
+    after = replace(before, teacher="Sam Roe")
+    timetables["1st-A"]["Tuesday"][0] = after
+    query.update("1st-A", "Tuesday", before, after)
+
+    assert query.teacher_location("Sam Roe", "Tuesday", time(8, 30)) == ("1st-A", after)
+    assert query.teacher_location("John Doe", "Tuesday", time(8, 30)) is None
+    assert query.free_teachers("Tuesday", time(8, 30)) == ["John Doe"]
+
+    query.update("1st-A", "Tuesday", after, None)
+    assert query.free_teachers("Tuesday", time(8, 30)) == ["John Doe", "Sam Roe"]
+    assert [c for c, _, _ in query.subject_occurrences("Mathematics", day="Tuesday")] == ["1st-B"]
+
+def test_update_rejects_periods_that_are_not_indexed(timetables):
+    timetables["1st-A"]["Monday"].insert(1, Period(time(9, 0), time(9, 20), "Mathematics", "John Doe"))
+    query = TimetableQuery(timetables)
+    missing = Period(time(8, 50), time(9, 20), "Mathematics", "John Doe")
+    other_teacher = replace(missing, start_time=time(9, 0), teacher="Sam Roe")
+    for period in (missing, replace(missing, subject="Chess"), other_teacher):
+        with pytest.raises(ValueError):
+            query.update("1st-A", "Monday", period, None)
+    with pytest.raises(ValueError):
+        query.update("1st-A", "Sunday", timetables["1st-A"]["Monday"][0], None)
+
+    assert query.teacher_location("John Doe", "Monday", time(9, 10))[1].start_time == time(9, 0)
+    assert len(query.subject_occurrences("Mathematics", day="Monday")) == 3
+
+def test_update_a_period_shared_by_two_classes(timetables):
+    # One combined lesson taught to both divisions at once
+    shared = Period(time(10, 15), time(10, 45), "Art", "Amy Lee")
+    for class_name in ("1st-A", "1st-B"):
+        timetables[class_name]["Wednesday"].insert(2, shared)
+    query = TimetableQuery(timetables)
+
+    query.update("1st-A", "Wednesday", shared, None)
+    assert query.teacher_location("Amy Lee", "Wednesday", time(10, 30)) == ("1st-B", shared)
+    assert "Amy Lee" not in query.free_teachers("Wednesday", time(10, 30))
+    assert [c for c, _, _ in query.subject_occurrences("Art")] == ["1st-B"]
+    with pytest.raises(ValueError):
+        query.update("1st-A", "Wednesday", shared, None)
+
+    query.update("1st-B", "Wednesday", shared, None)
+    assert query.teacher_location("Amy Lee", "Wednesday", time(10, 30)) is None
+    assert query.free_teachers("Wednesday", time(10, 30)) == ["Amy Lee", "Jane Smith", "John Doe"]
+    assert query.subject_occurrences("Art") == []
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from datetime import time
+from src.models.period import Period
+from src.services.timetable_store import (
+    NO_STRING, load_school, load_timetable, open_store, save_school, save_timetable
+)
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+@pytest.fixture
+def timetables():
+    def week(teacher):
+        timetable = {day: [
+            Period(time(8, 15), time(8, 45), "Assembly", is_assembly=True),
+            Period(time(8, 45), time(9, 15), "Mathematics", teacher),
+            Period(time(9, 25), time(9, 45), "Break", is_break=True),
+            Period(time(9, 45), time(10, 15), "Art"),
+        ] for day in DAYS}
+        timetable["Friday"] = []
+        return timetable
+    return {"1st-A": week("John Doe"), "1st-B": week("Jane Smith")}
+
+def test_school_round_trip_and_zero_copy_access(tmp_path, timetables):
+    path = tmp_path / "school.ttb"
+    save_school(timetables, path)
+
+    assert load_school(path) == timetables
+
+    store = open_store(path)
+    assert isinstance(store.records, np.memmap)
+    records = store.class_records("1st-B")
+    assert np.shares_memory(records, store.records)
+    assert (records["teacher"] == store.string_id("Jane Smith")).sum() == 4
+    assert store.string_id("Nobody") == NO_STRING
+
+def test_single_timetable_round_trip(tmp_path, timetables):
+    path = tmp_path / "one.ttb"
+    save_timetable(timetables["1st-A"], path, class_name="1st-A")
+    assert load_timetable(path) == timetables["1st-A"]
+
+    (tmp_path / "bad.ttb").write_bytes(b"not a store")
+    with pytest.raises(ValueError, match="not a timetable store"):
+        open_store(tmp_path / "bad.ttb")
+
+def test_partial_timetables_and_empty_teachers_round_trip(tmp_path, timetables):
+    timetables["1st-B"] = {"Wednesday": [Period(time(8, 45), time(9, 15), "Art", "")], "Saturday": []}
+    del timetables["1st-A"]["Thursday"]
+    path = tmp_path / "partial.ttb"
+    save_school(timetables, path)
+
+    loaded = load_school(path)
+    assert loaded == timetables
+    assert list(loaded["1st-B"]) == ["Wednesday", "Saturday"]
+    assert loaded["1st-B"]["Wednesday"][0].teacher == ""
+    assert loaded["1st-A"]["Monday"][3].teacher is None
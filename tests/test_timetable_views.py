@@ -0,0 +1,38 @@
+from datetime import time
+from src.models.period import Period
+from src.models.teacher import Teacher
+from src.utils.timetable_views import (
+    timetable_frame, class_slot_grid, class_week_table, teacher_load, free_teacher_matrix,
+    BREAK_CODE, FREE, BUSY, UNAVAILABLE
+)
+
+def test_views_include_breaks_and_compare_by_time():
+    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+    empty = {day: [] for day in days}
+    timetables = {
+        "1st-A": dict(empty, Monday=[
+            Period(start_time=time(9, 0), end_time=time(9, 30), subject="English", teacher="Jane"),
+            Period(start_time=time(9, 30), end_time=time(9, 45), subject="Break", is_break=True),
+        ]),
+        # Offset by a quarter hour, so matching by label alone would show John free at 09:00
+        "1st-B": dict(empty, Monday=[
+            Period(start_time=time(9, 15), end_time=time(9, 45), subject="Mathematics", teacher="John"),
+        ]),
+    }
+    frame = timetable_frame(timetables)
+
+    codes, text = class_slot_grid(frame)
+    assert list(codes.columns) == ["Mon 09:00", "Mon 09:15", "Mon 09:30"]
+    assert codes.loc["1st-A", "Mon 09:30"] == BREAK_CODE
+    assert text.loc["1st-A", "Mon 09:00"] == "English<br>Jane"
+    assert class_week_table(frame, "1st-A").loc["09:30-09:45", "Monday"] == "Break"
+    assert teacher_load(frame).loc["Jane", "Monday"] == 1
+
+    availability = {day: [(time(9, 0), time(9, 30))] for day in days}
+    teachers = [Teacher(name="Jane", subjects=["English"], classes=["1st"], availability=availability)]
+    matrix = free_teacher_matrix(frame, teachers)
+    assert matrix.loc["Jane"].tolist() == [BUSY, BUSY]
+    assert matrix.loc["John"].tolist() == [BUSY, BUSY]
+    late = dict(availability, Monday=[(time(9, 15), time(9, 45))])
+    teachers.append(Teacher(name="Ann", subjects=["Art"], classes=["1st"], availability=late))
+    assert free_teacher_matrix(frame, teachers).loc["Ann"].tolist() == [UNAVAILABLE, FREE]